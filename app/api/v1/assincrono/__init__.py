@@ -0,0 +1,40 @@
+# app/api/v1/assincrono/__init__.py
+"""
+Versões assíncronas (AsyncSession) das rotas CRUD da API v1.
+
+Usadas quando `CRM_ASYNC=1`: as rotas rodam direto no event loop, sem ocupar
+uma thread do pool por requisição. Rotas sem versão assíncrona (lote,
+exportação) continuam vindo dos roteadores síncronos.
+"""
+from fastapi import APIRouter
+from fastapi.routing import APIRoute
+
+
+def _chaves(rota: APIRoute):
+    return {(rota.path, metodo) for metodo in rota.methods}
+
+
+def combinar_roteadores(assincrono: APIRouter, sincrono: APIRouter) -> APIRouter:
+    """
+    Roteador com as rotas do síncrono, trocando pelas versões assíncronas as
+    que existirem nos dois (mesmo caminho e método). A ordem do síncrono é
+    mantida, porque `/exportar` precisa vir antes de `/{id}`.
+    """
+    substitutas = {}
+    for rota in assincrono.routes:
+        for chave in _chaves(rota):
+            substitutas[chave] = rota
+
+    combinado = APIRouter()
+    usadas = set()
+    for rota in sincrono.routes:
+        chaves = _chaves(rota)
+        nova = next((substitutas[c] for c in chaves if c in substitutas), rota)
+        if id(nova) not in usadas:
+            combinado.routes.append(nova)
+            usadas.add(id(nova))
+
+    for rota in assincrono.routes:
+        if id(rota) not in usadas:
+            combinado.routes.append(rota)
+    return combinado
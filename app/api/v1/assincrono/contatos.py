@@ -0,0 +1,235 @@
+# app/api/v1/assincrono/contatos.py
+from typing import List, Optional, Tuple
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.banco_dados import obter_sessao_assincrona
+from app.paginacao import (
+    CABECALHO_PROXIMO_CURSOR,
+    decodificar_cursor,
+    filtro_depois_do_cursor,
+    proximo_cursor,
+)
+from app.etag import (
+    CABECALHO_ETAG,
+    corresponde_if_none_match,
+    etag_colecao,
+    etag_registro,
+    exigir_if_match,
+    nao_modificado,
+)
+from app.modelos.contato import Contato
+from app.esquemas.contato import ContatoCriar, ContatoLer, ContatoAtualizar
+from app.api.v1.contatos import CAMPOS_CONTATOS, _filtros_contatos
+from app.por_ids import cabecalhos_por_ids, carregar_por_ids, parametro_ids
+from app.serializacao import LISTAGEM_RAPIDA, projecao
+
+roteador = APIRouter(
+    prefix="/contatos",
+    tags=["Contatos"],
+)
+
+
+async def _obter_ou_404(db: AsyncSession, contato_id: int, campos: Optional[Tuple[str, ...]] = None):
+    # Com `campos`, uma linha só com as colunas pedidas (em vez do objeto do ORM)
+    if campos:
+        consulta = select(*projecao(Contato, ContatoLer, campos).colunas).where(Contato.id == contato_id)
+        contato = (await db.execute(consulta)).first()
+    else:
+        contato = await db.get(Contato, contato_id)
+    if not contato:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Contato não encontrado.",
+        )
+    return contato
+
+
+@roteador.post(
+    "/",
+    response_model=ContatoLer,
+    status_code=status.HTTP_201_CREATED,
+    summary="Criar um novo contato",
+    response_description="Dados completos do contato criado.",
+)
+async def criar_contato_async(
+    contato_entrada: ContatoCriar,
+    db: AsyncSession = Depends(obter_sessao_assincrona),
+):
+    """
+    Cria um novo contato na base de dados.
+
+    - Garante que não exista outro contato com o mesmo e-mail.
+    """
+    if contato_entrada.email:
+        existente = await db.scalar(
+            select(Contato.id).where(Contato.email == contato_entrada.email).limit(1)
+        )
+        if existente:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Já existe um contato cadastrado com esse e-mail.",
+            )
+
+    contato = Contato(**contato_entrada.model_dump())
+    db.add(contato)
+    await db.commit()
+    await db.refresh(contato)
+    return contato
+
+
+@roteador.get(
+    "/",
+    response_model=List[ContatoLer],
+    summary="Listar contatos",
+    response_description="Lista paginada de contatos (cursor da próxima página em `X-Proximo-Cursor`).",
+)
+async def listar_contatos_async(
+    response: Response,
+    pular: int = Query(0, ge=0, description="Quantidade de registros a pular (offset)."),
+    limite: int = Query(100, ge=1, le=500, description="Quantidade máxima de registros a retornar."),
+    situacao: Optional[str] = Query(
+        default=None,
+        description="Filtrar por situação (ex.: lead, cliente, inativo).",
+    ),
+    cursor: Optional[str] = Query(
+        default=None,
+        description=(
+            "Cursor da próxima página (cabeçalho `X-Proximo-Cursor` da resposta anterior). "
+            "Quando informado, `pular` é ignorado."
+        ),
+    ),
+    ids: Optional[List[int]] = Depends(parametro_ids),
+    campos: Optional[Tuple[str, ...]] = Depends(CAMPOS_CONTATOS),
+    if_none_match: Optional[str] = Header(default=None, description="ETag já conhecida (responde 304 se não mudou)."),
+    db: AsyncSession = Depends(obter_sessao_assincrona),
+):
+    """
+    Lista contatos (mais recentes primeiro) com filtro opcional por situação.
+    Mesma paginação da versão síncrona (cursor ou `pular`) e os mesmos `campos` e `ids`.
+    """
+    projetada = projecao(Contato, ContatoLer, campos) if campos or LISTAGEM_RAPIDA else None
+    colunas = projetada.colunas if projetada else [Contato]
+
+    if ids:
+        # Mesma leitura em blocos da versão síncrona, na conexão desta sessão
+        contatos, nao_encontrados = await db.run_sync(carregar_por_ids, Contato, ids, colunas)
+        cursor_seguinte = None
+        cabecalhos = cabecalhos_por_ids(nao_encontrados)
+    else:
+        consulta = select(*colunas).where(*_filtros_contatos(situacao))
+
+        if cursor:
+            try:
+                criado_em, id_ = decodificar_cursor(cursor)
+            except ValueError as erro:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=str(erro),
+                )
+            consulta = consulta.where(
+                filtro_depois_do_cursor(Contato.criado_em, Contato.id, criado_em, id_)
+            )
+            pular = 0
+
+        resultado = await db.execute(
+            consulta
+            .order_by(Contato.criado_em.desc(), Contato.id.desc())
+            .offset(pular)
+            .limit(limite)
+        )
+        contatos = resultado.all() if projetada else resultado.scalars().all()
+
+        cursor_seguinte = proximo_cursor(contatos, limite)
+        cabecalhos = {CABECALHO_PROXIMO_CURSOR: cursor_seguinte} if cursor_seguinte else {}
+
+    etag = etag_colecao(contatos, cursor_seguinte, tabela=Contato.__tablename__)
+    if corresponde_if_none_match(if_none_match, etag):
+        return nao_modificado(etag, cabecalhos)
+
+    if projetada:
+        return projetada.resposta(contatos, {**cabecalhos, CABECALHO_ETAG: etag})
+
+    response.headers.update(cabecalhos)
+    response.headers[CABECALHO_ETAG] = etag
+    return contatos
+
+
+@roteador.get(
+    "/{contato_id}",
+    response_model=ContatoLer,
+    summary="Obter um contato pelo ID",
+    response_description="Dados completos do contato solicitado.",
+)
+async def obter_contato_async(
+    contato_id: int,
+    response: Response,
+    campos: Optional[Tuple[str, ...]] = Depends(CAMPOS_CONTATOS),
+    if_none_match: Optional[str] = Header(default=None, description="ETag já conhecida (responde 304 se não mudou)."),
+    db: AsyncSession = Depends(obter_sessao_assincrona),
+):
+    """
+    Retorna um contato específico pelo ID.
+    Com `If-None-Match` igual à ETag atual, responde 304 sem corpo.
+    """
+    contato = await _obter_ou_404(db, contato_id, campos)
+
+    etag = etag_registro(contato, tabela=Contato.__tablename__)
+    if corresponde_if_none_match(if_none_match, etag):
+        return nao_modificado(etag)
+
+    if campos:
+        return projecao(Contato, ContatoLer, campos).resposta_item(contato, {CABECALHO_ETAG: etag})
+
+    response.headers[CABECALHO_ETAG] = etag
+    return contato
+
+
+@roteador.put(
+    "/{contato_id}",
+    response_model=ContatoLer,
+    summary="Atualizar um contato",
+    response_description="Dados completos do contato após atualização.",
+)
+async def atualizar_contato_async(
+    contato_id: int,
+    contato_entrada: ContatoAtualizar,
+    response: Response,
+    if_match: Optional[str] = Header(default=None, description="ETag lida antes (412 se o registro mudou)."),
+    db: AsyncSession = Depends(obter_sessao_assincrona),
+):
+    """
+    Atualiza os dados de um contato existente.
+    Permite atualização parcial (apenas campos enviados).
+    Com `If-Match`, só atualiza se o contato não mudou desde a leitura (senão 412).
+    """
+    contato = await _obter_ou_404(db, contato_id)
+    exigir_if_match(if_match, contato)
+
+    for campo, valor in contato_entrada.model_dump(exclude_unset=True).items():
+        setattr(contato, campo, valor)
+
+    await db.commit()
+    await db.refresh(contato)
+    response.headers[CABECALHO_ETAG] = etag_registro(contato)
+    return contato
+
+
+@roteador.delete(
+    "/{contato_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Excluir um contato",
+)
+async def excluir_contato_async(
+    contato_id: int,
+    db: AsyncSession = Depends(obter_sessao_assincrona),
+):
+    """
+    Exclui um contato da base de dados.
+    """
+    contato = await _obter_ou_404(db, contato_id)
+    await db.delete(contato)
+    await db.commit()
+    return None
@@ -0,0 +1,212 @@
+# app/api/v1/assincrono/funcionarios.py
+from typing import List, Optional, Tuple
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.banco_dados import obter_sessao_assincrona
+from app.etag import (
+    CABECALHO_ETAG,
+    corresponde_if_none_match,
+    etag_colecao,
+    etag_registro,
+    exigir_if_match,
+    nao_modificado,
+)
+from app.modelos.funcionario import Funcionario
+from app.esquemas.funcionario import (
+    FuncionarioCriar,
+    FuncionarioLer,
+    FuncionarioAtualizar,
+)
+from app.api.v1.funcionarios import CAMPOS_FUNCIONARIOS
+from app.por_ids import cabecalhos_por_ids, carregar_por_ids, parametro_ids
+from app.serializacao import projecao
+
+roteador = APIRouter(
+    prefix="/funcionarios",
+    tags=["Funcionários"],
+)
+
+
+async def _obter_ou_404(db: AsyncSession, funcionario_id: int, campos: Optional[Tuple[str, ...]] = None):
+    # Com `campos`, uma linha só com as colunas pedidas (em vez do objeto do ORM)
+    if campos:
+        consulta = select(*projecao(Funcionario, FuncionarioLer, campos).colunas).where(Funcionario.id == funcionario_id)
+        funcionario = (await db.execute(consulta)).first()
+    else:
+        funcionario = await db.get(Funcionario, funcionario_id)
+    if not funcionario:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Funcionário não encontrado.",
+        )
+    return funcionario
+
+
+@roteador.post(
+    "/",
+    response_model=FuncionarioLer,
+    status_code=status.HTTP_201_CREATED,
+)
+async def criar_funcionario_async(
+    dados: FuncionarioCriar,
+    db: AsyncSession = Depends(obter_sessao_assincrona),
+):
+    """
+    Cria um novo funcionário.
+    """
+    if dados.email:
+        existente = await db.scalar(
+            select(Funcionario.id).where(Funcionario.email == dados.email).limit(1)
+        )
+        if existente:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Já existe um funcionário cadastrado com esse e-mail.",
+            )
+
+    funcionario = Funcionario(
+        nome=dados.nome,
+        email=dados.email,
+        cargo=dados.cargo,
+        ativo=dados.ativo,
+    )
+    db.add(funcionario)
+    await db.commit()
+    await db.refresh(funcionario)
+    return funcionario
+
+
+@roteador.get(
+    "/",
+    response_model=List[FuncionarioLer],
+)
+async def listar_funcionarios_async(
+    response: Response,
+    somente_ativos: bool = False,
+    ids: Optional[List[int]] = Depends(parametro_ids),
+    campos: Optional[Tuple[str, ...]] = Depends(CAMPOS_FUNCIONARIOS),
+    if_none_match: Optional[str] = Header(default=None, description="ETag já conhecida (responde 304 se não mudou)."),
+    db: AsyncSession = Depends(obter_sessao_assincrona),
+):
+    """
+    Lista todos os funcionários cadastrados.
+
+    - Se `somente_ativos=true`, retorna apenas funcionários com `ativo = True`.
+    """
+    projetada = projecao(Funcionario, FuncionarioLer, campos) if campos else None
+    colunas = projetada.colunas if projetada else [Funcionario]
+
+    if ids:
+        funcionarios, nao_encontrados = await db.run_sync(carregar_por_ids, Funcionario, ids, colunas)
+        cabecalhos = cabecalhos_por_ids(nao_encontrados)
+    else:
+        consulta = select(*colunas)
+        if somente_ativos:
+            consulta = consulta.where(Funcionario.ativo == True)  # noqa: E712
+
+        resultado = await db.execute(consulta.order_by(Funcionario.nome))
+        funcionarios = resultado.all() if projetada else resultado.scalars().all()
+        cabecalhos = {}
+
+    etag = etag_colecao(funcionarios, tabela=Funcionario.__tablename__)
+    if corresponde_if_none_match(if_none_match, etag):
+        return nao_modificado(etag, cabecalhos)
+
+    if projetada:
+        return projetada.resposta(funcionarios, {**cabecalhos, CABECALHO_ETAG: etag})
+
+    response.headers.update(cabecalhos)
+    response.headers[CABECALHO_ETAG] = etag
+    return funcionarios
+
+
+@roteador.get(
+    "/{funcionario_id}",
+    response_model=FuncionarioLer,
+)
+async def obter_funcionario_async(
+    funcionario_id: int,
+    response: Response,
+    campos: Optional[Tuple[str, ...]] = Depends(CAMPOS_FUNCIONARIOS),
+    if_none_match: Optional[str] = Header(default=None, description="ETag já conhecida (responde 304 se não mudou)."),
+    db: AsyncSession = Depends(obter_sessao_assincrona),
+):
+    """
+    Busca um funcionário pelo ID.
+    """
+    funcionario = await _obter_ou_404(db, funcionario_id, campos)
+
+    etag = etag_registro(funcionario, tabela=Funcionario.__tablename__)
+    if corresponde_if_none_match(if_none_match, etag):
+        return nao_modificado(etag)
+
+    if campos:
+        return projecao(Funcionario, FuncionarioLer, campos).resposta_item(funcionario, {CABECALHO_ETAG: etag})
+
+    response.headers[CABECALHO_ETAG] = etag
+    return funcionario
+
+
+@roteador.put(
+    "/{funcionario_id}",
+    response_model=FuncionarioLer,
+)
+async def atualizar_funcionario_async(
+    funcionario_id: int,
+    dados: FuncionarioAtualizar,
+    response: Response,
+    if_match: Optional[str] = Header(default=None, description="ETag lida antes (412 se o registro mudou)."),
+    db: AsyncSession = Depends(obter_sessao_assincrona),
+):
+    """
+    Atualiza os dados de um funcionário.
+    Permite edição parcial (envie apenas o que deseja mudar).
+    """
+    funcionario = await _obter_ou_404(db, funcionario_id)
+    exigir_if_match(if_match, funcionario)
+
+    dados_dict = dados.model_dump(exclude_unset=True)
+
+    # Se for alterar e-mail, verificar duplicidade
+    if dados_dict.get("email"):
+        outro = await db.scalar(
+            select(Funcionario.id)
+            .where(
+                Funcionario.email == dados_dict["email"],
+                Funcionario.id != funcionario_id,
+            )
+            .limit(1)
+        )
+        if outro:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Já existe outro funcionário com esse e-mail.",
+            )
+
+    for campo, valor in dados_dict.items():
+        setattr(funcionario, campo, valor)
+
+    await db.commit()
+    await db.refresh(funcionario)
+    response.headers[CABECALHO_ETAG] = etag_registro(funcionario)
+    return funcionario
+
+
+@roteador.delete(
+    "/{funcionario_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+)
+async def excluir_funcionario_async(
+    funcionario_id: int,
+    db: AsyncSession = Depends(obter_sessao_assincrona),
+):
+    """
+    Remove um funcionário do sistema.
+    """
+    funcionario = await _obter_ou_404(db, funcionario_id)
+    await db.delete(funcionario)
+    await db.commit()
+    return
@@ -0,0 +1,225 @@
+# app/api/v1/assincrono/negocios.py
+from typing import List, Optional, Tuple
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.banco_dados import obter_sessao_assincrona
+from app.paginacao import (
+    CABECALHO_PROXIMO_CURSOR,
+    decodificar_cursor,
+    filtro_depois_do_cursor,
+    proximo_cursor,
+)
+from app.etag import (
+    CABECALHO_ETAG,
+    corresponde_if_none_match,
+    etag_colecao,
+    etag_registro,
+    exigir_if_match,
+    nao_modificado,
+)
+from app.modelos.negocio import Negocio
+from app.esquemas.negocio import NegocioCriar, NegocioLer, NegocioAtualizar
+from app.api.v1.negocios import CAMPOS_NEGOCIOS, _filtros_negocios
+from app.por_ids import cabecalhos_por_ids, carregar_por_ids, parametro_ids
+from app.serializacao import LISTAGEM_RAPIDA, projecao
+from app.servicos.resumo_diario import (
+    aplicar_contribuicoes,
+    contribuicoes,
+    somar_contribuicoes,
+)
+
+roteador = APIRouter(
+    prefix="/negocios",
+    tags=["Negócios"],
+)
+
+
+async def _obter_ou_404(db: AsyncSession, negocio_id: int, campos: Optional[Tuple[str, ...]] = None):
+    # Com `campos`, uma linha só com as colunas pedidas (em vez do objeto do ORM)
+    if campos:
+        consulta = select(*projecao(Negocio, NegocioLer, campos).colunas).where(Negocio.id == negocio_id)
+        negocio = (await db.execute(consulta)).first()
+    else:
+        negocio = await db.get(Negocio, negocio_id)
+    if not negocio:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Negócio não encontrado.",
+        )
+    return negocio
+
+
+async def _aplicar_no_resumo(db: AsyncSession, deltas) -> None:
+    # O serviço do resumo diário é síncrono: roda dentro da mesma transação via run_sync
+    await db.run_sync(aplicar_contribuicoes, deltas)
+
+
+@roteador.post(
+    "/",
+    response_model=NegocioLer,
+    status_code=status.HTTP_201_CREATED,
+    summary="Criar um novo negócio",
+)
+async def criar_negocio_async(
+    entrada: NegocioCriar,
+    db: AsyncSession = Depends(obter_sessao_assincrona),
+):
+    """
+    Cria uma nova oportunidade no funil de vendas.
+    """
+    negocio = Negocio(**entrada.model_dump())
+    db.add(negocio)
+    await db.flush()
+    await db.refresh(negocio)  # carrega criado_em (default do banco) para o resumo diário
+    await _aplicar_no_resumo(db, contribuicoes(negocio))
+    await db.commit()
+    return negocio
+
+
+@roteador.get(
+    "/",
+    response_model=List[NegocioLer],
+    summary="Listar negócios",
+)
+async def listar_negocios_async(
+    response: Response,
+    fase: Optional[str] = Query(default=None, description="Filtrar por fase do funil."),
+    origem: Optional[str] = Query(default=None, description="Filtrar por origem (whatsapp, site, etc.)."),
+    contato_id: Optional[int] = Query(default=None, description="Filtrar por ID do contato."),
+    pular: int = Query(0, ge=0),
+    limite: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(
+        default=None,
+        description=(
+            "Cursor da próxima página (cabeçalho `X-Proximo-Cursor` da resposta anterior). "
+            "Quando informado, `pular` é ignorado."
+        ),
+    ),
+    ids: Optional[List[int]] = Depends(parametro_ids),
+    campos: Optional[Tuple[str, ...]] = Depends(CAMPOS_NEGOCIOS),
+    if_none_match: Optional[str] = Header(default=None, description="ETag já conhecida (responde 304 se não mudou)."),
+    db: AsyncSession = Depends(obter_sessao_assincrona),
+):
+    """
+    Lista negócios com filtros opcionais por fase, origem e contato.
+    Mesma paginação da versão síncrona (cursor ou `pular`) e os mesmos `campos` e `ids`.
+    """
+    projetada = projecao(Negocio, NegocioLer, campos) if campos or LISTAGEM_RAPIDA else None
+    colunas = projetada.colunas if projetada else [Negocio]
+
+    if ids:
+        # Mesma leitura em blocos da versão síncrona, na conexão desta sessão
+        negocios, nao_encontrados = await db.run_sync(carregar_por_ids, Negocio, ids, colunas)
+        cursor_seguinte = None
+        cabecalhos = cabecalhos_por_ids(nao_encontrados)
+    else:
+        consulta = select(*colunas).where(*_filtros_negocios(fase, origem, contato_id))
+
+        if cursor:
+            try:
+                criado_em, id_ = decodificar_cursor(cursor)
+            except ValueError as erro:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=str(erro),
+                )
+            consulta = consulta.where(
+                filtro_depois_do_cursor(Negocio.criado_em, Negocio.id, criado_em, id_)
+            )
+            pular = 0
+
+        resultado = await db.execute(
+            consulta
+            .order_by(Negocio.criado_em.desc(), Negocio.id.desc())
+            .offset(pular)
+            .limit(limite)
+        )
+        negocios = resultado.all() if projetada else resultado.scalars().all()
+
+        cursor_seguinte = proximo_cursor(negocios, limite)
+        cabecalhos = {CABECALHO_PROXIMO_CURSOR: cursor_seguinte} if cursor_seguinte else {}
+
+    etag = etag_colecao(negocios, cursor_seguinte, tabela=Negocio.__tablename__)
+    if corresponde_if_none_match(if_none_match, etag):
+        return nao_modificado(etag, cabecalhos)
+
+    if projetada:
+        return projetada.resposta(negocios, {**cabecalhos, CABECALHO_ETAG: etag})
+
+    response.headers.update(cabecalhos)
+    response.headers[CABECALHO_ETAG] = etag
+    return negocios
+
+
+@roteador.get(
+    "/{negocio_id}",
+    response_model=NegocioLer,
+    summary="Obter um negócio pelo ID",
+)
+async def obter_negocio_async(
+    negocio_id: int,
+    response: Response,
+    campos: Optional[Tuple[str, ...]] = Depends(CAMPOS_NEGOCIOS),
+    if_none_match: Optional[str] = Header(default=None, description="ETag já conhecida (responde 304 se não mudou)."),
+    db: AsyncSession = Depends(obter_sessao_assincrona),
+):
+    negocio = await _obter_ou_404(db, negocio_id, campos)
+
+    etag = etag_registro(negocio, tabela=Negocio.__tablename__)
+    if corresponde_if_none_match(if_none_match, etag):
+        return nao_modificado(etag)
+
+    if campos:
+        return projecao(Negocio, NegocioLer, campos).resposta_item(negocio, {CABECALHO_ETAG: etag})
+
+    response.headers[CABECALHO_ETAG] = etag
+    return negocio
+
+
+@roteador.put(
+    "/{negocio_id}",
+    response_model=NegocioLer,
+    summary="Atualizar um negócio",
+)
+async def atualizar_negocio_async(
+    negocio_id: int,
+    entrada: NegocioAtualizar,
+    response: Response,
+    if_match: Optional[str] = Header(default=None, description="ETag lida antes (412 se o registro mudou)."),
+    db: AsyncSession = Depends(obter_sessao_assincrona),
+):
+    negocio = await _obter_ou_404(db, negocio_id)
+    exigir_if_match(if_match, negocio)
+
+    # Retira a contribuição antiga do resumo diário e soma a nova
+    deltas = contribuicoes(negocio, sinal=-1)
+
+    for campo, valor in entrada.model_dump(exclude_unset=True).items():
+        setattr(negocio, campo, valor)
+
+    somar_contribuicoes(deltas, contribuicoes(negocio))
+    await _aplicar_no_resumo(db, deltas)
+    await db.commit()
+    await db.refresh(negocio)
+    response.headers[CABECALHO_ETAG] = etag_registro(negocio)
+    return negocio
+
+
+@roteador.delete(
+    "/{negocio_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Excluir um negócio",
+)
+async def excluir_negocio_async(
+    negocio_id: int,
+    db: AsyncSession = Depends(obter_sessao_assincrona),
+):
+    negocio = await _obter_ou_404(db, negocio_id)
+
+    await _aplicar_no_resumo(db, contribuicoes(negocio, sinal=-1))
+    await db.delete(negocio)
+    await db.commit()
+    return None
@@ -1,18 +1,61 @@
 # app/api/v1/contatos.py
-from typing import List, Optional
+from typing import List, Literal, Optional, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from app.banco_dados import obter_sessao
+from app.paginacao import (
+    CABECALHO_PROXIMO_CURSOR,
+    decodificar_cursor,
+    filtro_depois_do_cursor,
+    proximo_cursor,
+)
+from app.por_ids import cabecalhos_por_ids, carregar_por_ids, parametro_ids
+from app.serializacao import LISTAGEM_RAPIDA, parametro_campos, projecao
+from app.etag import (
+    CABECALHO_ETAG,
+    corresponde_if_none_match,
+    etag_colecao,
+    etag_registro,
+    exigir_if_match,
+    nao_modificado,
+)
 from app.modelos.contato import Contato
-from app.esquemas.contato import ContatoCriar, ContatoLer, ContatoAtualizar
+from app.esquemas.contato import (
+    ContatoAtualizar,
+    ContatoCriar,
+    ContatoLer,
+    ContatoLote,
+    ContatoPorIdsResultado,
+    ContatoResolverLote,
+    ContatoResolverResultado,
+)
+from app.esquemas.lote import IdsEntrada, LoteResultado
+from app.servicos.exportacao import FORMATOS_EXPORTACAO, exportar_linhas
+from app.servicos.busca_contatos import LIMITE_PADRAO, buscar_contatos
+from app.servicos.lotes import criar_contatos_em_lote
+from app.servicos.resolver_contatos import resolver_contato, resolver_em_lote
 
 roteador = APIRouter(
     prefix="/contatos",
     tags=["Contatos"],
 )
 
+# Parâmetro `campos=` das rotas de leitura (app/serializacao.py)
+CAMPOS_CONTATOS = parametro_campos(ContatoLer)
+
+
+def _filtros_contatos(situacao: Optional[str]) -> list:
+    """
+    Condições de filtro compartilhadas pela listagem e pela exportação.
+    """
+    condicoes = []
+    if situacao:
+        condicoes.append(Contato.situacao == situacao)
+    return condicoes
+
 
 @roteador.post(
     "/",
@@ -49,33 +92,226 @@ def criar_contato(
     return contato
 
 
+@roteador.post(
+    "/lote",
+    response_model=LoteResultado,
+    summary="Criar ou atualizar contatos em lote",
+    response_description="Resumo do lote e resultado de cada item (na ordem enviada).",
+)
+def criar_contatos_lote(
+    entrada: ContatoLote,
+    db: Session = Depends(obter_sessao),
+):
+    """
+    Cria muitos contatos de uma vez, em uma única transação.
+
+    - E-mails duplicados são conferidos em uma consulta só.
+    - `modo = "upsert"` atualiza os contatos cujo e-mail já existe.
+    - Erros de um item não impedem a criação dos demais.
+    """
+    return criar_contatos_em_lote(db, entrada)
+
+
+@roteador.get(
+    "/buscar",
+    response_model=List[ContatoLer],
+    summary="Buscar contatos",
+    response_description="Contatos encontrados, mais relevantes primeiro.",
+)
+def buscar_contatos_por_texto(
+    q: str = Query(..., min_length=1, max_length=200, description="Texto da busca (nome, e-mail, telefone ou empresa)."),
+    limite: int = Query(LIMITE_PADRAO, ge=1, le=100, description="Quantidade máxima de resultados."),
+    db: Session = Depends(obter_sessao),
+):
+    """
+    Busca de contatos para autocompletar.
+
+    - Cada palavra é buscada como prefixo ("jo sil" encontra "João Silva").
+    - Não diferencia acentos nem maiúsculas ("joao" encontra "João").
+    - Telefone pode ser digitado com ou sem pontuação.
+    """
+    return buscar_contatos(db, q, limite)
+
+
+@roteador.get(
+    "/resolver",
+    response_model=ContatoLer,
+    summary="Achar contato por telefone ou e-mail",
+    response_description="O contato correspondente (404 se nenhum).",
+)
+def resolver_contato_por_identificador(
+    telefone: Optional[str] = Query(default=None, description="Telefone em qualquer formato (ex.: +55 (92) 99999-9999)."),
+    email: Optional[str] = Query(default=None, description="E-mail (maiúsculas e minúsculas tanto faz)."),
+    db: Session = Depends(obter_sessao),
+):
+    """
+    Acha o contato de uma mensagem recebida (ex.: webhook do WhatsApp via n8n).
+
+    - O telefone é comparado só pelos dígitos, no formato E.164 (sem o código
+      do país, vale o 55): "(92) 99999-9999" acha "+55 92 99999-9999".
+    - Com telefone e e-mail, o e-mail tem prioridade.
+    - Se mais de um contato corresponder, volta o mais recente.
+    """
+    if not telefone and not email:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Informe telefone ou email.",
+        )
+
+    contato = resolver_contato(db, telefone=telefone, email=email)
+    if not contato:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Contato não encontrado.",
+        )
+    return contato
+
+
+@roteador.post(
+    "/resolver",
+    response_model=ContatoResolverResultado,
+    summary="Achar vários contatos por telefone ou e-mail",
+    response_description="Contato (ou null) de cada telefone e e-mail enviado.",
+)
+def resolver_contatos_em_lote(
+    entrada: ContatoResolverLote,
+    db: Session = Depends(obter_sessao),
+):
+    """
+    Versão em lote de GET /resolver: até 1000 telefones e e-mails por chamada,
+    resolvidos com uma consulta IN por bloco (busca no índice, sem varrer a tabela).
+    """
+    return resolver_em_lote(db, entrada.telefones, entrada.emails)
+
+
+@roteador.post(
+    "/por-ids",
+    response_model=ContatoPorIdsResultado,
+    summary="Obter vários contatos pelos IDs",
+)
+def obter_contatos_por_ids(
+    entrada: IdsEntrada,
+    db: Session = Depends(obter_sessao),
+):
+    """
+    Versão de GET /?ids= para listas grandes: até 10000 ids por chamada,
+    lidos com uma consulta IN por bloco, sem uma requisição por contato.
+    """
+    contatos, nao_encontrados = carregar_por_ids(db, Contato, entrada.ids)
+    return {"itens": contatos, "nao_encontrados": nao_encontrados}
+
+
 @roteador.get(
     "/",
     response_model=List[ContatoLer],
     summary="Listar contatos",
-    response_description="Lista paginada de contatos.",
+    response_description="Lista paginada de contatos (cursor da próxima página em `X-Proximo-Cursor`).",
 )
 def listar_contatos(
+    response: Response,
     pular: int = Query(0, ge=0, description="Quantidade de registros a pular (offset)."),
     limite: int = Query(100, ge=1, le=500, description="Quantidade máxima de registros a retornar."),
     situacao: Optional[str] = Query(
         default=None,
         description="Filtrar por situação (ex.: lead, cliente, inativo).",
     ),
+    cursor: Optional[str] = Query(
+        default=None,
+        description=(
+            "Cursor da próxima página (cabeçalho `X-Proximo-Cursor` da resposta anterior). "
+            "Quando informado, `pular` é ignorado."
+        ),
+    ),
+    ids: Optional[List[int]] = Depends(parametro_ids),
+    campos: Optional[Tuple[str, ...]] = Depends(CAMPOS_CONTATOS),
+    if_none_match: Optional[str] = Header(default=None, description="ETag já conhecida (responde 304 se não mudou)."),
     db: Session = Depends(obter_sessao),
 ):
     """
-    Lista contatos com paginação simples e filtro opcional por situação.
+    Lista contatos (mais recentes primeiro) com filtro opcional por situação.
+
+    - Paginação por cursor: use o cabeçalho `X-Proximo-Cursor` como `cursor`
+      da próxima chamada. Não repete nem pula registros quando há inserções
+      durante a leitura, e o custo de cada página não depende da posição.
+    - `pular` (offset) continua disponível por compatibilidade.
+    - ETag da página no cabeçalho `ETag`; com `If-None-Match` igual, responde 304.
+    - `campos=id,nome,...`: lê e devolve só esses campos.
+    - `ids=3,7,12`: só esses contatos, na ordem pedida (ids inexistentes no
+      cabeçalho `X-Ids-Nao-Encontrados`).
     """
-    consulta = db.query(Contato)
+    # Com `campos` ou no caminho rápido (CRM_LISTAGEM_RAPIDA): só as colunas, como tuplas
+    projetada = projecao(Contato, ContatoLer, campos) if campos or LISTAGEM_RAPIDA else None
+    colunas = projetada.colunas if projetada else [Contato]
 
-    if situacao:
-        consulta = consulta.filter(Contato.situacao == situacao)
+    if ids:
+        contatos, nao_encontrados = carregar_por_ids(db, Contato, ids, colunas)
+        cursor_seguinte = None
+        cabecalhos = cabecalhos_por_ids(nao_encontrados)
+    else:
+        consulta = db.query(*colunas).filter(*_filtros_contatos(situacao))
 
-    contatos = consulta.offset(pular).limit(limite).all()
+        if cursor:
+            try:
+                criado_em, id_ = decodificar_cursor(cursor)
+            except ValueError as erro:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=str(erro),
+                )
+            consulta = consulta.filter(
+                filtro_depois_do_cursor(Contato.criado_em, Contato.id, criado_em, id_)
+            )
+            pular = 0
+
+        contatos = (
+            consulta
+            .order_by(Contato.criado_em.desc(), Contato.id.desc())
+            .offset(pular)
+            .limit(limite)
+            .all()
+        )
+
+        cursor_seguinte = proximo_cursor(contatos, limite)
+        cabecalhos = {CABECALHO_PROXIMO_CURSOR: cursor_seguinte} if cursor_seguinte else {}
+
+    etag = etag_colecao(contatos, cursor_seguinte, tabela=Contato.__tablename__)
+    if corresponde_if_none_match(if_none_match, etag):
+        return nao_modificado(etag, cabecalhos)
+
+    if projetada:
+        return projetada.resposta(contatos, {**cabecalhos, CABECALHO_ETAG: etag})
+
+    response.headers.update(cabecalhos)
+    response.headers[CABECALHO_ETAG] = etag
     return contatos
 
 
+@roteador.get(
+    "/exportar",
+    summary="Exportar contatos (NDJSON ou CSV)",
+    response_description="Todos os contatos do filtro, enviados aos poucos (streaming).",
+    response_class=StreamingResponse,
+)
+def exportar_contatos(
+    formato: Literal["ndjson", "csv"] = Query("ndjson", description="Formato do arquivo."),
+    situacao: Optional[str] = Query(
+        default=None,
+        description="Filtrar por situação (ex.: lead, cliente, inativo).",
+    ),
+):
+    """
+    Exporta todos os contatos (com o mesmo filtro da listagem) em um único
+    download, sem paginação. Os dados são lidos e enviados em blocos, então a
+    memória usada não depende do tamanho da tabela.
+    """
+    campos = list(ContatoLer.model_fields)
+    return StreamingResponse(
+        exportar_linhas(Contato, campos, _filtros_contatos(situacao), formato),
+        media_type=FORMATOS_EXPORTACAO[formato],
+        headers={"Content-Disposition": f'attachment; filename="contatos.{formato}"'},
+    )
+
+
 @roteador.get(
     "/{contato_id}",
     response_model=ContatoLer,
@@ -84,17 +320,34 @@ def listar_contatos(
 )
 def obter_contato(
     contato_id: int,
+    response: Response,
+    campos: Optional[Tuple[str, ...]] = Depends(CAMPOS_CONTATOS),
+    if_none_match: Optional[str] = Header(default=None, description="ETag já conhecida (responde 304 se não mudou)."),
     db: Session = Depends(obter_sessao),
 ):
     """
     Retorna um contato específico pelo ID.
+    Com `If-None-Match` igual à ETag atual, responde 304 sem corpo.
     """
-    contato = db.get(Contato, contato_id)
+    if campos:
+        projetada = projecao(Contato, ContatoLer, campos)
+        contato = db.query(*projetada.colunas).filter(Contato.id == contato_id).first()
+    else:
+        contato = db.get(Contato, contato_id)
     if not contato:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Contato não encontrado.",
         )
+
+    etag = etag_registro(contato, tabela=Contato.__tablename__)
+    if corresponde_if_none_match(if_none_match, etag):
+        return nao_modificado(etag)
+
+    if campos:
+        return projetada.resposta_item(contato, {CABECALHO_ETAG: etag})
+
+    response.headers[CABECALHO_ETAG] = etag
     return contato
 
 
@@ -107,11 +360,14 @@ def obter_contato(
 def atualizar_contato(
     contato_id: int,
     contato_entrada: ContatoAtualizar,
+    response: Response,
+    if_match: Optional[str] = Header(default=None, description="ETag lida antes (412 se o registro mudou)."),
     db: Session = Depends(obter_sessao),
 ):
     """
     Atualiza os dados de um contato existente.
     Permite atualização parcial (apenas campos enviados).
+    Com `If-Match`, só atualiza se o contato não mudou desde a leitura (senão 412).
     """
     contato = db.get(Contato, contato_id)
     if not contato:
@@ -119,6 +375,7 @@ def atualizar_contato(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Contato não encontrado.",
         )
+    exigir_if_match(if_match, contato)
 
     dados_atualizados = contato_entrada.dict(exclude_unset=True)
     for campo, valor in dados_atualizados.items():
@@ -126,6 +383,7 @@ def atualizar_contato(
 
     db.commit()
     db.refresh(contato)
+    response.headers[CABECALHO_ETAG] = etag_registro(contato)
     return contato
 
 
@@ -1,22 +1,37 @@
 # app/api/v1/funcionarios.py
-from typing import List
+from typing import List, Optional, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
 from sqlalchemy.orm import Session
 
 from app.banco_dados import obter_sessao
+from app.etag import (
+    CABECALHO_ETAG,
+    corresponde_if_none_match,
+    etag_colecao,
+    etag_registro,
+    exigir_if_match,
+    nao_modificado,
+)
+from app.por_ids import cabecalhos_por_ids, carregar_por_ids, parametro_ids
+from app.serializacao import parametro_campos, projecao
 from app.modelos.funcionario import Funcionario
 from app.esquemas.funcionario import (
     FuncionarioCriar,
     FuncionarioLer,
     FuncionarioAtualizar,
+    FuncionarioPorIdsResultado,
 )
+from app.esquemas.lote import IdsEntrada
 
 roteador = APIRouter(
     prefix="/funcionarios",
     tags=["Funcionários"],
 )
 
+# Parâmetro `campos=` das rotas de leitura (app/serializacao.py)
+CAMPOS_FUNCIONARIOS = parametro_campos(FuncionarioLer)
+
 
 @roteador.post(
     "/",
@@ -58,25 +73,64 @@ def criar_funcionario(
     return funcionario
 
 
+@roteador.post(
+    "/por-ids",
+    response_model=FuncionarioPorIdsResultado,
+)
+def obter_funcionarios_por_ids(
+    entrada: IdsEntrada,
+    db: Session = Depends(obter_sessao),
+):
+    """
+    Busca vários funcionários pelos IDs (ex.: responsáveis de uma lista de negócios).
+    """
+    funcionarios, nao_encontrados = carregar_por_ids(db, Funcionario, entrada.ids)
+    return {"itens": funcionarios, "nao_encontrados": nao_encontrados}
+
+
 @roteador.get(
     "/",
     response_model=List[FuncionarioLer],
 )
 def listar_funcionarios(
+    response: Response,
     somente_ativos: bool = False,
+    ids: Optional[List[int]] = Depends(parametro_ids),
+    campos: Optional[Tuple[str, ...]] = Depends(CAMPOS_FUNCIONARIOS),
+    if_none_match: Optional[str] = Header(default=None, description="ETag já conhecida (responde 304 se não mudou)."),
     db: Session = Depends(obter_sessao),
 ):
     """
     Lista todos os funcionários cadastrados.
 
     - Se `somente_ativos=true`, retorna apenas funcionários com `ativo = True`.
+    - `campos=id,nome,...`: lê e devolve só esses campos.
+    - `ids=3,7,12`: só esses funcionários, na ordem pedida.
     """
-    consulta = db.query(Funcionario)
+    projetada = projecao(Funcionario, FuncionarioLer, campos) if campos else None
+    colunas = projetada.colunas if projetada else [Funcionario]
+
+    if ids:
+        funcionarios, nao_encontrados = carregar_por_ids(db, Funcionario, ids, colunas)
+        cabecalhos = cabecalhos_por_ids(nao_encontrados)
+    else:
+        consulta = db.query(*colunas)
+
+        if somente_ativos:
+            consulta = consulta.filter(Funcionario.ativo == True)  # noqa: E712
+
+        funcionarios = consulta.order_by(Funcionario.nome).all()
+        cabecalhos = {}
+
+    etag = etag_colecao(funcionarios, tabela=Funcionario.__tablename__)
+    if corresponde_if_none_match(if_none_match, etag):
+        return nao_modificado(etag, cabecalhos)
 
-    if somente_ativos:
-        consulta = consulta.filter(Funcionario.ativo == True)  # noqa: E712
+    if projetada:
+        return projetada.resposta(funcionarios, {**cabecalhos, CABECALHO_ETAG: etag})
 
-    funcionarios = consulta.order_by(Funcionario.nome).all()
+    response.headers.update(cabecalhos)
+    response.headers[CABECALHO_ETAG] = etag
     return funcionarios
 
 
@@ -86,13 +140,17 @@ def listar_funcionarios(
 )
 def obter_funcionario(
     funcionario_id: int,
+    response: Response,
+    campos: Optional[Tuple[str, ...]] = Depends(CAMPOS_FUNCIONARIOS),
+    if_none_match: Optional[str] = Header(default=None, description="ETag já conhecida (responde 304 se não mudou)."),
     db: Session = Depends(obter_sessao),
 ):
     """
     Busca um funcionário pelo ID.
     """
+    projetada = projecao(Funcionario, FuncionarioLer, campos) if campos else None
     funcionario = (
-        db.query(Funcionario)
+        db.query(*(projetada.colunas if projetada else [Funcionario]))
         .filter(Funcionario.id == funcionario_id)
         .first()
     )
@@ -101,6 +159,15 @@ def obter_funcionario(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Funcionário não encontrado.",
         )
+
+    etag = etag_registro(funcionario, tabela=Funcionario.__tablename__)
+    if corresponde_if_none_match(if_none_match, etag):
+        return nao_modificado(etag)
+
+    if projetada:
+        return projetada.resposta_item(funcionario, {CABECALHO_ETAG: etag})
+
+    response.headers[CABECALHO_ETAG] = etag
     return funcionario
 
 
@@ -111,6 +178,8 @@ def obter_funcionario(
 def atualizar_funcionario(
     funcionario_id: int,
     dados: FuncionarioAtualizar,
+    response: Response,
+    if_match: Optional[str] = Header(default=None, description="ETag lida antes (412 se o registro mudou)."),
     db: Session = Depends(obter_sessao),
 ):
     """
@@ -127,6 +196,7 @@ def atualizar_funcionario(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Funcionário não encontrado.",
         )
+    exigir_if_match(if_match, funcionario)
 
     dados_dict = dados.model_dump(exclude_unset=True)
 
@@ -151,6 +221,7 @@ def atualizar_funcionario(
 
     db.commit()
     db.refresh(funcionario)
+    response.headers[CABECALHO_ETAG] = etag_registro(funcionario)
     return funcionario
 
 
@@ -0,0 +1,133 @@
+# app/api/v1/importacoes.py
+import asyncio
+import json
+import os
+import tempfile
+from typing import Dict, List, Literal, Optional
+
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Query, Request, status
+
+from app.esquemas.importacao import ImportacaoLer
+from app.servicos.importacao import (
+    TAMANHO_LOTE_PADRAO,
+    executar_importacao,
+    listar_importacoes,
+    nova_importacao,
+    obter_importacao,
+)
+
+roteador = APIRouter(
+    prefix="/importacoes",
+    tags=["Importações"],
+)
+
+# Bytes do upload acumulados antes de cada escrita no arquivo temporário
+TAMANHO_ESCRITA = 1024 * 1024
+
+
+def _descartar(arquivo) -> None:
+    arquivo.close()
+    os.remove(arquivo.name)
+
+
+def _ler_mapeamento(mapeamento: Optional[str]) -> Dict[str, str]:
+    if not mapeamento:
+        return {}
+    try:
+        dados = json.loads(mapeamento)
+    except ValueError:
+        dados = None
+    if not isinstance(dados, dict) or not all(
+        isinstance(k, str) and isinstance(v, str) for k, v in dados.items()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail='Mapeamento inválido. Use um JSON como {"coluna_do_csv": "campo"}.',
+        )
+    return dados
+
+
+@roteador.post(
+    "/",
+    response_model=ImportacaoLer,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Importar CSV de contatos ou negócios",
+    description=(
+        "Envie o arquivo CSV como corpo da requisição (`Content-Type: text/csv`).\n\n"
+        "- O arquivo é gravado em disco aos poucos e processado em segundo plano, "
+        "em blocos de `tamanho_lote` linhas (uma transação por bloco).\n"
+        "- `mapeamento` (opcional) é um JSON `{\"coluna_do_csv\": \"campo\"}`; "
+        "colunas sem mapeamento usam o próprio nome.\n"
+        "- Em negócios, `contato_id` pode ser trocado pelas colunas "
+        "`contato_email` ou `contato_telefone`.\n\n"
+        "Acompanhe o andamento em `GET /api/v1/importacoes/{id}`."
+    ),
+)
+async def importar_csv(
+    request: Request,
+    tarefas: BackgroundTasks,
+    tipo: Literal["contatos", "negocios"] = Query(..., description="O que o arquivo contém."),
+    tamanho_lote: int = Query(TAMANHO_LOTE_PADRAO, ge=1, le=10000, description="Linhas por transação."),
+    modo: Literal["inserir", "upsert"] = Query(
+        "inserir", description="Contatos: `upsert` atualiza quem já existe com o mesmo e-mail."
+    ),
+    mapeamento: Optional[str] = Query(None, description="JSON {coluna_do_csv: campo}."),
+):
+    campos = _ler_mapeamento(mapeamento)
+
+    # Copia o corpo para um arquivo temporário sem carregá-lo inteiro na memória.
+    # A escrita em disco vai para uma thread (não trava o event loop), juntando
+    # os pedaços em blocos de até `TAMANHO_ESCRITA` bytes
+    arquivo = await asyncio.to_thread(
+        tempfile.NamedTemporaryFile, prefix="importacao_", suffix=".csv", delete=False
+    )
+    caminho = arquivo.name
+    try:
+        buffer = bytearray()
+        async for pedaco in request.stream():
+            buffer += pedaco
+            if len(buffer) >= TAMANHO_ESCRITA:
+                await asyncio.to_thread(arquivo.write, bytes(buffer))
+                buffer.clear()
+        if buffer:
+            await asyncio.to_thread(arquivo.write, bytes(buffer))
+    except BaseException:
+        await asyncio.to_thread(_descartar, arquivo)
+        raise
+    await asyncio.to_thread(arquivo.close)
+
+    importacao = nova_importacao(tipo)
+    tarefas.add_task(
+        executar_importacao,
+        importacao,
+        caminho,
+        mapeamento=campos,
+        tamanho_lote=tamanho_lote,
+        modo=modo,
+        apagar_arquivo=True,
+    )
+    return importacao.para_dict()
+
+
+@roteador.get(
+    "/",
+    response_model=List[ImportacaoLer],
+    summary="Listar importações recentes",
+)
+def listar():
+    return [importacao.para_dict() for importacao in listar_importacoes()]
+
+
+@roteador.get(
+    "/{importacao_id}",
+    response_model=ImportacaoLer,
+    summary="Andamento de uma importação",
+)
+def obter(importacao_id: str):
+    importacao = obter_importacao(importacao_id)
+    if not importacao:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Importação não encontrada.",
+        )
+    return importacao.para_dict()
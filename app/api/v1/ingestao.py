@@ -0,0 +1,52 @@
+# app/api/v1/ingestao.py
+from fastapi import APIRouter, HTTPException, status
+
+from app.esquemas.ingestao import IngestaoEstado, LeadAceito, LeadEntrada
+from app.servicos.ingestao import FilaCheia, fila_ingestao
+
+roteador = APIRouter(
+    prefix="/ingestao",
+    tags=["Ingestão"],
+)
+
+
+@roteador.post(
+    "/leads",
+    response_model=LeadAceito,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Receber um lead (webhook)",
+    response_description="O lead entrou na fila e será gravado em segundo plano.",
+)
+async def receber_lead(lead: LeadEntrada):
+    """
+    Para picos de campanha: o lead é validado, entra na fila e a resposta sai
+    na hora, sem esperar o banco. Os leads são gravados em lotes (uma
+    transação para vários) por uma tarefa de fundo.
+
+    - O contato é reaproveitado se já existir um com o mesmo e-mail ou
+      telefone; senão, é criado.
+    - Com `negocio`, cria também o negócio ligado ao contato.
+    - Acompanhe a fila em `GET /api/v1/ingestao/estado`.
+    """
+    try:
+        sequencia = await fila_ingestao.receber(lead)
+    except FilaCheia:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Fila de ingestão cheia. Tente de novo em instantes.",
+            headers={"Retry-After": "1"},
+        )
+    return {"sequencia": sequencia, "fila": fila_ingestao.estado()["fila"]}
+
+
+@roteador.get(
+    "/estado",
+    response_model=IngestaoEstado,
+    summary="Situação da fila de ingestão",
+)
+async def estado_ingestao():
+    """
+    Tamanho da fila, atraso do item mais antigo e totais gravados/descartados
+    (por processo; também expostos em /metrics).
+    """
+    return fila_ingestao.estado()
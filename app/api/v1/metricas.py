@@ -0,0 +1,141 @@
+# app/api/v1/metricas.py
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from app.banco_dados import obter_sessao
+from app.esquemas.metricas import (
+    AgruparPor,
+    FunilLer,
+    Granularidade,
+    IndicadoresLer,
+    MetricaSerie,
+    SerieLer,
+)
+from app.servicos.cache_paineis import cache_paineis, com_sessao_propria
+from app.servicos.funil import FASES, numeros_do_funil
+from app.servicos.indicadores import calcular_indicadores, resolver_periodo
+from app.servicos.resumo_diario import totais_por_fase
+from app.servicos.series_temporais import MAX_PERIODOS, quantidade_de_periodos, serie_temporal
+
+roteador = APIRouter(
+    prefix="/metricas",
+    tags=["Métricas"],
+)
+
+DESCRICAO_INICIO = "Data inicial (AAAA-MM-DD). Sem `inicio`/`fim`: últimos 30 dias."
+DESCRICAO_FIM = "Data final (AAAA-MM-DD), inclusive."
+
+
+@roteador.get(
+    "/indicadores",
+    response_model=IndicadoresLer,
+    summary="Indicadores do período",
+    response_description="Os mesmos números do painel /indicadores.",
+)
+def obter_indicadores(
+    inicio: Optional[str] = Query(default=None, description=DESCRICAO_INICIO),
+    fim: Optional[str] = Query(default=None, description=DESCRICAO_FIM),
+):
+    """
+    Indicadores globais, por funcionário, vendas por origem e produtividade por dia.
+    Usa o mesmo cálculo (e o mesmo cache) do painel /indicadores.
+    """
+    inicio_data, fim_data = resolver_periodo(inicio, fim)
+    contexto = cache_paineis.obter(
+        ("indicadores", inicio_data, fim_data),
+        com_sessao_propria(calcular_indicadores, inicio_data, fim_data),
+    )
+
+    return {
+        "inicio": inicio_data,
+        "fim": fim_data,
+        "total_negocios_recebidos": contexto["total_negocios_recebidos_global"],
+        "total_negocios_ganhos": contexto["total_negocios_ganhos_global"],
+        "ciclo_medio": contexto["ciclo_medio_global"],
+        "taxa_conversao": contexto["taxa_conversao_global"],
+        "funcionarios": [
+            {
+                "funcionario_id": m["funcionario"].id,
+                "nome": m["funcionario"].nome,
+                "negocios_recebidos": m["negocios_recebidos"],
+                "negocios_trabalhados": m["negocios_trabalhados"],
+                "negocios_ganhos": m["negocios_ganhos"],
+                "ciclo_medio": m["ciclo_medio"],
+                "taxa_conversao": m["taxa_conversao"],
+                "valor_ganho": m["valor_ganho"],
+            }
+            for m in contexto["metricas_funcionarios"]
+        ],
+        "vendas_por_origem": contexto["vendas_por_origem"],
+        "produtividade_por_dia": contexto["produtividade_por_dia"],
+    }
+
+
+@roteador.get(
+    "/funil",
+    response_model=FunilLer,
+    summary="Números do funil",
+    response_description="Quantidade e valor por fase e taxa de fechamento (todo o histórico).",
+)
+def obter_funil(db: Session = Depends(obter_sessao)):
+    """
+    Os números do painel /funil, sem os cards.
+    Uma consulta agrupada no resumo diário.
+    """
+    totais = totais_por_fase(db)
+    numeros = numeros_do_funil(totais)
+
+    return {
+        "fases": [
+            {"fase": fase, "quantidade": totais.get(fase, (0, 0))[0], "valor": totais.get(fase, (0, 0))[1]}
+            for fase in FASES
+        ],
+        "total_negocios": numeros["total_negocios"],
+        "valor_total": numeros["valor_total"],
+        "taxa_fechamento": numeros["taxa_fechamento"],
+    }
+
+
+@roteador.get(
+    "/serie",
+    response_model=SerieLer,
+    summary="Série temporal de negócios",
+    response_description="Um ponto por período (e por grupo, se `agrupar_por` for informado).",
+)
+def obter_serie(
+    metrica: MetricaSerie = Query("criados", description="criados, ganhos ou perdidos."),
+    granularidade: Granularidade = Query("dia", description="dia, semana (começa na segunda) ou mes."),
+    agrupar_por: Optional[AgruparPor] = Query(
+        default=None,
+        description="Separa cada período por responsavel_id, origem ou fase.",
+    ),
+    inicio: Optional[str] = Query(default=None, description=DESCRICAO_INICIO),
+    fim: Optional[str] = Query(default=None, description=DESCRICAO_FIM),
+    db: Session = Depends(obter_sessao),
+):
+    """
+    Quantidade e valor por período, agregados no banco a partir do resumo diário.
+
+    - `criados`: pelo dia de criação; `ganhos`/`perdidos`: pelo dia de
+      fechamento (com o ciclo médio em dias).
+    - Períodos sem negócios não aparecem.
+    """
+    inicio_data, fim_data = resolver_periodo(inicio, fim)
+
+    if quantidade_de_periodos(inicio_data, fim_data, granularidade) > MAX_PERIODOS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Intervalo grande demais para granularidade '{granularidade}' "
+                   f"(máximo de {MAX_PERIODOS} períodos). Use semana ou mes.",
+        )
+
+    return {
+        "metrica": metrica,
+        "granularidade": granularidade,
+        "agrupar_por": agrupar_por,
+        "inicio": inicio_data,
+        "fim": fim_data,
+        "pontos": serie_temporal(db, metrica, granularidade, inicio_data, fim_data, agrupar_por),
+    }
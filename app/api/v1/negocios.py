@@ -1,18 +1,70 @@
 # app/api/v1/negocios.py
-from typing import List, Optional
+from typing import List, Literal, Optional, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from app.banco_dados import obter_sessao
+from app.paginacao import (
+    CABECALHO_PROXIMO_CURSOR,
+    decodificar_cursor,
+    filtro_depois_do_cursor,
+    proximo_cursor,
+)
+from app.por_ids import cabecalhos_por_ids, carregar_por_ids, parametro_ids
+from app.serializacao import LISTAGEM_RAPIDA, parametro_campos, projecao
+from app.etag import (
+    CABECALHO_ETAG,
+    corresponde_if_none_match,
+    etag_colecao,
+    etag_registro,
+    exigir_if_match,
+    nao_modificado,
+)
 from app.modelos.negocio import Negocio
-from app.esquemas.negocio import NegocioCriar, NegocioLer, NegocioAtualizar
+from app.esquemas.negocio import (
+    NegocioCriar,
+    NegocioLer,
+    NegocioAtualizar,
+    NegocioLote,
+    NegocioPorIdsResultado,
+)
+from app.esquemas.lote import IdsEntrada, LoteResultado
+from app.servicos.exportacao import FORMATOS_EXPORTACAO, exportar_linhas
+from app.servicos.lotes import criar_negocios_em_lote
+from app.servicos.resumo_diario import (
+    aplicar_contribuicoes,
+    contribuicoes,
+    somar_contribuicoes,
+)
 
 roteador = APIRouter(
     prefix="/negocios",
     tags=["Negócios"],
 )
 
+# Parâmetro `campos=` das rotas de leitura (app/serializacao.py)
+CAMPOS_NEGOCIOS = parametro_campos(NegocioLer)
+
+
+def _filtros_negocios(
+    fase: Optional[str],
+    origem: Optional[str],
+    contato_id: Optional[int],
+) -> list:
+    """
+    Condições de filtro compartilhadas pela listagem e pela exportação.
+    """
+    condicoes = []
+    if fase:
+        condicoes.append(Negocio.fase == fase)
+    if origem:
+        condicoes.append(Negocio.origem == origem)
+    if contato_id:
+        condicoes.append(Negocio.contato_id == contato_id)
+    return condicoes
+
 
 @roteador.post(
     "/",
@@ -29,48 +81,153 @@ def criar_negocio(
     """
     negocio = Negocio(**entrada.dict())
     db.add(negocio)
+    db.flush()  # gera id e criado_em antes de somar no resumo diário
+    aplicar_contribuicoes(db, contribuicoes(negocio))
     db.commit()
     db.refresh(negocio)
     return negocio
 
 
+@roteador.post(
+    "/lote",
+    response_model=LoteResultado,
+    summary="Criar negócios em lote",
+)
+def criar_negocios_lote(
+    entrada: NegocioLote,
+    db: Session = Depends(obter_sessao),
+):
+    """
+    Cria muitos negócios de uma vez, em uma única transação.
+    Itens com contato ou responsável inexistente voltam como erro, sem
+    impedir a criação dos demais.
+    """
+    return criar_negocios_em_lote(db, entrada)
+
+
+@roteador.post(
+    "/por-ids",
+    response_model=NegocioPorIdsResultado,
+    summary="Obter vários negócios pelos IDs",
+)
+def obter_negocios_por_ids(
+    entrada: IdsEntrada,
+    db: Session = Depends(obter_sessao),
+):
+    """
+    Versão de GET /?ids= para listas grandes de ids (até 10000 por chamada),
+    lidos com uma consulta IN por bloco.
+    """
+    negocios, nao_encontrados = carregar_por_ids(db, Negocio, entrada.ids)
+    return {"itens": negocios, "nao_encontrados": nao_encontrados}
+
+
 @roteador.get(
     "/",
     response_model=List[NegocioLer],
     summary="Listar negócios",
 )
 def listar_negocios(
+    response: Response,
     fase: Optional[str] = Query(default=None, description="Filtrar por fase do funil."),
     origem: Optional[str] = Query(default=None, description="Filtrar por origem (whatsapp, site, etc.)."),
     contato_id: Optional[int] = Query(default=None, description="Filtrar por ID do contato."),
     pular: int = Query(0, ge=0),
     limite: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(
+        default=None,
+        description=(
+            "Cursor da próxima página (cabeçalho `X-Proximo-Cursor` da resposta anterior). "
+            "Quando informado, `pular` é ignorado."
+        ),
+    ),
+    ids: Optional[List[int]] = Depends(parametro_ids),
+    campos: Optional[Tuple[str, ...]] = Depends(CAMPOS_NEGOCIOS),
+    if_none_match: Optional[str] = Header(default=None, description="ETag já conhecida (responde 304 se não mudou)."),
     db: Session = Depends(obter_sessao),
 ):
     """
     Lista negócios com filtros opcionais por fase, origem e contato.
+
+    - Paginação por cursor: use o cabeçalho `X-Proximo-Cursor` como `cursor`
+      da próxima chamada (estável durante inserções, custo constante por página).
+    - `pular` (offset) continua disponível por compatibilidade.
+    - ETag da página no cabeçalho `ETag`; com `If-None-Match` igual, responde 304.
+    - `campos=id,fase,...`: lê e devolve só esses campos.
+    - `ids=3,7,12`: só esses negócios, na ordem pedida (ids inexistentes no
+      cabeçalho `X-Ids-Nao-Encontrados`).
     """
-    consulta = db.query(Negocio)
+    # Com `campos` ou no caminho rápido (CRM_LISTAGEM_RAPIDA): só as colunas, como tuplas
+    projetada = projecao(Negocio, NegocioLer, campos) if campos or LISTAGEM_RAPIDA else None
+    colunas = projetada.colunas if projetada else [Negocio]
 
-    if fase:
-        consulta = consulta.filter(Negocio.fase == fase)
+    if ids:
+        negocios, nao_encontrados = carregar_por_ids(db, Negocio, ids, colunas)
+        cursor_seguinte = None
+        cabecalhos = cabecalhos_por_ids(nao_encontrados)
+    else:
+        consulta = db.query(*colunas).filter(*_filtros_negocios(fase, origem, contato_id))
 
-    if origem:
-        consulta = consulta.filter(Negocio.origem == origem)
+        if cursor:
+            try:
+                criado_em, id_ = decodificar_cursor(cursor)
+            except ValueError as erro:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=str(erro),
+                )
+            consulta = consulta.filter(
+                filtro_depois_do_cursor(Negocio.criado_em, Negocio.id, criado_em, id_)
+            )
+            pular = 0
 
-    if contato_id:
-        consulta = consulta.filter(Negocio.contato_id == contato_id)
-
-    negocios = (
-        consulta
-        .order_by(Negocio.criado_em.desc())
-        .offset(pular)
-        .limit(limite)
-        .all()
-    )
+        negocios = (
+            consulta
+            .order_by(Negocio.criado_em.desc(), Negocio.id.desc())
+            .offset(pular)
+            .limit(limite)
+            .all()
+        )
+
+        cursor_seguinte = proximo_cursor(negocios, limite)
+        cabecalhos = {CABECALHO_PROXIMO_CURSOR: cursor_seguinte} if cursor_seguinte else {}
+
+    etag = etag_colecao(negocios, cursor_seguinte, tabela=Negocio.__tablename__)
+    if corresponde_if_none_match(if_none_match, etag):
+        return nao_modificado(etag, cabecalhos)
+
+    if projetada:
+        return projetada.resposta(negocios, {**cabecalhos, CABECALHO_ETAG: etag})
+
+    response.headers.update(cabecalhos)
+    response.headers[CABECALHO_ETAG] = etag
     return negocios
 
 
+@roteador.get(
+    "/exportar",
+    summary="Exportar negócios (NDJSON ou CSV)",
+    response_class=StreamingResponse,
+)
+def exportar_negocios(
+    formato: Literal["ndjson", "csv"] = Query("ndjson", description="Formato do arquivo."),
+    fase: Optional[str] = Query(default=None, description="Filtrar por fase do funil."),
+    origem: Optional[str] = Query(default=None, description="Filtrar por origem (whatsapp, site, etc.)."),
+    contato_id: Optional[int] = Query(default=None, description="Filtrar por ID do contato."),
+):
+    """
+    Exporta todos os negócios (com os mesmos filtros da listagem) em um único
+    download, lido e enviado em blocos: memória constante e primeiro byte
+    enviado logo no início.
+    """
+    campos = list(NegocioLer.model_fields)
+    return StreamingResponse(
+        exportar_linhas(Negocio, campos, _filtros_negocios(fase, origem, contato_id), formato),
+        media_type=FORMATOS_EXPORTACAO[formato],
+        headers={"Content-Disposition": f'attachment; filename="negocios.{formato}"'},
+    )
+
+
 @roteador.get(
     "/{negocio_id}",
     response_model=NegocioLer,
@@ -78,14 +235,34 @@ def listar_negocios(
 )
 def obter_negocio(
     negocio_id: int,
+    response: Response,
+    campos: Optional[Tuple[str, ...]] = Depends(CAMPOS_NEGOCIOS),
+    if_none_match: Optional[str] = Header(default=None, description="ETag já conhecida (responde 304 se não mudou)."),
     db: Session = Depends(obter_sessao),
 ):
-    negocio = db.get(Negocio, negocio_id)
+    """
+    Retorna um negócio pelo ID.
+    Com `If-None-Match` igual à ETag atual, responde 304 sem corpo.
+    """
+    if campos:
+        projetada = projecao(Negocio, NegocioLer, campos)
+        negocio = db.query(*projetada.colunas).filter(Negocio.id == negocio_id).first()
+    else:
+        negocio = db.get(Negocio, negocio_id)
     if not negocio:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Negócio não encontrado.",
         )
+
+    etag = etag_registro(negocio, tabela=Negocio.__tablename__)
+    if corresponde_if_none_match(if_none_match, etag):
+        return nao_modificado(etag)
+
+    if campos:
+        return projetada.resposta_item(negocio, {CABECALHO_ETAG: etag})
+
+    response.headers[CABECALHO_ETAG] = etag
     return negocio
 
 
@@ -97,21 +274,34 @@ def obter_negocio(
 def atualizar_negocio(
     negocio_id: int,
     entrada: NegocioAtualizar,
+    response: Response,
+    if_match: Optional[str] = Header(default=None, description="ETag lida antes (412 se o registro mudou)."),
     db: Session = Depends(obter_sessao),
 ):
+    """
+    Atualiza um negócio (parcial).
+    Com `If-Match`, só atualiza se o negócio não mudou desde a leitura (senão 412).
+    """
     negocio = db.get(Negocio, negocio_id)
     if not negocio:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Negócio não encontrado.",
         )
+    exigir_if_match(if_match, negocio)
+
+    # Retira a contribuição antiga do resumo diário e soma a nova
+    deltas = contribuicoes(negocio, sinal=-1)
 
     dados = entrada.dict(exclude_unset=True)
     for campo, valor in dados.items():
         setattr(negocio, campo, valor)
 
+    somar_contribuicoes(deltas, contribuicoes(negocio))
+    aplicar_contribuicoes(db, deltas)
     db.commit()
     db.refresh(negocio)
+    response.headers[CABECALHO_ETAG] = etag_registro(negocio)
     return negocio
 
 
@@ -131,6 +321,7 @@ def excluir_negocio(
             detail="Negócio não encontrado.",
         )
 
+    aplicar_contribuicoes(db, contribuicoes(negocio, sinal=-1))
     db.delete(negocio)
     db.commit()
     return None
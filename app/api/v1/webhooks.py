@@ -0,0 +1,28 @@
+# app/api/v1/webhooks.py
+from typing import List
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+from app.banco_dados import obter_sessao
+from app.esquemas.webhook import WebhookEstado
+from app.servicos.webhooks import despachante_webhooks, pendentes_por_destino
+
+roteador = APIRouter(
+    prefix="/webhooks",
+    tags=["Webhooks"],
+)
+
+
+@roteador.get(
+    "/estado",
+    response_model=List[WebhookEstado],
+    summary="Situação do envio de eventos aos webhooks",
+)
+def estado_webhooks(db: Session = Depends(obter_sessao)):
+    """
+    Para cada destino configurado em `CRM_WEBHOOKS`: eventos ainda não
+    entregues, totais entregues/falhas e as partições esperando nova tentativa.
+    """
+    pendentes = pendentes_por_destino(db, despachante_webhooks.destinos)
+    return despachante_webhooks.estado(pendentes)
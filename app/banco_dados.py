@@ -1,15 +1,158 @@
 # app/banco_dados.py
-from sqlalchemy import create_engine
+"""
+Conexão com o banco de dados.
+
+Tudo vem de variáveis de ambiente (com padrões para desenvolvimento):
+
+- DATABASE_URL        – URL do banco (padrão: SQLite em ./crm.db).
+- CRM_POOL_SIZE       – conexões mantidas abertas no pool (PostgreSQL: 10).
+- CRM_MAX_OVERFLOW    – conexões extras em picos (PostgreSQL: 20).
+- CRM_POOL_TIMEOUT    – segundos esperando uma conexão livre (30).
+- CRM_POOL_RECYCLE    – segundos até reabrir uma conexão (PostgreSQL: 1800).
+- CRM_SQLITE_<PRAGMA> – sobrescreve um item do perfil do SQLite
+                        (ex.: CRM_SQLITE_MMAP_SIZE=0).
+- CRM_ASYNC           – rotas CRUD assíncronas (ver `obter_sessao_assincrona`).
+"""
+import logging
+import os
+from functools import lru_cache
+from typing import Dict
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.orm import sessionmaker, declarative_base
 
-# URL do banco de dados (por enquanto SQLite em arquivo local)
-DATABASE_URL = "sqlite:///./crm.db"
+logger = logging.getLogger("uvicorn.error")
+
+# URL do banco de dados (padrão: SQLite em arquivo local)
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./crm.db")
+
+# Rotas CRUD da API assíncronas (AsyncSession) em vez de rodarem no pool de threads.
+# Ative com CRM_ASYNC=1 (requer `aiosqlite` no SQLite ou `asyncpg` no PostgreSQL).
+USAR_ASYNC = os.getenv("CRM_ASYNC", "").strip().lower() in ("1", "true", "sim", "yes")
+
+# Driver assíncrono de cada banco
+DRIVERS_ASSINCRONOS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+# PRAGMAs aplicados em cada conexão SQLite nova.
+# - WAL: leitores não esperam a escrita terminar (e vice-versa).
+# - synchronous=NORMAL: seguro com WAL, sem fsync a cada commit.
+# - mmap_size / cache_size: leituras direto da memória (256 MB / 64 MB).
+# - busy_timeout: espera o lock em vez de falhar com "database is locked".
+# - temp_store=MEMORY: ordenações e tabelas temporárias sem ir ao disco.
+PERFIL_SQLITE = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "mmap_size": 268435456,
+    "cache_size": -65536,  # negativo = em KiB
+    "busy_timeout": 5000,  # ms
+    "temp_store": "MEMORY",
+}
+
+# Pool de conexões dos bancos cliente/servidor (PostgreSQL etc.)
+POOL_PADRAO = {
+    "pool_size": 10,
+    "max_overflow": 20,
+    "pool_timeout": 30,
+    "pool_recycle": 1800,
+}
+
+
+def _inteiro_do_ambiente(nome: str, padrao: int) -> int:
+    valor = os.getenv(nome)
+    return int(valor) if valor not in (None, "") else padrao
+
+
+def perfil_sqlite() -> Dict[str, object]:
+    """
+    Perfil do SQLite com as sobrescritas de CRM_SQLITE_<PRAGMA>.
+    """
+    perfil = dict(PERFIL_SQLITE)
+    for pragma in perfil:
+        valor = os.getenv(f"CRM_SQLITE_{pragma.upper()}")
+        if valor not in (None, ""):
+            perfil[pragma] = valor
+    return perfil
+
+
+def opcoes_pool() -> Dict[str, int]:
+    """
+    Configuração do pool (PostgreSQL e afins), com as sobrescritas do ambiente.
+    """
+    return {
+        opcao: _inteiro_do_ambiente(f"CRM_{opcao.upper()}", padrao)
+        for opcao, padrao in POOL_PADRAO.items()
+    }
+
+
+def _aplicar_perfil_sqlite(engine_alvo: Engine, perfil: Dict[str, object]) -> None:
+    @event.listens_for(engine_alvo, "connect")
+    def _ao_conectar(conexao_dbapi, _registro):
+        cursor = conexao_dbapi.cursor()
+        try:
+            for pragma, valor in perfil.items():
+                cursor.execute(f"PRAGMA {pragma}={valor}")
+        finally:
+            cursor.close()
+
+
+def _argumentos_engine(url: str) -> Dict[str, object]:
+    if make_url(url).get_backend_name() == "sqlite":
+        # Necessário para SQLite com múltiplas threads
+        return {"connect_args": {"check_same_thread": False}}
+    return {"pool_pre_ping": True, **opcoes_pool()}
+
+
+def criar_engine(url: str = DATABASE_URL) -> Engine:
+    """
+    Cria o engine com o perfil do banco: PRAGMAs no SQLite, pool no PostgreSQL.
+    """
+    engine_novo = create_engine(url, **_argumentos_engine(url))
+    if engine_novo.dialect.name == "sqlite":
+        _aplicar_perfil_sqlite(engine_novo, perfil_sqlite())
+    return engine_novo
+
+
+def configuracao_efetiva(engine_alvo: Engine) -> Dict[str, object]:
+    """
+    Configuração realmente em uso (lida do banco, não do que foi pedido).
+    """
+    configuracao: Dict[str, object] = {
+        "banco": engine_alvo.dialect.name,
+        "url": engine_alvo.url.render_as_string(hide_password=True),
+        "pool": type(engine_alvo.pool).__name__,
+    }
+    if engine_alvo.dialect.name == "sqlite":
+        with engine_alvo.connect() as conexao:
+            for pragma in PERFIL_SQLITE:
+                configuracao[pragma] = conexao.exec_driver_sql(f"PRAGMA {pragma}").scalar()
+    else:
+        configuracao.update(
+            pool_size=engine_alvo.pool.size(),
+            max_overflow=engine_alvo.pool._max_overflow,
+            pool_timeout=engine_alvo.pool._timeout,
+            pool_recycle=engine_alvo.pool._recycle,
+        )
+    return configuracao
+
+
+def registrar_configuracao(engine_alvo: Engine) -> Dict[str, object]:
+    """
+    Escreve no log a configuração efetiva do banco (chamado ao iniciar a aplicação).
+    """
+    configuracao = configuracao_efetiva(engine_alvo)
+    logger.info(
+        "Banco de dados: %s",
+        ", ".join(f"{chave}={valor}" for chave, valor in configuracao.items()),
+    )
+    return configuracao
+
 
 # Criação do engine do SQLAlchemy
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False}  # Necessário para SQLite com múltiplas threads
-)
+engine = criar_engine()
 
 # Fábrica de sessões (cada request terá sua própria sessão)
 SessaoLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -28,3 +171,54 @@ def obter_sessao():
         yield sessao
     finally:
         sessao.close()
+
+
+def url_assincrona(url: str) -> str:
+    """
+    Troca o driver da URL pelo equivalente assíncrono
+    (ex.: sqlite:///./crm.db -> sqlite+aiosqlite:///./crm.db).
+    """
+    esquema, resto = url.split("://", 1)
+    banco = esquema.split("+", 1)[0]
+    if banco not in DRIVERS_ASSINCRONOS:
+        raise ValueError(f"Banco sem driver assíncrono configurado: {banco}")
+    return f"{DRIVERS_ASSINCRONOS[banco]}://{resto}"
+
+
+@lru_cache(maxsize=None)
+def fabrica_sessoes_assincronas():
+    """
+    Engine e fábrica de sessões assíncronas, criadas só no primeiro uso
+    (assim o modo síncrono não depende de aiosqlite/asyncpg).
+    Usa o mesmo perfil (PRAGMAs ou pool) do engine síncrono.
+    """
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    url = url_assincrona(DATABASE_URL)
+    argumentos = _argumentos_engine(url)
+    argumentos.pop("connect_args", None)  # check_same_thread não se aplica ao aiosqlite
+    engine_assincrono = create_async_engine(url, **argumentos)
+    if engine_assincrono.dialect.name == "sqlite":
+        _aplicar_perfil_sqlite(engine_assincrono.sync_engine, perfil_sqlite())
+
+    return async_sessionmaker(
+        engine_assincrono,
+        autoflush=False,
+        expire_on_commit=False,  # evita recarregar atributos (I/O implícito) após o commit
+    )
+
+
+async def obter_sessao_assincrona():
+    """
+    Dependência do FastAPI para obter uma sessão assíncrona (AsyncSession).
+    """
+    async with fabrica_sessoes_assincronas()() as sessao:
+        yield sessao
+
+
+async def fechar_engine_assincrono() -> None:
+    """
+    Fecha as conexões do engine assíncrono (se ele chegou a ser criado).
+    """
+    if fabrica_sessoes_assincronas.cache_info().currsize:
+        await fabrica_sessoes_assincronas().kw["bind"].dispose()
@@ -0,0 +1,445 @@
+# app/benchmark.py
+"""
+Benchmark das rotas mais usadas em várias escalas de dados.
+
+Para cada escala (quantidade de negócios), um subprocesso:
+1. aponta DATABASE_URL para um SQLite próprio (`benchmarks/crm_<escala>_s<semente>.db`),
+   gerado com `app/servicos/dados_sinteticos.py` (reaproveitado se já existir);
+2. chama as rotas dentro do próprio processo (TestClient) ou, com `--url`,
+   contra um uvicorn já rodando (aí o banco é o do servidor: gere antes os
+   dados da escala com `gerar-dados`);
+3. mede latência (p50/p95/p99), vazão, pico de RSS e quantidade de SQL por
+   requisição (só no modo em processo).
+
+O resultado vai para um JSON com chaves ordenadas, próprio para `git diff`
+entre commits; `--comparar base.json` aponta regressões de p95.
+
+O cache dos painéis fica desligado (CRM_CACHE_TTL=0) a menos que se peça
+`--com-cache`: o que interessa aqui é o custo de calcular.
+
+Requer `httpx` (TestClient do FastAPI e modo `--url`).
+"""
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+ESCALAS_PADRAO = [10_000, 100_000, 1_000_000]
+PASTA_PADRAO = "benchmarks"
+
+# Proporções do conjunto gerado em relação à quantidade de negócios
+CONTATOS_POR_NEGOCIO = 0.2
+FUNCIONARIOS = 50
+DIAS_HISTORICO = 730
+
+# Limites por rota: para no que vier primeiro (com um mínimo de requisições)
+REQUISICOES_PADRAO = 200
+SEGUNDOS_POR_ROTA = 10.0
+MINIMO_REQUISICOES = 5
+AQUECIMENTO = 2
+
+# Regressão de p95 (em %) a partir da qual `--comparar` falha
+TOLERANCIA_PADRAO = 20.0
+
+
+# Contatos criados pelo benchmark (removidos ao final da escala)
+PREFIXO_EMAIL_BENCHMARK = "benchmark-"
+
+
+def rotas_benchmark(
+    qtd_negocios: int, qtd_contatos: int
+) -> List[Tuple[str, str, Callable[[int], str], Optional[Callable[[int], Dict]]]]:
+    """
+    (nome, método, caminho(i), corpo(i)) de cada rota medida.
+    `i` é o número da requisição (varia os ids e evita e-mails repetidos).
+    """
+    carimbo = int(time.time())
+    # Ids espalhados pela tabela inteira (sempre os mesmos para a mesma escala)
+    qtd_negocios, qtd_contatos = max(qtd_negocios, 1), max(qtd_contatos, 1)
+    return [
+        ("GET /painel", "GET", lambda i: "/painel", None),
+        ("GET /funil", "GET", lambda i: "/funil", None),
+        ("GET /indicadores", "GET", lambda i: "/indicadores", None),
+        ("GET /api/v1/negocios/", "GET", lambda i: "/api/v1/negocios/", None),
+        ("GET /api/v1/negocios/?fase=em_proposta", "GET", lambda i: "/api/v1/negocios/?fase=em_proposta", None),
+        ("GET /api/v1/negocios/{id}", "GET", lambda i: f"/api/v1/negocios/{1 + (i * 7919) % qtd_negocios}", None),
+        ("GET /api/v1/contatos/{id}", "GET", lambda i: f"/api/v1/contatos/{1 + (i * 7919) % qtd_contatos}", None),
+        ("GET /api/v1/funcionarios/{id}", "GET", lambda i: f"/api/v1/funcionarios/{1 + i % FUNCIONARIOS}", None),
+        (
+            "POST /api/v1/contatos/",
+            "POST",
+            lambda i: "/api/v1/contatos/",
+            lambda i: {"nome": f"Benchmark {i}", "email": f"{PREFIXO_EMAIL_BENCHMARK}{carimbo}-{i}@exemplo.com"},
+        ),
+    ]
+
+
+def percentil(valores: List[float], p: float) -> float:
+    """
+    Percentil com interpolação linear (valores já ordenados).
+    """
+    if not valores:
+        return 0.0
+    posicao = (len(valores) - 1) * p / 100
+    baixo = int(posicao)
+    alto = min(baixo + 1, len(valores) - 1)
+    return valores[baixo] + (valores[alto] - valores[baixo]) * (posicao - baixo)
+
+
+def _zerar_pico_rss() -> bool:
+    # Linux: escrever 5 em clear_refs zera o pico (VmHWM) do processo
+    try:
+        with open("/proc/self/clear_refs", "w") as arquivo:
+            arquivo.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _pico_rss_mb() -> float:
+    try:
+        with open("/proc/self/status") as arquivo:
+            for linha in arquivo:
+                if linha.startswith("VmHWM:"):
+                    return round(int(linha.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    import resource
+
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss vem em KiB no Linux e em bytes no macOS
+    return round(pico / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+class ContadorSQL:
+    """
+    Conta os comandos SQL enviados ao banco pelo engine.
+    """
+
+    def __init__(self, engine):
+        from sqlalchemy import event
+
+        self.total = 0
+        self._trava = threading.Lock()
+        event.listen(engine, "before_cursor_execute", self._contar)
+
+    def _contar(self, *_args):
+        with self._trava:
+            self.total += 1
+
+
+def medir_rota(
+    cliente,
+    metodo: str,
+    caminho: Callable[[int], str],
+    corpo: Optional[Callable[[int], Dict]],
+    contador: Optional[ContadorSQL],
+    requisicoes: int = REQUISICOES_PADRAO,
+    segundos: float = SEGUNDOS_POR_ROTA,
+) -> Dict:
+    """
+    Mede uma rota: chama até `requisicoes` vezes ou por até `segundos`.
+    """
+    for i in range(AQUECIMENTO):
+        cliente.request(metodo, caminho(-1 - i), json=corpo(-1 - i) if corpo else None)
+
+    rss_por_rota = _zerar_pico_rss()
+    sql_antes = contador.total if contador else 0
+    latencias: List[float] = []
+    erros = 0
+    inicio = time.perf_counter()
+
+    for i in range(requisicoes):
+        antes = time.perf_counter()
+        resposta = cliente.request(metodo, caminho(i), json=corpo(i) if corpo else None)
+        latencias.append((time.perf_counter() - antes) * 1000)
+        if resposta.status_code >= 400:
+            erros += 1
+        if time.perf_counter() - inicio > segundos and len(latencias) >= MINIMO_REQUISICOES:
+            break
+
+    total = time.perf_counter() - inicio
+    latencias.sort()
+    resultado = {
+        "requisicoes": len(latencias),
+        "erros": erros,
+        "p50_ms": round(percentil(latencias, 50), 3),
+        "p95_ms": round(percentil(latencias, 95), 3),
+        "p99_ms": round(percentil(latencias, 99), 3),
+        "media_ms": round(sum(latencias) / len(latencias), 3),
+        "requisicoes_por_segundo": round(len(latencias) / total, 1) if total else 0.0,
+        "sql_por_requisicao": None,
+        "pico_rss_mb": None,
+    }
+    if contador:
+        resultado["sql_por_requisicao"] = round((contador.total - sql_antes) / len(latencias), 2)
+        # Sem clear_refs o pico é do processo inteiro, não só desta rota
+        resultado["pico_rss_mb"] = _pico_rss_mb() if rss_por_rota else None
+    return resultado
+
+
+def executar_escala(
+    escala: int,
+    semente: int,
+    url: Optional[str] = None,
+    regerar: bool = False,
+    requisicoes: int = REQUISICOES_PADRAO,
+    segundos: float = SEGUNDOS_POR_ROTA,
+) -> Dict:
+    """
+    Roda o benchmark de uma escala no processo atual.
+    Usa o banco de DATABASE_URL (o subprocesso de `executar` aponta para o arquivo da escala).
+    """
+    from app.banco_dados import SessaoLocal, engine
+    from app.migracoes import atualizar_esquema
+    from app.modelos.contato import Contato
+    from app.modelos.evento_saida import EventoSaida
+    from app.modelos.negocio import Negocio
+    from app.servicos.dados_sinteticos import gerar_dados
+    from app.servicos.lotes import em_blocos
+
+    resultado: Dict = {"escala_negocios": escala, "geracao_segundos": None, "rotas": {}}
+    qtd_contatos = max(int(escala * CONTATOS_POR_NEGOCIO), 1)
+
+    if url is None:
+        atualizar_esquema(engine)
+        with SessaoLocal() as db:
+            existentes = db.query(Negocio.id).count()
+        if regerar or existentes != escala:
+            inicio = time.perf_counter()
+            with SessaoLocal() as db:
+                gerar_dados(
+                    db,
+                    semente=semente,
+                    qtd_funcionarios=FUNCIONARIOS,
+                    qtd_contatos=qtd_contatos,
+                    qtd_negocios=escala,
+                    dias_passado=DIAS_HISTORICO,
+                    limpar=True,
+                )
+            resultado["geracao_segundos"] = round(time.perf_counter() - inicio, 1)
+
+        from fastapi.testclient import TestClient
+        from app.main import app
+
+        cliente = TestClient(app)
+        contador = ContadorSQL(engine)
+    else:
+        import httpx
+
+        cliente = httpx.Client(base_url=url, timeout=120)
+        contador = None
+
+    for nome, metodo, caminho, corpo in rotas_benchmark(escala, qtd_contatos):
+        medidas = medir_rota(
+            cliente, metodo, caminho, corpo, contador, requisicoes=requisicoes, segundos=segundos
+        )
+        resultado["rotas"][nome] = medidas
+        print(f"  {nome}: p50={medidas['p50_ms']}ms p95={medidas['p95_ms']}ms", file=sys.stderr)
+
+    if url is None:
+        # Devolve o banco ao estado gerado, para a próxima rodada medir a mesma coisa:
+        # os contatos criados e os eventos de webhook que eles geraram
+        with SessaoLocal() as db:
+            ids = [
+                contato_id for (contato_id,) in
+                db.query(Contato.id).filter(Contato.email.like(f"{PREFIXO_EMAIL_BENCHMARK}%"))
+            ]
+            for bloco in em_blocos(ids):
+                db.query(EventoSaida).filter(
+                    EventoSaida.entidade == "contato", EventoSaida.entidade_id.in_(bloco)
+                ).delete(synchronize_session=False)
+                db.query(Contato).filter(Contato.id.in_(bloco)).delete(synchronize_session=False)
+            db.commit()
+    return resultado
+
+
+def _commit_atual() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def executar(
+    escalas: List[int],
+    saida: str,
+    semente: int,
+    url: Optional[str] = None,
+    pasta: str = PASTA_PADRAO,
+    com_cache: bool = False,
+    regerar: bool = False,
+    requisicoes: int = REQUISICOES_PADRAO,
+    segundos: float = SEGUNDOS_POR_ROTA,
+) -> Dict:
+    """
+    Roda cada escala em um subprocesso (banco e configuração próprios) e
+    grava o resultado consolidado em `saida`.
+    """
+    relatorio: Dict = {
+        "commit": _commit_atual(),
+        "gerado_em": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "modo": "url" if url else "em_processo",
+        "cache_paineis": com_cache,
+        "semente": semente,
+        "escalas": {},
+    }
+    os.makedirs(pasta, exist_ok=True)
+
+    # Contra um servidor externo o banco é o dele: roda só a primeira escala,
+    # que deve corresponder aos dados carregados nele (define os ids sorteados)
+    for escala in (escalas[:1] if url else escalas):
+        print(f"Escala {escala}...", file=sys.stderr)
+        ambiente = dict(os.environ)
+        ambiente["DATABASE_URL"] = "sqlite:///" + os.path.abspath(
+            os.path.join(pasta, f"crm_{escala}_s{semente}.db")
+        )
+        if not com_cache:
+            ambiente["CRM_CACHE_TTL"] = "0"
+
+        with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as parcial:
+            caminho_parcial = parcial.name
+        comando = [
+            sys.executable, "-m", "app.comandos", "benchmark",
+            "--escala-unica", str(escala),
+            "--saida-parcial", caminho_parcial,
+            "--semente", str(semente),
+            "--requisicoes", str(requisicoes),
+            "--segundos", str(segundos),
+        ]
+        if url:
+            comando += ["--url", url]
+        if regerar:
+            comando.append("--regerar")
+        try:
+            subprocess.run(comando, env=ambiente, check=True)
+            with open(caminho_parcial, encoding="utf-8") as arquivo:
+                relatorio["escalas"][str(escala)] = json.load(arquivo)
+        finally:
+            os.remove(caminho_parcial)
+
+    with open(saida, "w", encoding="utf-8") as arquivo:
+        json.dump(relatorio, arquivo, indent=2, sort_keys=True, ensure_ascii=False)
+        arquivo.write("\n")
+    return relatorio
+
+
+def comparar(base: Dict, atual: Dict, tolerancia: float = TOLERANCIA_PADRAO) -> List[str]:
+    """
+    Rotas cujo p95 piorou mais que `tolerancia`% em relação à base.
+    """
+    regressoes = []
+    for escala, dados in atual.get("escalas", {}).items():
+        rotas_base = base.get("escalas", {}).get(escala, {}).get("rotas", {})
+        for rota, medidas in dados.get("rotas", {}).items():
+            anterior = rotas_base.get(rota)
+            if not anterior or not anterior.get("p95_ms"):
+                continue
+            variacao = (medidas["p95_ms"] - anterior["p95_ms"]) / anterior["p95_ms"] * 100
+            if variacao > tolerancia:
+                regressoes.append(
+                    f"[{escala}] {rota}: p95 {anterior['p95_ms']}ms -> {medidas['p95_ms']}ms (+{variacao:.0f}%)"
+                )
+    return regressoes
+
+
+def medir_serializacao(linhas: int = 500, repeticoes: int = 50) -> Dict[str, Dict]:
+    """
+    Microbenchmark da listagem (consulta + JSON) com `linhas` itens, em um
+    SQLite em memória: caminho normal (ORM + `response_model` do FastAPI)
+    contra o caminho rápido de app/serializacao.py. Confere se os dois
+    geram exatamente os mesmos bytes.
+    """
+    import asyncio
+    from datetime import date, timedelta
+    from decimal import Decimal
+
+    from fastapi.responses import JSONResponse
+    from fastapi.routing import serialize_response
+    from fastapi.utils import create_model_field
+    from sqlalchemy import create_engine, insert
+    from sqlalchemy.orm import Session
+
+    from app.banco_dados import Base
+    from app.esquemas.contato import ContatoLer
+    from app.esquemas.negocio import NegocioLer
+    from app.modelos.contato import Contato
+    from app.modelos.negocio import Negocio
+    from app.serializacao import projecao
+
+    engine_memoria = create_engine("sqlite://")
+    Base.metadata.create_all(engine_memoria)
+    agora = datetime(2025, 1, 1, 12, 0, 0, 123456)
+    with engine_memoria.begin() as conexao:
+        conexao.execute(insert(Contato), [
+            {
+                "nome": f"Contato {i}", "email": f"contato{i}@exemplo.com", "telefone": "+55 92 99999-0000",
+                "empresa": "Empresa X", "origem": "whatsapp", "situacao": "lead",
+                "criado_em": agora - timedelta(minutes=i), "atualizado_em": agora if i % 2 else None,
+            }
+            for i in range(linhas)
+        ])
+        conexao.execute(insert(Negocio), [
+            {
+                "titulo": f"Negócio {i}", "descricao": "Descrição do negócio. " * 20,
+                "valor_previsto": Decimal("15000.50") if i % 3 else None, "fase": "em_proposta",
+                "origem": "site", "probabilidade": i % 100, "contato_id": 1,
+                "data_prevista_fechamento": date(2025, 2, 1), "criado_em": agora - timedelta(minutes=i),
+            }
+            for i in range(linhas)
+        ])
+
+    loop = asyncio.new_event_loop()
+    resultado = {}
+    try:
+        for modelo, esquema in ((Contato, ContatoLer), (Negocio, NegocioLer)):
+            campo = create_model_field(name="resposta", type_=List[esquema], mode="serialization")
+            listagem = projecao(modelo, esquema)
+            ordem = (modelo.criado_em.desc(), modelo.id.desc())
+
+            def normal() -> bytes:
+                with Session(engine_memoria) as db:
+                    objetos = db.query(modelo).order_by(*ordem).limit(linhas).all()
+                    conteudo = loop.run_until_complete(
+                        serialize_response(field=campo, response_content=objetos, is_coroutine=True)
+                    )
+                    return JSONResponse(conteudo).body
+
+            def rapido() -> bytes:
+                with Session(engine_memoria) as db:
+                    return listagem.json(db.query(*listagem.colunas).order_by(*ordem).limit(linhas).all())
+
+            medidas = {}
+            for nome, funcao in (("normal", normal), ("rapido", rapido)):
+                for _ in range(AQUECIMENTO):
+                    corpo = funcao()
+                tempos = []
+                for _ in range(repeticoes):
+                    inicio = time.perf_counter()
+                    funcao()
+                    tempos.append((time.perf_counter() - inicio) * 1000)
+                tempos.sort()
+                medidas[nome] = (round(percentil(tempos, 50), 2), corpo)
+
+            resultado[esquema.__name__] = {
+                "linhas": linhas,
+                "normal_p50_ms": medidas["normal"][0],
+                "rapido_p50_ms": medidas["rapido"][0],
+                "ganho": round(medidas["normal"][0] / medidas["rapido"][0], 1),
+                "bytes": len(medidas["rapido"][1]),
+                "json_igual": medidas["normal"][1] == medidas["rapido"][1],
+            }
+    finally:
+        loop.close()
+        engine_memoria.dispose()
+    return resultado
@@ -0,0 +1,284 @@
+# app/comandos.py
+"""
+Comandos de manutenção do CRM.
+
+Uso:
+    python -m app.comandos atualizar-esquema
+    python -m app.comandos configuracao-banco
+    python -m app.comandos explicar-consultas
+    python -m app.comandos reconstruir-resumo
+    python -m app.comandos importar contatos arquivo.csv [--tamanho-lote 1000]
+    python -m app.comandos gerar-dados --negocios 1000000 --contatos 200000 [--semente 42]
+    python -m app.comandos benchmark --escalas 10000 100000 [--saida benchmark.json] [--comparar base.json]
+    python -m app.comandos benchmark-serializacao [--linhas 500]
+"""
+import argparse
+import json
+import threading
+import time
+from datetime import date
+
+from app.banco_dados import configuracao_efetiva, engine, SessaoLocal
+from app.migracoes import atualizar_esquema
+from app.servicos.dados_sinteticos import SEMENTE_PADRAO, gerar_dados
+from app.servicos.importacao import TAMANHO_LOTE_PADRAO, executar_importacao, nova_importacao
+from app.servicos.resumo_diario import reconstruir_resumo
+
+
+def comando_atualizar_esquema(_args: argparse.Namespace) -> None:
+    """
+    Cria tabelas, colunas e índices que faltam em um banco existente.
+    """
+    alteracoes = atualizar_esquema(engine)
+    if not alteracoes:
+        print("Esquema já está atualizado.")
+    for alteracao in alteracoes:
+        print(f"criado: {alteracao}")
+
+
+def comando_configuracao_banco(_args: argparse.Namespace) -> None:
+    """
+    Mostra a configuração efetiva do banco (PRAGMAs do SQLite ou pool).
+    """
+    for chave, valor in configuracao_efetiva(engine).items():
+        print(f"{chave}: {valor}")
+
+
+def comando_explicar_consultas(_args: argparse.Namespace) -> None:
+    """
+    Mostra o plano de execução das consultas críticas das rotas.
+    Sai com código 1 se alguma ainda lê uma tabela inteira sem índice.
+    """
+    from app.diagnostico import relatorio_planos
+    from app.main import app
+
+    resultado = relatorio_planos(app, engine)
+    if resultado["varreduras_completas"]:
+        raise SystemExit(1)
+
+
+def comando_reconstruir_resumo(_args: argparse.Namespace) -> None:
+    """
+    Recalcula a tabela `negocios_resumo_diario` a partir de `negocios`.
+    """
+    atualizar_esquema(engine)
+    with SessaoLocal() as db:
+        linhas = reconstruir_resumo(db)
+        db.commit()
+    print(f"Resumo diário reconstruído: {linhas} linhas.")
+
+
+def comando_importar(args: argparse.Namespace) -> None:
+    """
+    Importa um CSV de contatos ou negócios, mostrando o andamento.
+    """
+    try:
+        mapeamento = json.loads(args.mapeamento) if args.mapeamento else {}
+    except ValueError:
+        raise SystemExit("Mapeamento inválido: use um JSON como {\"coluna_do_csv\": \"campo\"}.")
+
+    atualizar_esquema(engine)
+    importacao = nova_importacao(args.tipo)
+    execucao = threading.Thread(
+        target=executar_importacao,
+        args=(importacao, args.arquivo),
+        kwargs={"mapeamento": mapeamento, "tamanho_lote": args.tamanho_lote, "modo": args.modo},
+    )
+    execucao.start()
+    while execucao.is_alive():
+        execucao.join(timeout=2)
+        print(
+            f"{importacao.linhas_processadas} linhas "
+            f"({importacao.linhas_por_segundo} linhas/s), "
+            f"{importacao.criados} criados, {importacao.atualizados} atualizados, "
+            f"{importacao.erros} erros"
+        )
+
+    for erro in importacao.amostra_erros:
+        print(f"linha {erro['linha']}: {erro['erro']}")
+    if importacao.situacao == "falhou":
+        raise SystemExit(f"Importação falhou: {importacao.mensagem}")
+    print("Importação concluída.")
+
+
+def comando_gerar_dados(args: argparse.Namespace) -> None:
+    """
+    Gera dados sintéticos reprodutíveis em massa (para testes de carga).
+    """
+    atualizar_esquema(engine)
+    inicio = time.perf_counter()
+
+    def progresso(rotulo: str, linhas: int) -> None:
+        decorrido = time.perf_counter() - inicio
+        print(f"{rotulo}: {linhas} linhas ({decorrido:.1f}s)")
+
+    with SessaoLocal() as db:
+        resumo = gerar_dados(
+            db,
+            semente=args.semente,
+            qtd_funcionarios=args.funcionarios,
+            qtd_contatos=args.contatos,
+            qtd_negocios=args.negocios,
+            dias_passado=args.dias,
+            limpar=not args.manter,
+            hoje=args.hoje,
+            progresso=progresso,
+        )
+    for chave, valor in resumo.items():
+        print(f"{chave}: {valor}")
+    print(f"Concluído em {time.perf_counter() - inicio:.1f}s.")
+
+
+def comando_benchmark(args: argparse.Namespace) -> None:
+    """
+    Mede latência, vazão, memória e SQL das rotas principais por escala.
+    Sai com código 1 se `--comparar` encontrar regressões de p95.
+    """
+    from app import benchmark
+
+    if args.escala_unica is not None:
+        # Execução interna: uma escala, já com DATABASE_URL apontando para o banco dela
+        resultado = benchmark.executar_escala(
+            args.escala_unica,
+            args.semente,
+            url=args.url,
+            regerar=args.regerar,
+            requisicoes=args.requisicoes,
+            segundos=args.segundos,
+        )
+        with open(args.saida_parcial, "w", encoding="utf-8") as arquivo:
+            json.dump(resultado, arquivo)
+        return
+
+    relatorio = benchmark.executar(
+        args.escalas,
+        args.saida,
+        args.semente,
+        url=args.url,
+        pasta=args.pasta,
+        com_cache=args.com_cache,
+        regerar=args.regerar,
+        requisicoes=args.requisicoes,
+        segundos=args.segundos,
+    )
+    print(f"Resultado gravado em {args.saida} (commit {relatorio['commit']}).")
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as arquivo:
+            base = json.load(arquivo)
+        regressoes = benchmark.comparar(base, relatorio, args.tolerancia)
+        for regressao in regressoes:
+            print(f"regressão: {regressao}")
+        if regressoes:
+            raise SystemExit(1)
+        print(f"Sem regressões de p95 acima de {args.tolerancia:.0f}% em relação a {args.comparar}.")
+
+
+def comando_benchmark_serializacao(args: argparse.Namespace) -> None:
+    """
+    Compara o caminho normal e o rápido (CRM_LISTAGEM_RAPIDA) das listagens.
+    Sai com código 1 se os dois não gerarem o mesmo JSON.
+    """
+    from app import benchmark
+
+    resultado = benchmark.medir_serializacao(args.linhas, args.repeticoes)
+    for esquema, medidas in resultado.items():
+        print(
+            f"{esquema} ({medidas['linhas']} linhas, {medidas['bytes']} bytes): "
+            f"normal {medidas['normal_p50_ms']}ms, rápido {medidas['rapido_p50_ms']}ms "
+            f"({medidas['ganho']}x), JSON igual: {'sim' if medidas['json_igual'] else 'NÃO'}"
+        )
+    if not all(medidas["json_igual"] for medidas in resultado.values()):
+        raise SystemExit(1)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.comandos", description="Comandos do CRM.")
+    subcomandos = parser.add_subparsers(dest="comando", required=True)
+
+    sub = subcomandos.add_parser(
+        "atualizar-esquema",
+        help="Cria tabelas, colunas e índices novos em um banco já existente.",
+    )
+    sub.set_defaults(executar=comando_atualizar_esquema)
+
+    sub = subcomandos.add_parser(
+        "configuracao-banco",
+        help="Mostra a configuração efetiva do banco (DATABASE_URL, PRAGMAs ou pool).",
+    )
+    sub.set_defaults(executar=comando_configuracao_banco)
+
+    sub = subcomandos.add_parser(
+        "explicar-consultas",
+        help="Mostra o EXPLAIN das consultas das rotas principais e aponta varreduras completas.",
+    )
+    sub.set_defaults(executar=comando_explicar_consultas)
+
+    sub = subcomandos.add_parser(
+        "reconstruir-resumo",
+        help="Recalcula o resumo diário de negócios (usado por /funil e /indicadores).",
+    )
+    sub.set_defaults(executar=comando_reconstruir_resumo)
+
+    sub = subcomandos.add_parser(
+        "importar",
+        help="Importa um CSV de contatos ou negócios em lotes.",
+    )
+    sub.add_argument("tipo", choices=["contatos", "negocios"])
+    sub.add_argument("arquivo", help="Caminho do arquivo CSV (com cabeçalho).")
+    sub.add_argument("--tamanho-lote", type=int, default=TAMANHO_LOTE_PADRAO, help="Linhas por transação.")
+    sub.add_argument("--modo", choices=["inserir", "upsert"], default="inserir")
+    sub.add_argument("--mapeamento", help='JSON {"coluna_do_csv": "campo"}.')
+    sub.set_defaults(executar=comando_importar)
+
+    sub = subcomandos.add_parser(
+        "gerar-dados",
+        help="Gera funcionários, contatos e negócios sintéticos (reprodutíveis) em massa.",
+    )
+    sub.add_argument("--funcionarios", type=int, default=50)
+    sub.add_argument("--contatos", type=int, default=20000)
+    sub.add_argument("--negocios", type=int, default=100000)
+    sub.add_argument("--dias", type=int, default=365, help="Quantos dias de histórico.")
+    sub.add_argument("--semente", type=int, default=SEMENTE_PADRAO)
+    sub.add_argument(
+        "--hoje",
+        type=date.fromisoformat,
+        default=None,
+        help="Data de referência (AAAA-MM-DD); com a mesma semente, gera dados idênticos.",
+    )
+    sub.add_argument("--manter", action="store_true", help="Não apaga os dados existentes.")
+    sub.set_defaults(executar=comando_gerar_dados)
+
+    sub = subcomandos.add_parser(
+        "benchmark",
+        help="Mede p50/p95/p99, vazão, pico de RSS e SQL por rota em bancos de 10k/100k/1M negócios.",
+    )
+    sub.add_argument("--escalas", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    sub.add_argument("--saida", default="benchmark.json", help="Arquivo JSON com o resultado.")
+    sub.add_argument("--pasta", default="benchmarks", help="Onde ficam os bancos gerados para cada escala.")
+    sub.add_argument("--semente", type=int, default=SEMENTE_PADRAO)
+    sub.add_argument("--url", help="Mede um uvicorn já rodando (ex.: http://127.0.0.1:8000).")
+    sub.add_argument("--requisicoes", type=int, default=200, help="Máximo de requisições por rota.")
+    sub.add_argument("--segundos", type=float, default=10.0, help="Tempo máximo por rota.")
+    sub.add_argument("--com-cache", action="store_true", help="Mantém o cache dos painéis ligado.")
+    sub.add_argument("--regerar", action="store_true", help="Gera os bancos de novo mesmo se já existirem.")
+    sub.add_argument("--comparar", help="JSON de uma rodada anterior: falha se o p95 piorar além da tolerância.")
+    sub.add_argument("--tolerancia", type=float, default=20.0, help="Piora de p95 aceita, em %%.")
+    sub.add_argument("--escala-unica", type=int, help=argparse.SUPPRESS)
+    sub.add_argument("--saida-parcial", help=argparse.SUPPRESS)
+    sub.set_defaults(executar=comando_benchmark)
+
+    sub = subcomandos.add_parser(
+        "benchmark-serializacao",
+        help="Microbenchmark da listagem: ORM + response_model contra colunas + TypeAdapter.",
+    )
+    sub.add_argument("--linhas", type=int, default=500, help="Itens por listagem.")
+    sub.add_argument("--repeticoes", type=int, default=50)
+    sub.set_defaults(executar=comando_benchmark_serializacao)
+
+    args = parser.parse_args(argv)
+    args.executar(args)
+
+
+if __name__ == "__main__":
+    main()
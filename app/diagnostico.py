@@ -0,0 +1,134 @@
+# app/diagnostico.py
+"""
+Conferência dos planos de execução das consultas críticas.
+
+Chama as rotas mais usadas dentro do próprio processo, captura cada SELECT
+que elas enviam ao banco e roda `EXPLAIN QUERY PLAN` (SQLite) ou `EXPLAIN`
+(PostgreSQL) com os mesmos parâmetros. Assim o que é conferido é exatamente
+o SQL gerado pelas rotas, não uma cópia dele.
+
+Requer `httpx` (usado pelo TestClient do FastAPI).
+"""
+from datetime import datetime
+from typing import List, Dict, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.paginacao import codificar_cursor
+
+
+def rotas_criticas() -> List[str]:
+    """
+    Rotas cujas consultas devem usar índices.
+    """
+    cursor = codificar_cursor(datetime.utcnow(), 2**31)
+    return [
+        "/painel",
+        "/funil",
+        f"/funil/novo/mais?cursor={cursor}",
+        "/indicadores",
+        "/api/v1/negocios/",
+        f"/api/v1/negocios/?cursor={cursor}",
+        "/api/v1/negocios/?fase=em_proposta",
+        "/api/v1/negocios/?origem=site",
+        "/api/v1/negocios/?contato_id=1",
+        "/api/v1/negocios/1",
+        "/api/v1/contatos/",
+        "/api/v1/contatos/?situacao=lead",
+        f"/api/v1/contatos/?situacao=lead&cursor={cursor}",
+        "/api/v1/contatos/1",
+    ]
+
+
+def capturar_consultas(app, engine: Engine, rotas: List[str]) -> List[Tuple[str, str, tuple]]:
+    """
+    Executa as rotas e devolve (rota, sql, parâmetros) de cada SELECT distinto.
+    """
+    from fastapi.testclient import TestClient
+
+    capturadas: List[Tuple[str, str, tuple]] = []
+    vistas = set()
+    rota_atual = {"rota": ""}
+
+    def ao_executar(conn, cursor, statement, parameters, context, executemany):
+        if not statement.lstrip().upper().startswith("SELECT"):
+            return
+        if statement in vistas:
+            return
+        vistas.add(statement)
+        capturadas.append((rota_atual["rota"], statement, parameters))
+
+    cliente = TestClient(app, raise_server_exceptions=False)
+    event.listen(engine, "before_cursor_execute", ao_executar)
+    try:
+        for rota in rotas:
+            rota_atual["rota"] = rota
+            cliente.get(rota)
+    finally:
+        event.remove(engine, "before_cursor_execute", ao_executar)
+
+    return capturadas
+
+
+def explicar(engine: Engine, sql: str, parametros) -> List[str]:
+    """
+    Linhas do plano de execução de uma consulta.
+    """
+    if engine.dialect.name == "sqlite":
+        with engine.connect() as conexao:
+            linhas = conexao.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}", parametros).all()
+        return [linha[-1] for linha in linhas]
+
+    with engine.connect() as conexao:
+        linhas = conexao.exec_driver_sql(f"EXPLAIN {sql}", parametros).all()
+    return [linha[0] for linha in linhas]
+
+
+def varreduras_completas(plano: List[str]) -> List[str]:
+    """
+    Passos do plano que leem uma tabela inteira sem índice.
+    """
+    passos = [passo.strip() for passo in plano]
+
+    # Subconsultas (CO-ROUTINE/MATERIALIZE) são resultados intermediários, não tabelas
+    intermediarios = {
+        passo.split()[1]
+        for passo in passos
+        if passo.startswith(("CO-ROUTINE ", "MATERIALIZE "))
+    }
+
+    problemas = []
+    for passo in passos:
+        if passo.startswith("SCAN ") and "INDEX" not in passo:
+            alvo = passo.split()[1]
+            if alvo in intermediarios or alvo.startswith("(") or alvo == "CONSTANT":
+                continue
+            problemas.append(passo)
+        elif "Seq Scan" in passo:
+            problemas.append(passo)
+    return problemas
+
+
+def relatorio_planos(app, engine: Engine) -> Dict[str, int]:
+    """
+    Imprime o plano de cada consulta crítica e marca as varreduras completas.
+    Retorna {"consultas": n, "varreduras_completas": m}.
+    """
+    consultas = capturar_consultas(app, engine, rotas_criticas())
+    total_problemas = 0
+
+    for rota, sql, parametros in consultas:
+        plano = explicar(engine, sql, parametros)
+        problemas = varreduras_completas(plano)
+        total_problemas += len(problemas)
+
+        situacao = "VARREDURA COMPLETA" if problemas else "ok"
+        print(f"[{situacao}] {rota}")
+        print("    " + " ".join(sql.split()))
+        for passo in plano:
+            print(f"      {passo}")
+        print()
+
+    print(f"{len(consultas)} consultas conferidas, {total_problemas} varreduras completas.")
+    return {"consultas": len(consultas), "varreduras_completas": total_problemas}
@@ -4,6 +4,7 @@
 from app.esquemas.contato import (
     ContatoBase,
     ContatoCriar,
+    ContatoLote,
     ContatoAtualizar,
     ContatoLer,
 )  # noqa: F401
@@ -11,6 +12,7 @@ from app.esquemas.contato import (
 from app.esquemas.negocio import (
     NegocioBase,
     NegocioCriar,
+    NegocioLote,
     NegocioAtualizar,
     NegocioLer,
 )  # noqa: F401
@@ -21,3 +23,13 @@ from app.esquemas.funcionario import (
     FuncionarioAtualizar,
     FuncionarioLer,
 )  # noqa: F401
+
+from app.esquemas.lote import (
+    LoteItemResultado,
+    LoteResultado,
+)  # noqa: F401
+
+from app.esquemas.importacao import (
+    ImportacaoErro,
+    ImportacaoLer,
+)  # noqa: F401
@@ -1,49 +1,76 @@
 # app/esquemas/contato.py
 from datetime import datetime
-from typing import Optional
+from typing import Dict, List, Literal, Optional
 
-from pydantic import BaseModel, EmailStr, ConfigDict
+from pydantic import BaseModel, EmailStr, ConfigDict, Field, model_validator
+
+from app.esquemas.lote import MAX_ITENS_LOTE
+
+# Limite de identificadores (telefones + e-mails) por chamada de POST /contatos/resolver
+MAX_IDENTIFICADORES_RESOLVER = 1000
 
 
 class ContatoBase(BaseModel):
     """
     Campos básicos compartilhados entre criação, leitura e atualização.
     """
-    primeiro_nome: str
-    sobrenome: Optional[str] = None
+    nome: str
     email: Optional[EmailStr] = None
     telefone: Optional[str] = None
+    empresa: Optional[str] = None
+    origem: Optional[str] = None
     situacao: str = "lead"
 
 
 class ContatoCriar(ContatoBase):
     """
     Esquema usado ao criar um novo contato.
+    Os limites de tamanho são os das colunas da tabela `contatos`.
     """
+    nome: str = Field(..., max_length=150)
+    telefone: Optional[str] = Field(default=None, max_length=50)
+    empresa: Optional[str] = Field(default=None, max_length=150)
+    origem: Optional[str] = Field(default=None, max_length=50)
+    situacao: str = Field(default="lead", max_length=50)
+
     # Exemplo que aparece direto na documentação do FastAPI (/docs)
     model_config = ConfigDict(
         json_schema_extra={
             "example": {
-                "primeiro_nome": "João",
-                "sobrenome": "Silva",
+                "nome": "João Silva",
                 "email": "joao.silva@empresa.com",
                 "telefone": "5592999999999",
+                "empresa": "Empresa X",
+                "origem": "whatsapp",
                 "situacao": "lead"
             }
         }
     )
 
 
+class ContatoLote(BaseModel):
+    """
+    Esquema para criação de contatos em lote.
+
+    - `modo = "inserir"`: e-mails já cadastrados viram erro no item.
+    - `modo = "upsert"`: e-mails já cadastrados são atualizados
+      (apenas os campos enviados).
+    """
+    itens: List[ContatoCriar] = Field(..., min_length=1, max_length=MAX_ITENS_LOTE)
+    modo: Literal["inserir", "upsert"] = "inserir"
+
+
 class ContatoAtualizar(BaseModel):
     """
     Esquema para atualização parcial de contato.
     Todos os campos são opcionais.
     """
-    primeiro_nome: Optional[str] = None
-    sobrenome: Optional[str] = None
+    nome: Optional[str] = Field(default=None, max_length=150)
     email: Optional[EmailStr] = None
-    telefone: Optional[str] = None
-    situacao: Optional[str] = None
+    telefone: Optional[str] = Field(default=None, max_length=50)
+    empresa: Optional[str] = Field(default=None, max_length=150)
+    origem: Optional[str] = Field(default=None, max_length=50)
+    situacao: Optional[str] = Field(default=None, max_length=50)
 
 
 class ContatoLer(ContatoBase):
@@ -57,3 +84,40 @@ class ContatoLer(ContatoBase):
 
     # Pydantic v2: substitui o antigo `orm_mode = True`
     model_config = ConfigDict(from_attributes=True)
+
+
+class ContatoResolverLote(BaseModel):
+    """
+    Telefones e/ou e-mails a resolver de uma vez
+    (até `MAX_IDENTIFICADORES_RESOLVER` no total).
+    """
+    telefones: List[str] = Field(default_factory=list)
+    emails: List[str] = Field(default_factory=list)
+
+    @model_validator(mode="after")
+    def _conferir_quantidade(self):
+        total = len(self.telefones) + len(self.emails)
+        if not total:
+            raise ValueError("Informe ao menos um telefone ou e-mail.")
+        if total > MAX_IDENTIFICADORES_RESOLVER:
+            raise ValueError(
+                f"No máximo {MAX_IDENTIFICADORES_RESOLVER} identificadores por chamada."
+            )
+        return self
+
+
+class ContatoResolverResultado(BaseModel):
+    """
+    Contato encontrado para cada telefone e e-mail enviado (null se nenhum),
+    com o valor exatamente como foi enviado como chave.
+    """
+    telefones: Dict[str, Optional[ContatoLer]] = {}
+    emails: Dict[str, Optional[ContatoLer]] = {}
+
+
+class ContatoPorIdsResultado(BaseModel):
+    """
+    Contatos de POST /contatos/por-ids, na ordem pedida, e os ids sem contato.
+    """
+    itens: List[ContatoLer]
+    nao_encontrados: List[int]
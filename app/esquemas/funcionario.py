@@ -1,6 +1,6 @@
 # app/esquemas/funcionario.py
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import BaseModel, EmailStr, ConfigDict
 
@@ -51,3 +51,11 @@ class FuncionarioLer(FuncionarioBase):
     atualizado_em: Optional[datetime] = None
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class FuncionarioPorIdsResultado(BaseModel):
+    """
+    Funcionários de POST /funcionarios/por-ids (na ordem pedida) e ids inexistentes.
+    """
+    itens: List[FuncionarioLer]
+    nao_encontrados: List[int]
@@ -0,0 +1,31 @@
+# app/esquemas/importacao.py
+from datetime import datetime
+from typing import List, Literal, Optional
+
+from pydantic import BaseModel
+
+
+class ImportacaoErro(BaseModel):
+    """
+    Erro em uma linha do arquivo importado (linha 1 = cabeçalho).
+    """
+    linha: int
+    erro: str
+
+
+class ImportacaoLer(BaseModel):
+    """
+    Andamento de uma importação de CSV.
+    """
+    id: str
+    tipo: Literal["contatos", "negocios"]
+    situacao: Literal["na_fila", "processando", "concluida", "falhou"]
+    linhas_processadas: int
+    criados: int
+    atualizados: int
+    erros: int
+    linhas_por_segundo: float
+    iniciado_em: Optional[datetime] = None
+    finalizado_em: Optional[datetime] = None
+    mensagem: Optional[str] = None
+    amostra_erros: List[ImportacaoErro] = []
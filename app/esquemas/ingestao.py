@@ -0,0 +1,65 @@
+# app/esquemas/ingestao.py
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict
+
+from app.esquemas.contato import ContatoCriar
+from app.esquemas.negocio import NegocioCriar
+
+
+class LeadEntrada(ContatoCriar):
+    """
+    Lead recebido por webhook: os dados do contato e, opcionalmente, do negócio.
+
+    - Se já existir um contato com o mesmo e-mail ou telefone (normalizados),
+      ele é reaproveitado (e não é alterado).
+    - `negocio.contato_id` é ignorado: o negócio fica com o contato do lead.
+    """
+    negocio: Optional[NegocioCriar] = None
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "nome": "João Silva",
+                "email": "joao.silva@empresa.com",
+                "telefone": "+55 92 99999-9999",
+                "origem": "whatsapp",
+                "negocio": {
+                    "titulo": "Campanha de verão - João Silva",
+                    "valor_previsto": 1500.0,
+                    "fase": "novo",
+                    "origem": "whatsapp",
+                    "responsavel_id": 1,
+                },
+            }
+        }
+    )
+
+
+class LeadAceito(BaseModel):
+    """
+    Resposta do recebimento: o lead entrou na fila e será gravado em segundo plano.
+    """
+    sequencia: int
+    fila: int
+
+
+class IngestaoEstado(BaseModel):
+    """
+    Situação da fila de ingestão (por processo).
+    """
+    fila: int
+    atraso_segundos: float
+    recebidos: int
+    gravados: int
+    erros: int
+    lotes: int
+    ultimo_lote_em: Optional[datetime] = None
+    ultimo_erro: Optional[str] = None
+    tamanho_lote: int
+    intervalo_ms: int
+    max_fila: int
+    spool: Optional[str] = None
+    # Escritas do spool (cada uma com um ou mais leads, um flush/fsync)
+    escritas_spool: Optional[int] = None
@@ -0,0 +1,34 @@
+# app/esquemas/lote.py
+from typing import List, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+# Limite de itens por chamada das rotas de lote
+MAX_ITENS_LOTE = 10000
+
+
+class LoteItemResultado(BaseModel):
+    """
+    Resultado de um item do lote (na mesma posição em que foi enviado).
+    """
+    indice: int
+    situacao: Literal["criado", "atualizado", "erro"]
+    id: Optional[int] = None
+    erro: Optional[str] = None
+
+
+class LoteResultado(BaseModel):
+    """
+    Resumo de uma operação em lote + resultado item a item.
+    """
+    criados: int = 0
+    atualizados: int = 0
+    erros: int = 0
+    itens: List[LoteItemResultado]
+
+
+class IdsEntrada(BaseModel):
+    """
+    Ids a buscar de uma vez (POST /por-ids das entidades).
+    """
+    ids: List[int] = Field(..., min_length=1, max_length=MAX_ITENS_LOTE)
@@ -0,0 +1,97 @@
+# app/esquemas/metricas.py
+from datetime import date
+from typing import List, Literal, Optional
+
+from pydantic import BaseModel
+
+Granularidade = Literal["dia", "semana", "mes"]
+MetricaSerie = Literal["criados", "ganhos", "perdidos"]
+AgruparPor = Literal["responsavel_id", "origem", "fase"]
+
+
+class IndicadoresFuncionario(BaseModel):
+    """
+    Indicadores de um funcionário no período (mesmos números de /indicadores).
+    """
+    funcionario_id: int
+    nome: str
+    negocios_recebidos: int
+    negocios_trabalhados: int
+    negocios_ganhos: int
+    ciclo_medio: float
+    taxa_conversao: int
+    valor_ganho: float
+
+
+class VendasOrigem(BaseModel):
+    """
+    Negócios ganhos no período por origem.
+    """
+    origem: str
+    quantidade: int
+    valor: float
+
+
+class ProdutividadeDia(BaseModel):
+    """
+    Negócios ganhos por dia de fechamento.
+    """
+    data: date
+    quantidade: int
+
+
+class IndicadoresLer(BaseModel):
+    """
+    Indicadores do período (painel /indicadores em JSON).
+    """
+    inicio: date
+    fim: date
+    total_negocios_recebidos: int
+    total_negocios_ganhos: int
+    ciclo_medio: float
+    taxa_conversao: int
+    funcionarios: List[IndicadoresFuncionario]
+    vendas_por_origem: List[VendasOrigem]
+    produtividade_por_dia: List[ProdutividadeDia]
+
+
+class FaseFunil(BaseModel):
+    """
+    Quantidade e valor dos negócios de uma fase.
+    """
+    fase: str
+    quantidade: int
+    valor: float
+
+
+class FunilLer(BaseModel):
+    """
+    Números do funil (painel /funil em JSON, sem os cards).
+    """
+    fases: List[FaseFunil]
+    total_negocios: int
+    valor_total: float
+    taxa_fechamento: int
+
+
+class PontoSerie(BaseModel):
+    """
+    Um período da série (e o grupo, quando a série é agrupada).
+    """
+    periodo: date
+    grupo: Optional[str] = None
+    quantidade: int
+    valor: float
+    ciclo_medio: Optional[float] = None
+
+
+class SerieLer(BaseModel):
+    """
+    Série temporal de uma métrica, agregada no banco.
+    """
+    metrica: MetricaSerie
+    granularidade: Granularidade
+    agrupar_por: Optional[AgruparPor] = None
+    inicio: date
+    fim: date
+    pontos: List[PontoSerie]
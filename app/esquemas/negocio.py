@@ -1,8 +1,10 @@
 # app/esquemas/negocio.py
 from datetime import date, datetime
-from typing import Optional
+from typing import List, Optional
 
-from pydantic import BaseModel, ConfigDict, conint
+from pydantic import BaseModel, ConfigDict, Field, conint
+
+from app.esquemas.lote import MAX_ITENS_LOTE
 
 
 class NegocioBase(BaseModel):
@@ -24,7 +26,13 @@ class NegocioBase(BaseModel):
 class NegocioCriar(NegocioBase):
     """
     Esquema para criação de negócio.
+    Os limites de tamanho são os das colunas da tabela `negocios`.
     """
+    titulo: str = Field(..., max_length=200)
+    descricao: Optional[str] = Field(default=None, max_length=500)
+    fase: str = Field(default="novo", max_length=50)
+    origem: Optional[str] = Field(default=None, max_length=50)
+
     model_config = ConfigDict(
         json_schema_extra={
             "example": {
@@ -43,15 +51,22 @@ class NegocioCriar(NegocioBase):
     )
 
 
+class NegocioLote(BaseModel):
+    """
+    Esquema para criação de negócios em lote.
+    """
+    itens: List[NegocioCriar] = Field(..., min_length=1, max_length=MAX_ITENS_LOTE)
+
+
 class NegocioAtualizar(BaseModel):
     """
     Atualização parcial de negócio.
     """
-    titulo: Optional[str] = None
-    descricao: Optional[str] = None
+    titulo: Optional[str] = Field(default=None, max_length=200)
+    descricao: Optional[str] = Field(default=None, max_length=500)
     valor_previsto: Optional[float] = None
-    fase: Optional[str] = None
-    origem: Optional[str] = None
+    fase: Optional[str] = Field(default=None, max_length=50)
+    origem: Optional[str] = Field(default=None, max_length=50)
     probabilidade: Optional[conint(ge=0, le=100)] = None
     contato_id: Optional[int] = None
     responsavel_id: Optional[int] = None
@@ -68,3 +83,11 @@ class NegocioLer(NegocioBase):
     atualizado_em: Optional[datetime] = None
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class NegocioPorIdsResultado(BaseModel):
+    """
+    Negócios de POST /negocios/por-ids, na ordem pedida, e os ids que não existem.
+    """
+    itens: List[NegocioLer]
+    nao_encontrados: List[int]
@@ -0,0 +1,27 @@
+# app/esquemas/webhook.py
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class ParticaoComFalha(BaseModel):
+    """
+    Partição parada esperando a próxima tentativa de envio.
+    """
+    particao: int
+    cursor: int
+    tentativas: int
+    proxima_tentativa_em: Optional[datetime] = None
+    ultimo_erro: Optional[str] = None
+
+
+class WebhookEstado(BaseModel):
+    """
+    Situação do envio de eventos para um destino (contadores por processo).
+    """
+    destino: str
+    pendentes: int
+    entregues: int
+    falhas: int
+    particoes_com_falha: List[ParticaoComFalha] = []
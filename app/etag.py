@@ -0,0 +1,92 @@
+# app/etag.py
+"""
+ETags e requisições condicionais da API.
+
+- Registro: ETag forte a partir de tabela, id, `versao` e `criado_em`
+  (a coluna `versao` sobe a cada UPDATE; ver `version_id_col` nos modelos).
+- Listagem: ETag da página, a partir de (id, versao) de cada item devolvido
+  e do cursor seguinte. Os itens já foram lidos do banco; o que se economiza
+  é a serialização pelo Pydantic e o envio do corpo.
+- `If-None-Match` devolve 304 sem corpo; `If-Match` no PUT devolve 412
+  quando o registro mudou desde a leitura do cliente.
+"""
+import hashlib
+from typing import Dict, Iterable, Optional
+
+from fastapi import HTTPException, Response, status
+
+CABECALHO_ETAG = "ETag"
+
+
+def _etag(*partes) -> str:
+    resumo = hashlib.sha1("|".join(str(p) for p in partes).encode()).hexdigest()[:20]
+    return f'"{resumo}"'
+
+
+def etag_registro(registro, tabela: Optional[str] = None) -> str:
+    """
+    ETag forte de um registro (Contato, Negocio, Funcionario). Também aceita
+    uma linha com `id`, `versao` e `criado_em` (informe `tabela`); a ETag não
+    depende dos campos devolvidos (`campos=`).
+    """
+    return _etag(tabela or registro.__tablename__, registro.id, registro.versao, registro.criado_em)
+
+
+def etag_colecao(registros: Iterable, *extras, tabela: Optional[str] = None) -> str:
+    """
+    ETag de uma página de listagem (muda se algum item entra, sai ou é alterado).
+    `registros` podem ser objetos do ORM ou linhas com `id` e `versao`
+    (nesse caso, informe `tabela`).
+    """
+    registros = list(registros)
+    if tabela is None:
+        tabela = registros[0].__tablename__ if registros else ""
+    return _etag(tabela, *extras, *(f"{r.id}.{r.versao}" for r in registros))
+
+
+def _valores(cabecalho: str):
+    return [valor.strip() for valor in cabecalho.split(",") if valor.strip()]
+
+
+def corresponde_if_none_match(cabecalho: Optional[str], etag: str) -> bool:
+    """
+    `If-None-Match` usa comparação fraca: `W/"x"` equivale a `"x"`.
+    """
+    if not cabecalho:
+        return False
+    valores = _valores(cabecalho)
+    if "*" in valores:
+        return True
+    return etag in (valor.removeprefix("W/") for valor in valores)
+
+
+def corresponde_if_match(cabecalho: Optional[str], etag: str) -> bool:
+    """
+    `If-Match` usa comparação forte (ETags fracas nunca correspondem).
+    Sem cabeçalho, a condição é considerada atendida.
+    """
+    if cabecalho is None:
+        return True
+    valores = _valores(cabecalho)
+    return "*" in valores or etag in valores
+
+
+def nao_modificado(etag: str, cabecalhos: Optional[Dict[str, str]] = None) -> Response:
+    """
+    Resposta 304, sem corpo.
+    """
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={CABECALHO_ETAG: etag, **(cabecalhos or {})},
+    )
+
+
+def exigir_if_match(cabecalho: Optional[str], registro) -> None:
+    """
+    Lança 412 se o `If-Match` enviado não for a versão atual do registro.
+    """
+    if not corresponde_if_match(cabecalho, etag_registro(registro)):
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="O registro foi alterado desde a última leitura (If-Match não confere).",
+        )
@@ -1,24 +1,64 @@
 # app/main.py
-from datetime import datetime, date, timedelta
-from typing import Optional, List, Dict
+from typing import Optional
 
-from fastapi import FastAPI, Depends, Request
+from fastapi import FastAPI, Depends, HTTPException, Query, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, JSONResponse, Response, StreamingResponse
 from fastapi.templating import Jinja2Templates
-from sqlalchemy import func
 from sqlalchemy.orm import Session
-import random
+from sqlalchemy.orm.exc import StaleDataError
 
 
-from app.banco_dados import Base, engine, obter_sessao
+from app.banco_dados import (
+    USAR_ASYNC,
+    engine,
+    fabrica_sessoes_assincronas,
+    fechar_engine_assincrono,
+    obter_sessao,
+    registrar_configuracao,
+    SessaoLocal,
+)
+from app.migracoes import atualizar_esquema
+from app.metricas import (
+    TIPO_CONTEUDO,
+    MiddlewareMetricas,
+    instrumentar_engine,
+    instrumentar_templates,
+    registro as registro_metricas,
+)
+from app.etag import CABECALHO_ETAG
+from app.paginacao import CABECALHO_PROXIMO_CURSOR
+from app.por_ids import CABECALHO_IDS_NAO_ENCONTRADOS
 import app.modelos  # garante o registro dos modelos
 from app.modelos.contato import Contato
-from app.modelos.negocio import Negocio
-from app.modelos.funcionario import Funcionario
 from app.api.v1.contatos import roteador as roteador_contatos
 from app.api.v1.negocios import roteador as roteador_negocios
 from app.api.v1.funcionarios import roteador as roteador_funcionarios
+from app.api.v1.importacoes import roteador as roteador_importacoes
+from app.api.v1.metricas import roteador as roteador_metricas
+from app.api.v1.ingestao import roteador as roteador_ingestao
+from app.api.v1.webhooks import roteador as roteador_webhooks
+from app.api.v1.assincrono import combinar_roteadores
+from app.api.v1.assincrono.contatos import roteador as roteador_contatos_async
+from app.api.v1.assincrono.negocios import roteador as roteador_negocios_async
+from app.api.v1.assincrono.funcionarios import roteador as roteador_funcionarios_async
+from app.servicos.ao_vivo import CANAIS as CANAIS_AO_VIVO, painel_ao_vivo
+from app.servicos.dados_sinteticos import SEMENTE_PADRAO, gerar_dados
+from app.servicos.cache_paineis import cache_paineis, com_sessao_propria
+from app.servicos.ingestao import fila_ingestao
+from app.servicos.webhooks import despachante_webhooks
+from app.servicos.funil import (
+    CARDS_POR_COLUNA,
+    FASES,
+    cards_por_fase,
+    cards_da_fase,
+    cursor_do_card,
+    numeros_do_funil,
+    ordem_do_card,
+)
+from app.servicos.indicadores import resolver_periodo, calcular_indicadores
+from app.servicos.painel import numeros_do_painel
+from app.servicos.resumo_diario import garantir_resumo, totais_por_fase
 
 
 # Metadados das tags para a documentação
@@ -35,6 +75,22 @@ tags_metadata = [
         "name": "Funcionários",
         "description": "Cadastro e gerenciamento de funcionários (donos dos negócios).",
     },
+    {
+        "name": "Importações",
+        "description": "Importação de arquivos CSV em lotes, com acompanhamento do andamento.",
+    },
+    {
+        "name": "Ingestão",
+        "description": "Recebimento de leads em fila (webhooks em pico), gravados em lotes em segundo plano.",
+    },
+    {
+        "name": "Webhooks",
+        "description": "Envio das alterações de contatos e negócios para webhooks (n8n), sem precisar consultar a API.",
+    },
+    {
+        "name": "Métricas",
+        "description": "Indicadores, funil e séries temporais em JSON (para n8n e BI).",
+    },
     {
         "name": "Status",
         "description": "Rotas de status e saúde da API.",
@@ -48,6 +104,13 @@ tags_metadata = [
 
 # Configuração de templates (interface web)
 templates = Jinja2Templates(directory="app/interface/templates")
+instrumentar_templates(templates)
+# Usados pelos cards do funil (posição e cursor de cada card) e pela página
+templates.env.globals.update(
+    cursor_do_card=cursor_do_card,
+    ordem_do_card=ordem_do_card,
+    cards_por_coluna=CARDS_POR_COLUNA,
+)
 
 # Criação da aplicação FastAPI
 app = FastAPI(
@@ -75,10 +138,75 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[CABECALHO_PROXIMO_CURSOR, CABECALHO_ETAG, CABECALHO_IDS_NAO_ENCONTRADOS],
 )
 
-# Criação das tabelas no banco de dados (caso ainda não existam)
-Base.metadata.create_all(bind=engine)
+
+@app.exception_handler(StaleDataError)
+def registro_alterado_concorrentemente(request: Request, _erro: StaleDataError):
+    """
+    Outra requisição alterou o registro entre a leitura e o UPDATE
+    (a coluna `versao` não confere mais).
+    """
+    return JSONResponse(
+        status_code=status.HTTP_412_PRECONDITION_FAILED,
+        content={"detail": "O registro foi alterado por outra requisição. Leia de novo e repita."},
+    )
+
+# Contagem/tempo de SQL e espera do pool para o /metrics
+instrumentar_engine(engine)
+
+# Mostra no log o perfil do banco em uso (PRAGMAs do SQLite ou pool do PostgreSQL)
+registrar_configuracao(engine)
+
+# Criação das tabelas no banco de dados (e das colunas/índices novos em bancos antigos)
+atualizar_esquema(engine)
+
+# Preenche o resumo diário de negócios em bancos que ainda não o têm
+with SessaoLocal() as sessao_inicial:
+    garantir_resumo(sessao_inicial)
+
+
+@app.on_event("startup")
+async def iniciar_ingestao():
+    """
+    Liga o escritor da fila de ingestão (e devolve à fila o que ficou no spool).
+    """
+    await fila_ingestao.iniciar()
+
+
+@app.on_event("startup")
+async def iniciar_webhooks():
+    """
+    Liga o envio dos eventos de alteração aos webhooks configurados (CRM_WEBHOOKS).
+    """
+    await despachante_webhooks.iniciar()
+
+
+@app.on_event("startup")
+async def iniciar_ao_vivo():
+    """
+    Liga a publicação das mudanças para os painéis abertos (/ao-vivo/{canal}).
+    """
+    await painel_ao_vivo.iniciar(templates.env)
+
+
+@app.on_event("shutdown")
+async def parar_ao_vivo():
+    """
+    Para a publicação ao vivo e encerra as conexões ainda abertas.
+    """
+    await painel_ao_vivo.parar()
+
+
+@app.on_event("shutdown")
+async def parar_ingestao():
+    """
+    Grava o que ainda está na fila de ingestão antes de desligar
+    (e só então para o envio aos webhooks).
+    """
+    await fila_ingestao.parar()
+    await despachante_webhooks.parar()
 
 
 @app.get("/", tags=["Status"])
@@ -96,6 +224,18 @@ def raiz():
     }
 
 
+@app.get("/status/cache", tags=["Status"])
+def status_cache():
+    """
+    Contadores do cache dos painéis (acertos, falhas, cópias obsoletas servidas etc.).
+    """
+    return cache_paineis.estatisticas()
+
+
+# Por último: fica por fora dos outros middlewares e mede a requisição inteira
+app.add_middleware(MiddlewareMetricas)
+
+
 @app.get("/health", tags=["Status"])
 def healthcheck():
     """
@@ -104,158 +244,126 @@ def healthcheck():
     return {"status": "ok"}
 
 
+@app.get("/metrics", tags=["Status"], include_in_schema=False)
+async def metricas():
+    """
+    Métricas no formato de texto do Prometheus (latência por rota, SQL,
+    pool do banco, pool de threads e renderização de templates).
+    Assíncrona de propósito: lê o uso do pool de threads sem ocupar uma thread.
+    """
+    return Response(content=registro_metricas.exposicao(), media_type=TIPO_CONTEUDO)
+
+
 @app.get("/painel", response_class=HTMLResponse, tags=["Interface"])
-def painel_contatos(
-    request: Request,
-    db: Session = Depends(obter_sessao),
-):
+def painel_contatos(request: Request):
     """
     Painel visual de contatos, com cards de métricas e tabela.
     """
+    contexto = cache_paineis.obter(("painel",), com_sessao_propria(_contexto_painel))
+    return templates.TemplateResponse("dashboard.html", {"request": request, **contexto})
+
 
+def _contexto_painel(db: Session) -> dict:
     contatos = (
         db.query(Contato)
         .order_by(Contato.criado_em.desc())
         .all()
     )
+    return {"contatos": contatos, **numeros_do_painel(db)}
 
-    total_contatos = db.query(func.count(Contato.id)).scalar() or 0
-    total_leads = (
-        db.query(func.count(Contato.id))
-        .filter(Contato.situacao == "lead")
-        .scalar()
-        or 0
-    )
-    total_clientes = (
-        db.query(func.count(Contato.id))
-        .filter(Contato.situacao == "cliente")
-        .scalar()
-        or 0
-    )
-    total_inativos = (
-        db.query(func.count(Contato.id))
-        .filter(Contato.situacao == "inativo")
-        .scalar()
-        or 0
-    )
-    total_outros = max(total_contatos - (total_leads + total_clientes + total_inativos), 0)
-
-    limite_7_dias = datetime.utcnow().date() - timedelta(days=7)
-    contatos_ultimos_7 = 0
-    for c in contatos:
-        if c.criado_em:
-            if c.criado_em.date() >= limite_7_dias:
-                contatos_ultimos_7 += 1
-
-    if total_contatos > 0:
-        taxa_leads = round((total_leads / total_contatos) * 100)
-        taxa_clientes = round((total_clientes / total_contatos) * 100)
-        taxa_inativos = round((total_inativos / total_contatos) * 100)
-        taxa_outros = max(0, 100 - (taxa_leads + taxa_clientes + taxa_inativos))
-    else:
-        taxa_leads = taxa_clientes = taxa_inativos = taxa_outros = 0
-
-    if total_leads > 0:
-        taxa_conversao_lead_cliente = round((total_clientes / total_leads) * 100)
-    else:
-        taxa_conversao_lead_cliente = 0
 
-    contexto = {
-        "request": request,
-        "contatos": contatos,
-        "total_contatos": total_contatos,
-        "total_leads": total_leads,
-        "total_clientes": total_clientes,
-        "total_inativos": total_inativos,
-        "total_outros": total_outros,
-        "contatos_ultimos_7": contatos_ultimos_7,
-        "taxa_leads": taxa_leads,
-        "taxa_clientes": taxa_clientes,
-        "taxa_inativos": taxa_inativos,
-        "taxa_outros": taxa_outros,
-        "taxa_conversao_lead_cliente": taxa_conversao_lead_cliente,
+@app.get("/funil", response_class=HTMLResponse, tags=["Interface"])
+def painel_funil(request: Request):
+    """
+    Painel visual do funil de vendas (negócios por fase).
+    """
+    contexto = cache_paineis.obter(("funil",), com_sessao_propria(_contexto_funil))
+    return templates.TemplateResponse("funil.html", {"request": request, **contexto})
+
+
+def _contexto_funil(db: Session) -> dict:
+    # Cards mais recentes de cada fase (limitados; o resto vem por "carregar mais")
+    cards = cards_por_fase(db)
+    novos = cards["novo"]
+    em_proposta = cards["em_proposta"]
+    fechados_ganhos = cards["fechado_ganho"]
+    fechados_perdidos = cards["fechado_perdido"]
+
+    # Quantidade e valor por fase vêm do resumo diário (uma consulta agrupada)
+    totais = totais_por_fase(db)
+    numeros = numeros_do_funil(totais)
+
+    # Cursor do "carregar mais" por coluna (None quando a coluna já está completa)
+    cursores = {
+        fase: (
+            cursor_do_card(cards[fase][-1])
+            if totais.get(fase, (0, 0))[0] > len(cards[fase])
+            else None
+        )
+        for fase in FASES
     }
 
-    return templates.TemplateResponse("dashboard.html", contexto)
+    return {
+        "cursores": cursores,
+        "novos": novos,
+        "em_proposta": em_proposta,
+        "fechados_ganhos": fechados_ganhos,
+        "fechados_perdidos": fechados_perdidos,
+        **numeros,
+    }
 
 
-@app.get("/funil", response_class=HTMLResponse, tags=["Interface"])
-def painel_funil(
-    request: Request,
-    db: Session = Depends(obter_sessao),
-):
+@app.get("/ao-vivo/{canal}", tags=["Interface"])
+async def ao_vivo(canal: str):
     """
-    Painel visual do funil de vendas (negócios por fase).
+    Mudanças ao vivo de um painel (`funil` ou `painel`) em Server-Sent Events:
+    cards/linhas alterados e totais atualizados, aplicados pela página sem recarregar.
     """
-    # Carrega negócios por fase
-    novos = (
-        db.query(Negocio)
-        .filter(Negocio.fase == "novo")
-        .order_by(Negocio.criado_em.desc())
-        .all()
-    )
-    em_proposta = (
-        db.query(Negocio)
-        .filter(Negocio.fase == "em_proposta")
-        .order_by(Negocio.criado_em.desc())
-        .all()
-    )
-    fechados_ganhos = (
-        db.query(Negocio)
-        .filter(Negocio.fase == "fechado_ganho")
-        .order_by(Negocio.criado_em.desc())
-        .all()
-    )
-    fechados_perdidos = (
-        db.query(Negocio)
-        .filter(Negocio.fase == "fechado_perdido")
-        .order_by(Negocio.criado_em.desc())
-        .all()
-    )
-
-    def soma_valor(lista: List[Negocio]) -> float:
-        return round(sum(n.valor_previsto or 0 for n in lista), 2)
+    if canal not in CANAIS_AO_VIVO:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Canal não encontrado.",
+        )
 
-    total_novos = len(novos)
-    total_em_proposta = len(em_proposta)
-    total_ganhos = len(fechados_ganhos)
-    total_perdidos = len(fechados_perdidos)
+    return StreamingResponse(
+        painel_ao_vivo.transmitir(canal),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
-    valor_novos = soma_valor(novos)
-    valor_em_proposta = soma_valor(em_proposta)
-    valor_ganhos = soma_valor(fechados_ganhos)
-    valor_perdidos = soma_valor(fechados_perdidos)
 
-    total_negocios = total_novos + total_em_proposta + total_ganhos + total_perdidos
-    valor_total = valor_novos + valor_em_proposta + valor_ganhos + valor_perdidos
+@app.get("/funil/{fase}/mais", response_class=HTMLResponse, tags=["Interface"])
+def painel_funil_mais(
+    request: Request,
+    fase: str,
+    cursor: Optional[str] = None,
+    db: Session = Depends(obter_sessao),
+):
+    """
+    Próximos cards de uma coluna do funil (fragmento HTML do "carregar mais").
+    """
+    if fase not in FASES:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Fase não encontrada.",
+        )
 
-    if (total_novos + total_em_proposta + total_ganhos) > 0:
-        taxa_fechamento = round(
-            (total_ganhos / (total_novos + total_em_proposta + total_ganhos)) * 100
+    try:
+        negocios, proximo_cursor = cards_da_fase(db, fase, cursor)
+    except ValueError as erro:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(erro),
         )
-    else:
-        taxa_fechamento = 0
 
     contexto = {
         "request": request,
-        "novos": novos,
-        "em_proposta": em_proposta,
-        "fechados_ganhos": fechados_ganhos,
-        "fechados_perdidos": fechados_perdidos,
-        "total_novos": total_novos,
-        "total_em_proposta": total_em_proposta,
-        "total_ganhos": total_ganhos,
-        "total_perdidos": total_perdidos,
-        "valor_novos": valor_novos,
-        "valor_em_proposta": valor_em_proposta,
-        "valor_ganhos": valor_ganhos,
-        "valor_perdidos": valor_perdidos,
-        "total_negocios": total_negocios,
-        "valor_total": valor_total,
-        "taxa_fechamento": taxa_fechamento,
+        "fase": fase,
+        "negocios": negocios,
+        "proximo_cursor": proximo_cursor,
     }
 
-    return templates.TemplateResponse("funil.html", contexto)
+    return templates.TemplateResponse("funil_mais.html", contexto)
 
 
 @app.get("/indicadores", response_class=HTMLResponse, tags=["Interface"])
@@ -263,226 +371,35 @@ def painel_indicadores(
     request: Request,
     inicio: Optional[str] = None,
     fim: Optional[str] = None,
-    db: Session = Depends(obter_sessao),
 ):
     """
     Painel de indicadores por funcionário.
     Permite filtrar por janela de datas (criação/atualização/fechamento).
     """
-    # 1) Definir intervalo de datas (padrão: últimos 30 dias)
-    if not inicio or not fim:
-        fim_data = date.today()
-        inicio_data = fim_data - timedelta(days=29)
-    else:
-        try:
-            inicio_data = datetime.strptime(inicio, "%Y-%m-%d").date()
-            fim_data = datetime.strptime(fim, "%Y-%m-%d").date()
-        except ValueError:
-            fim_data = date.today()
-            inicio_data = fim_data - timedelta(days=29)
-
-    if inicio_data > fim_data:
-        inicio_data, fim_data = fim_data, inicio_data
-
-    inicio_str = inicio_data.isoformat()
-    fim_str = fim_data.isoformat()
-
-    # 2) Carregar negócios e funcionários
-    negocios: List[Negocio] = db.query(Negocio).all()
-    funcionarios: List[Funcionario] = (
-        db.query(Funcionario)
-        .filter(Funcionario.ativo == True)  # noqa: E712
-        .order_by(Funcionario.nome)
-        .all()
-    )
+    # Intervalo de datas (padrão: últimos 30 dias)
+    inicio_data, fim_data = resolver_periodo(inicio, fim)
 
-    # 3) Global: negócios recebidos e ganhos no período
-    negocios_recebidos_global: List[Negocio] = []
-    ganhos_global: List[Negocio] = []
-
-    for n in negocios:
-        if n.criado_em:
-            dc = n.criado_em.date()
-            if inicio_data <= dc <= fim_data:
-                negocios_recebidos_global.append(n)
-
-        if n.fase == "fechado_ganho" and n.data_fechamento:
-            if inicio_data <= n.data_fechamento <= fim_data:
-                ganhos_global.append(n)
-
-    ciclos_global: List[int] = []
-    for n in ganhos_global:
-        if n.criado_em:
-            ciclos_global.append(
-                (n.data_fechamento - n.criado_em.date()).days  # type: ignore[arg-type]
-            )
-
-    if ciclos_global:
-        ciclo_medio_global = round(sum(ciclos_global) / len(ciclos_global), 1)
-    else:
-        ciclo_medio_global = 0.0
-
-    total_negocios_recebidos_global = len(negocios_recebidos_global)
-    total_negocios_ganhos_global = len(ganhos_global)
-
-    if total_negocios_recebidos_global > 0:
-        taxa_conversao_global = round(
-            (total_negocios_ganhos_global / total_negocios_recebidos_global) * 100
-        )
-    else:
-        taxa_conversao_global = 0
-
-    # 4) Métricas por funcionário
-    metricas_funcionarios: List[Dict] = []
-    valor_max_vendedor = 0.0
-
-    for f in funcionarios:
-        negocios_f = [n for n in negocios if n.responsavel_id == f.id]
-
-        recebidos_f: List[Negocio] = []
-        trabalhados_ids = set()
-        ganhos_f: List[Negocio] = []
-
-        for n in negocios_f:
-            if n.criado_em:
-                dc = n.criado_em.date()
-                if inicio_data <= dc <= fim_data:
-                    recebidos_f.append(n)
-                    trabalhados_ids.add(n.id)
-
-            if n.atualizado_em:
-                da = n.atualizado_em.date()
-                if inicio_data <= da <= fim_data:
-                    trabalhados_ids.add(n.id)
-
-            if n.fase == "fechado_ganho" and n.data_fechamento:
-                if inicio_data <= n.data_fechamento <= fim_data:
-                    ganhos_f.append(n)
-
-        negocios_recebidos_f = len(recebidos_f)
-        negocios_trabalhados_f = len(trabalhados_ids)
-        negocios_ganhos_f = len(ganhos_f)
-
-        ciclos_f: List[int] = []
-        for n in ganhos_f:
-            if n.criado_em:
-                ciclos_f.append(
-                    (n.data_fechamento - n.criado_em.date()).days  # type: ignore[arg-type]
-                )
-
-        if ciclos_f:
-            ciclo_medio_f = round(sum(ciclos_f) / len(ciclos_f), 1)
-        else:
-            ciclo_medio_f = 0.0
-
-        if negocios_recebidos_f > 0:
-            taxa_conversao_f = round(
-                (negocios_ganhos_f / negocios_recebidos_f) * 100
-            )
-        else:
-            taxa_conversao_f = 0
-
-        valor_ganho_f = sum(n.valor_previsto or 0 for n in ganhos_f)
-        valor_max_vendedor = max(valor_max_vendedor, valor_ganho_f)
-
-        metricas_funcionarios.append(
-            {
-                "funcionario": f,
-                "negocios_recebidos": negocios_recebidos_f,
-                "negocios_trabalhados": negocios_trabalhados_f,
-                "negocios_ganhos": negocios_ganhos_f,
-                "ciclo_medio": ciclo_medio_f,
-                "taxa_conversao": taxa_conversao_f,
-                "valor_ganho": valor_ganho_f,
-            }
-        )
-
-    # Normalizar largura da barra de vendas por funcionário
-    for m in metricas_funcionarios:
-        if valor_max_vendedor > 0:
-            m["largura_barra"] = round(
-                (m["valor_ganho"] * 100) / valor_max_vendedor
-            )
-        else:
-            m["largura_barra"] = 0
-
-    # 5) Vendas por origem (somente negócios ganhos no período)
-    vendas_origem_dict: Dict[str, Dict[str, float]] = {}
-    valor_max_origem = 0.0
-
-    for n in ganhos_global:
-        origem = n.origem or "Não informada"
-        if origem not in vendas_origem_dict:
-            vendas_origem_dict[origem] = {"quantidade": 0, "valor": 0.0}
-        vendas_origem_dict[origem]["quantidade"] += 1
-        valor = float(n.valor_previsto) if n.valor_previsto is not None else 0.0
-        vendas_origem_dict[origem]["valor"] += valor
-
-        valor_max_origem = max(valor_max_origem, vendas_origem_dict[origem]["valor"])
-
-    vendas_por_origem: List[Dict] = []
-    for origem, dados in vendas_origem_dict.items():
-        if valor_max_origem > 0:
-            largura = round((dados["valor"] * 100) / valor_max_origem)
-        else:
-            largura = 0
-        vendas_por_origem.append(
-            {
-                "origem": origem,
-                "quantidade": dados["quantidade"],
-                "valor": dados["valor"],
-                "largura_barra": largura,
-            }
-        )
-
-    # 6) Produtividade por dia (negócios ganhos por dia de fechamento)
-    produtividade_dict: Dict[date, int] = {}
-    for n in ganhos_global:
-        if n.data_fechamento:
-            d = n.data_fechamento
-            produtividade_dict[d] = produtividade_dict.get(d, 0) + 1
-
-    produtividade_por_dia: List[Dict] = []
-    for d, qtd in sorted(produtividade_dict.items(), key=lambda item: item[0]):
-        produtividade_por_dia.append({"data": d, "quantidade": qtd})
-
-    max_produtividade = (
-        max((p["quantidade"] for p in produtividade_por_dia), default=0)
+    # Agregações feitas no banco (ver app/servicos/indicadores.py), em cache por período
+    contexto = cache_paineis.obter(
+        ("indicadores", inicio_data, fim_data),
+        com_sessao_propria(calcular_indicadores, inicio_data, fim_data),
     )
 
-    for p in produtividade_por_dia:
-        if max_produtividade > 0:
-            p["largura_barra"] = round(
-                (p["quantidade"] * 100) / max_produtividade
-            )
-        else:
-            p["largura_barra"] = 0
+    return templates.TemplateResponse("indicadores.html", {"request": request, **contexto})
 
-    contexto = {
-        "request": request,
-        "inicio": inicio_str,
-        "fim": fim_str,
-        "total_negocios_recebidos_global": total_negocios_recebidos_global,
-        "total_negocios_ganhos_global": total_negocios_ganhos_global,
-        "ciclo_medio_global": ciclo_medio_global,
-        "taxa_conversao_global": taxa_conversao_global,
-        "metricas_funcionarios": metricas_funcionarios,
-        "vendas_por_origem": vendas_por_origem,
-        "produtividade_por_dia": produtividade_por_dia,
-    }
 
-    return templates.TemplateResponse("indicadores.html", contexto)
 @app.post("/dev/seed", tags=["Dev"])
 def seed_dados_dev(
     limpar: bool = True,
-    dias_passado: int = 60,
-    qtd_funcionarios: int = 5,
-    qtd_contatos: int = 40,
-    qtd_negocios: int = 120,
+    dias_passado: int = Query(60, ge=1, le=3650),
+    qtd_funcionarios: int = Query(5, ge=0, le=10000),
+    qtd_contatos: int = Query(40, ge=0, le=10_000_000),
+    qtd_negocios: int = Query(120, ge=0, le=50_000_000),
+    semente: int = SEMENTE_PADRAO,
     db: Session = Depends(obter_sessao),
 ):
     """
-    Popula o banco com dados de exemplo para desenvolvimento.
+    Popula o banco com dados de exemplo para desenvolvimento e benchmarks.
 
     Parâmetros:
     - limpar: se True, apaga todos os Funcionários, Contatos e Negócios antes de criar os dados.
@@ -490,159 +407,20 @@ def seed_dados_dev(
     - qtd_funcionarios: quantos funcionários criar.
     - qtd_contatos: quantos contatos criar.
     - qtd_negocios: quantos negócios criar.
-    """
-    # 1) Limpar dados existentes (opcional)
-    if limpar:
-        db.query(Negocio).delete(synchronize_session=False)
-        db.query(Contato).delete(synchronize_session=False)
-        db.query(Funcionario).delete(synchronize_session=False)
-        db.commit()
-
-    # 2) Criar funcionários fake
-    primeiros_nomes = [
-        "Ana", "Bruno", "Carla", "Daniel", "Eduarda",
-        "Felipe", "Gabriela", "Henrique", "Isabela", "João",
-        "Larissa", "Marcos", "Natalia", "Otávio", "Paula",
-    ]
-    sobrenomes = [
-        "Silva", "Souza", "Oliveira", "Pereira", "Costa",
-        "Almeida", "Gomes", "Ribeiro", "Carvalho", "Santos",
-    ]
-    cargos = ["Vendedor", "Closer", "SDR", "Gestor Comercial", "Pré-vendas"]
-
-    funcionarios = []
-    for i in range(qtd_funcionarios):
-        nome = f"{random.choice(primeiros_nomes)} {random.choice(sobrenomes)}"
-        email = f"vendedor{i+1}@empresa.com".lower()
-        cargo = random.choice(cargos)
-
-        func = Funcionario(
-            nome=nome,
-            email=email,
-            cargo=cargo,
-            ativo=True,
-        )
-        db.add(func)
-        funcionarios.append(func)
-
-    db.commit()
-    for f in funcionarios:
-        db.refresh(f)
-
-    # 3) Criar contatos fake
-    nomes_contato = [
-        "Carlos", "Fernanda", "Rodrigo", "Juliana", "Thiago",
-        "Patrícia", "André", "Luciana", "Vinícius", "Marta",
-        "Rafael", "Camila", "Diego", "Bianca", "Gustavo",
-    ]
-    empresas = [
-        "Tech Manaus", "Inova Digital", "Amazon Solutions",
-        "Comercial Rio Negro", "Studio Criar", "Global Contábil",
-        "Impacto Vendas", "Norte Serviços", "Amazônia Solar",
-    ]
-    telefones_base = ["9299990000", "9298880000", "9299770000"]
-
-    situacoes = ["lead", "cliente", "inativo"]
-
-    contatos = []
-    for i in range(qtd_contatos):
-        nome = random.choice(nomes_contato) + f" {random.choice(sobrenomes)}"
-        empresa = random.choice(empresas)
-        email = f"{nome.split()[0].lower()}{i+1}@{empresa.split()[0].lower()}.com"
-        telefone = random.choice(telefones_base)[:-1] + str(i % 10)
-
-        situacao = random.choices(
-            population=situacoes,
-            weights=[0.6, 0.3, 0.1],
-            k=1,
-        )[0]
-
-        c = Contato(
-            nome=nome,
-            email=email,
-            telefone=telefone,
-            empresa=empresa,
-            origem=random.choice(["whatsapp", "site", "instagram", "indicação", "ligação"]),
-            situacao=situacao,
-        )
-        db.add(c)
-        contatos.append(c)
-
-    db.commit()
-    for c in contatos:
-        db.refresh(c)
-
-    # 4) Criar negócios fake
-    hoje = date.today()
-    fases = ["novo", "em_proposta", "fechado_ganho", "fechado_perdido"]
-    origens_negocio = ["whatsapp", "site", "instagram", "indicação", "ligação"]
-
-    negocios_criados = 0
-    ganhos = 0
-    perdidos = 0
-
-    for i in range(qtd_negocios):
-        if not contatos or not funcionarios:
-            break
-
-        contato = random.choice(contatos)
-        responsavel = random.choice(funcionarios)
-
-        dias_atras = random.randint(0, max(dias_passado, 1))
-        data_criacao = hoje - timedelta(days=dias_atras)
-
-        fase = random.choices(
-            population=fases,
-            weights=[0.35, 0.30, 0.25, 0.10],
-            k=1,
-        )[0]
-
-        valor = round(random.uniform(500, 20000), 2)
-
-        probabilidade = None
-        if fase == "novo":
-            probabilidade = random.choice([10, 20, 30, 40])
-        elif fase == "em_proposta":
-            probabilidade = random.choice([40, 50, 60, 70])
-        elif fase == "fechado_ganho":
-            probabilidade = random.choice([80, 90, 100])
-        elif fase == "fechado_perdido":
-            probabilidade = random.choice([5, 10, 15])
-
-        data_prevista = data_criacao + timedelta(days=random.randint(5, 30))
-        data_fechamento = None
-
-        if fase in ["fechado_ganho", "fechado_perdido"]:
-            dias_para_fechar = random.randint(1, 45)
-            data_fechamento = data_criacao + timedelta(days=dias_para_fechar)
-            if data_fechamento > hoje:
-                data_fechamento = hoje
-
-        n = Negocio(
-            titulo=f"Projeto #{i+1} - {contato.empresa}",
-            descricao=f"Negócio gerado automaticamente para testes (contato: {contato.nome}).",
-            valor_previsto=valor,
-            fase=fase,
-            origem=random.choice(origens_negocio),
-            probabilidade=probabilidade,
-            contato_id=contato.id,
-            responsavel_id=responsavel.id,
-            data_prevista_fechamento=data_prevista,
-            data_fechamento=data_fechamento,
-        )
-
-        # Força a data de criação manualmente para simular histórico
-        n.criado_em = datetime.combine(data_criacao, datetime.min.time())
-
-        db.add(n)
-        negocios_criados += 1
+    - semente: a mesma semente (no mesmo dia) gera exatamente os mesmos dados.
 
-        if fase == "fechado_ganho":
-            ganhos += 1
-        if fase == "fechado_perdido":
-            perdidos += 1
-
-    db.commit()
+    Inserção em massa (ver app/servicos/dados_sinteticos.py); para milhões de
+    linhas prefira `python -m app.comandos gerar-dados`, que mostra o andamento.
+    """
+    resumo = gerar_dados(
+        db,
+        semente=semente,
+        qtd_funcionarios=qtd_funcionarios,
+        qtd_contatos=qtd_contatos,
+        qtd_negocios=qtd_negocios,
+        dias_passado=dias_passado,
+        limpar=limpar,
+    )
 
     return {
         "mensagem": "Seed de desenvolvimento executada com sucesso.",
@@ -652,19 +430,30 @@ def seed_dados_dev(
             "qtd_funcionarios": qtd_funcionarios,
             "qtd_contatos": qtd_contatos,
             "qtd_negocios": qtd_negocios,
+            "semente": semente,
         },
-        "resumo": {
-            "funcionarios_criados": len(funcionarios),
-            "contatos_criados": len(contatos),
-            "negocios_criados": negocios_criados,
-            "negocios_ganhos": ganhos,
-            "negocios_perdidos": perdidos,
-        },
+        "resumo": resumo,
     }
 
 
-# Inclui as rotas de contatos, negócios e funcionários sob /api/v1
+# Com CRM_ASYNC=1, as rotas CRUD usam as versões assíncronas (AsyncSession)
+if USAR_ASYNC:
+    roteador_contatos = combinar_roteadores(roteador_contatos_async, roteador_contatos)
+    roteador_negocios = combinar_roteadores(roteador_negocios_async, roteador_negocios)
+    roteador_funcionarios = combinar_roteadores(roteador_funcionarios_async, roteador_funcionarios)
+
+    instrumentar_engine(fabrica_sessoes_assincronas().kw["bind"].sync_engine)
+
+    @app.on_event("shutdown")
+    async def fechar_conexoes_assincronas():
+        await fechar_engine_assincrono()
+
+# Inclui as rotas de contatos, negócios, funcionários, importações, métricas, ingestão e webhooks sob /api/v1
 app.include_router(roteador_contatos, prefix="/api/v1")
 app.include_router(roteador_negocios, prefix="/api/v1")
 app.include_router(roteador_funcionarios, prefix="/api/v1")
+app.include_router(roteador_importacoes, prefix="/api/v1")
+app.include_router(roteador_metricas, prefix="/api/v1")
+app.include_router(roteador_ingestao, prefix="/api/v1")
+app.include_router(roteador_webhooks, prefix="/api/v1")
 
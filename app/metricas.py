@@ -0,0 +1,478 @@
+# app/metricas.py
+"""
+Métricas da aplicação no formato de texto do Prometheus (GET /metrics).
+
+- Por rota (o modelo da rota, ex.: /api/v1/negocios/{negocio_id}, nunca o
+  caminho com o id): requisições, latência, requisições em andamento e
+  tamanho da resposta.
+- Banco: espera para obter conexão do pool, comandos SQL e tempo de SQL
+  por requisição.
+- Pool de threads do Starlette (rotas `def`): threads em uso e limite.
+- Templates: tempo de renderização de cada template Jinja2.
+
+Contabilidade de SQL por requisição (pega N+1 de relacionamentos lazy):
+
+- CRM_SQL_CABECALHOS=1     – devolve X-SQL-Comandos, X-SQL-Tempo-Ms e
+                             X-SQL-Repeticao-Maxima em cada resposta (depuração).
+- CRM_SQL_MAX_REPETICOES   – quantas vezes o mesmo formato de SQL pode rodar
+                             numa requisição antes do aviso de N+1 no log (10).
+- CRM_SQL_ESTRITO=1        – para testes: a requisição falha (OrcamentoSQLExcedido)
+                             ao passar do orçamento da rota (`ORCAMENTOS_SQL`)
+                             ou do limite de repetições.
+
+Tudo em memória, por processo (com vários workers, cada um tem os seus
+números). Sem dependências externas: o formato de exposição é gerado aqui.
+"""
+import bisect
+import logging
+import os
+import re
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from jinja2 import Template
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.routing import Match
+
+logger = logging.getLogger("uvicorn.error")
+
+TIPO_CONTEUDO = "text/plain; version=0.0.4; charset=utf-8"
+
+# Limites dos histogramas (segundos e bytes)
+LIMITES_LATENCIA = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+LIMITES_BYTES = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+LIMITES_COMANDOS_SQL = (0, 1, 2, 3, 5, 10, 20, 50, 100, 200)
+
+# Rótulo das requisições que não correspondem a nenhuma rota (evita um rótulo por URL)
+ROTA_DESCONHECIDA = "desconhecida"
+
+
+def _ligado(nome: str) -> bool:
+    return os.getenv(nome, "").strip().lower() in ("1", "true", "sim", "yes")
+
+
+CABECALHOS_SQL = _ligado("CRM_SQL_CABECALHOS")
+MAX_REPETICOES_SQL = int(os.getenv("CRM_SQL_MAX_REPETICOES", "10"))
+MODO_ESTRITO_SQL = _ligado("CRM_SQL_ESTRITO")
+
+# Máximo de comandos SQL por rota no modo estrito (rotas fora da lista usam o padrão).
+# None: sem orçamento nem aviso de repetição (cargas em massa, que repetem
+# o mesmo INSERT por bloco de propósito; nos lotes, o INSERT ... RETURNING
+# ordenado vira um comando por linha no SQLite; /por-ids, que faz um SELECT
+# ... IN por bloco de 500 ids, até 20 para 10000 ids).
+ORCAMENTO_SQL_PADRAO = 10
+ORCAMENTOS_SQL: Dict[str, Optional[int]] = {
+    "/painel": 8,
+    "/funil": 8,
+    "/indicadores": 8,
+    "/funil/{fase}/mais": 2,
+    "/dev/seed": None,
+    "/api/v1/importacoes/": None,
+    "/api/v1/contatos/lote": None,
+    "/api/v1/negocios/lote": None,
+    "/api/v1/contatos/por-ids": None,
+    "/api/v1/negocios/por-ids": None,
+    "/api/v1/funcionarios/por-ids": None,
+}
+
+
+class OrcamentoSQLExcedido(RuntimeError):
+    """
+    A requisição passou do orçamento de SQL da rota (só no modo estrito).
+    """
+
+
+def _escapar(valor: str) -> str:
+    return str(valor).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _rotulos(nomes: Sequence[str], valores: Sequence[str], extra: str = "") -> str:
+    pares = [f'{nome}="{_escapar(valor)}"' for nome, valor in zip(nomes, valores)]
+    if extra:
+        pares.append(extra)
+    return "{" + ",".join(pares) + "}" if pares else ""
+
+
+def _numero(valor: float) -> str:
+    if valor == float("inf"):
+        return "+Inf"
+    return repr(float(valor)) if isinstance(valor, float) else str(valor)
+
+
+class _Metrica:
+    tipo = ""
+
+    def __init__(self, nome: str, ajuda: str, rotulos: Sequence[str] = ()):
+        self.nome = nome
+        self.ajuda = ajuda
+        self.rotulos = tuple(rotulos)
+        self._trava = threading.Lock()
+
+    def _cabecalho(self) -> List[str]:
+        return [f"# HELP {self.nome} {self.ajuda}", f"# TYPE {self.nome} {self.tipo}"]
+
+
+class Contador(_Metrica):
+    """
+    Valor que só aumenta (ex.: total de requisições).
+    """
+
+    tipo = "counter"
+
+    def __init__(self, nome: str, ajuda: str, rotulos: Sequence[str] = ()):
+        super().__init__(nome, ajuda, rotulos)
+        self._valores: Dict[Tuple[str, ...], float] = {}
+
+    def somar(self, *valores_rotulos: str, valor: float = 1) -> None:
+        with self._trava:
+            self._valores[valores_rotulos] = self._valores.get(valores_rotulos, 0) + valor
+
+    def exposicao(self) -> List[str]:
+        with self._trava:
+            itens = sorted(self._valores.items())
+        return self._cabecalho() + [
+            f"{self.nome}{_rotulos(self.rotulos, chave)} {_numero(valor)}" for chave, valor in itens
+        ]
+
+
+class Medidor(_Metrica):
+    """
+    Valor que sobe e desce (ex.: requisições em andamento).
+    `coletar` permite ler o valor só na hora da exposição.
+    """
+
+    tipo = "gauge"
+
+    def __init__(
+        self,
+        nome: str,
+        ajuda: str,
+        rotulos: Sequence[str] = (),
+        coletar: Optional[Callable[[], Iterable[Tuple[Tuple[str, ...], float]]]] = None,
+    ):
+        super().__init__(nome, ajuda, rotulos)
+        self._valores: Dict[Tuple[str, ...], float] = {}
+        self._coletar = coletar
+
+    def somar(self, *valores_rotulos: str, valor: float = 1) -> None:
+        with self._trava:
+            self._valores[valores_rotulos] = self._valores.get(valores_rotulos, 0) + valor
+
+    def exposicao(self) -> List[str]:
+        if self._coletar:
+            itens = sorted(self._coletar())
+        else:
+            with self._trava:
+                itens = sorted(self._valores.items())
+        return self._cabecalho() + [
+            f"{self.nome}{_rotulos(self.rotulos, chave)} {_numero(valor)}" for chave, valor in itens
+        ]
+
+
+class Histograma(_Metrica):
+    """
+    Distribuição em faixas acumuladas (`_bucket`), com `_sum` e `_count`.
+    """
+
+    tipo = "histogram"
+
+    def __init__(self, nome: str, ajuda: str, rotulos: Sequence[str] = (), limites=LIMITES_LATENCIA):
+        super().__init__(nome, ajuda, rotulos)
+        self.limites = tuple(limites)
+        # rótulos -> [contagem por faixa (+Inf no fim), soma]
+        self._series: Dict[Tuple[str, ...], list] = {}
+
+    def observar(self, valor: float, *valores_rotulos: str) -> None:
+        faixa = bisect.bisect_left(self.limites, valor)
+        with self._trava:
+            serie = self._series.get(valores_rotulos)
+            if serie is None:
+                serie = self._series[valores_rotulos] = [[0] * (len(self.limites) + 1), 0.0]
+            serie[0][faixa] += 1
+            serie[1] += valor
+
+    def exposicao(self) -> List[str]:
+        with self._trava:
+            itens = sorted((chave, (list(contagens), soma)) for chave, (contagens, soma) in self._series.items())
+        linhas = self._cabecalho()
+        for chave, (contagens, soma) in itens:
+            acumulado = 0
+            for limite, quantidade in zip(self.limites + (float("inf"),), contagens):
+                acumulado += quantidade
+                rotulos = _rotulos(self.rotulos, chave, f'le="{_numero(limite)}"')
+                linhas.append(f"{self.nome}_bucket{rotulos} {acumulado}")
+            linhas.append(f"{self.nome}_sum{_rotulos(self.rotulos, chave)} {_numero(soma)}")
+            linhas.append(f"{self.nome}_count{_rotulos(self.rotulos, chave)} {acumulado}")
+        return linhas
+
+
+class RegistroMetricas:
+    """
+    Conjunto de métricas expostas em /metrics (na ordem de registro).
+    """
+
+    def __init__(self):
+        self._metricas: List[_Metrica] = []
+
+    def registrar(self, metrica: _Metrica) -> _Metrica:
+        self._metricas.append(metrica)
+        return metrica
+
+    def exposicao(self) -> str:
+        linhas: List[str] = []
+        for metrica in self._metricas:
+            linhas.extend(metrica.exposicao())
+        return "\n".join(linhas) + "\n"
+
+
+registro = RegistroMetricas()
+
+REQUISICOES = registro.registrar(Contador(
+    "crm_http_requisicoes_total", "Requisições HTTP atendidas.", ("metodo", "rota", "status"),
+))
+DURACAO = registro.registrar(Histograma(
+    "crm_http_duracao_segundos", "Latência das requisições HTTP.", ("metodo", "rota"),
+))
+EM_ANDAMENTO = registro.registrar(Medidor(
+    "crm_http_em_andamento", "Requisições HTTP em andamento.", ("metodo", "rota"),
+))
+TAMANHO_RESPOSTA = registro.registrar(Histograma(
+    "crm_http_resposta_bytes", "Tamanho do corpo das respostas HTTP.", ("metodo", "rota"), LIMITES_BYTES,
+))
+COMANDOS_SQL = registro.registrar(Histograma(
+    "crm_sql_comandos_por_requisicao", "Comandos SQL executados por requisição.", ("rota",), LIMITES_COMANDOS_SQL,
+))
+DURACAO_SQL = registro.registrar(Histograma(
+    "crm_sql_duracao_segundos_por_requisicao", "Tempo total de SQL por requisição.", ("rota",),
+))
+COMANDOS_SQL_TOTAL = registro.registrar(Contador(
+    "crm_sql_comandos_total", "Comandos SQL executados (inclusive fora de requisições).",
+))
+ESPERA_POOL = registro.registrar(Histograma(
+    "crm_pool_espera_segundos", "Tempo para obter uma conexão do pool do banco.",
+))
+RENDERIZACAO = registro.registrar(Histograma(
+    "crm_template_renderizacao_segundos", "Tempo de renderização dos templates Jinja2.", ("template",),
+))
+
+
+class _Requisicao:
+    """
+    Acumuladores da requisição atual (SQL e espera do pool).
+    """
+
+    __slots__ = ("rota", "orcamento", "verificar", "comandos_sql", "duracao_sql", "espera_pool", "formatos")
+
+    def __init__(self, rota: str = ROTA_DESCONHECIDA):
+        self.rota = rota
+        self.orcamento = ORCAMENTOS_SQL.get(rota, ORCAMENTO_SQL_PADRAO)
+        self.verificar = self.orcamento is not None
+        self.comandos_sql = 0
+        self.duracao_sql = 0.0
+        self.espera_pool = 0.0
+        self.formatos: Counter = Counter()
+
+    def repeticoes(self) -> List[Tuple[str, int]]:
+        """
+        Formatos de SQL que passaram do limite de repetições (suspeitas de N+1).
+        """
+        if not self.verificar:
+            return []
+        return [(formato, vezes) for formato, vezes in self.formatos.items() if vezes > MAX_REPETICOES_SQL]
+
+
+# Visível nas threads do pool e nas greenlets do modo assíncrono (o contexto é copiado)
+_requisicao_atual: ContextVar[Optional[_Requisicao]] = ContextVar("requisicao_atual", default=None)
+
+
+# Lista de parâmetros de um IN (`(?, ?, ?)`, `(%(p_1)s, ...)`, `($1, $2)`)
+_LISTA_PARAMETROS = re.compile(r"\((?:\s*(?:\?|%\([^)]*\)s|\$\d+)\s*,?)+\)")
+
+
+@lru_cache(maxsize=1024)
+def formato_sql(sql: str) -> str:
+    """
+    Formato do comando: o SQL já vem sem valores (parâmetros ligados);
+    só falta juntar listas de IN de tamanhos diferentes.
+    """
+    return " ".join(_LISTA_PARAMETROS.sub("(?)", sql).split())
+
+
+def _ao_iniciar_comando(conexao, _cursor, sql, _parametros, contexto, _executemany):
+    contexto._inicio_metricas = time.perf_counter()
+    requisicao = _requisicao_atual.get()
+    if requisicao is None:
+        return
+
+    requisicao.comandos_sql += 1
+    formato = formato_sql(sql)
+    requisicao.formatos[formato] += 1
+    if not (MODO_ESTRITO_SQL and requisicao.verificar):
+        return
+    if requisicao.comandos_sql > requisicao.orcamento:
+        raise OrcamentoSQLExcedido(
+            f"{requisicao.rota}: {requisicao.comandos_sql} comandos SQL "
+            f"(orçamento {requisicao.orcamento}). Último: {formato[:200]}"
+        )
+    if requisicao.formatos[formato] > MAX_REPETICOES_SQL:
+        raise OrcamentoSQLExcedido(
+            f"{requisicao.rota}: o mesmo SQL rodou {requisicao.formatos[formato]} vezes "
+            f"(possível N+1): {formato[:200]}"
+        )
+
+
+def _ao_terminar_comando(conexao, _cursor, _sql, _parametros, contexto, _executemany):
+    duracao = time.perf_counter() - getattr(contexto, "_inicio_metricas", time.perf_counter())
+    COMANDOS_SQL_TOTAL.somar()
+    requisicao = _requisicao_atual.get()
+    if requisicao is not None:
+        requisicao.duracao_sql += duracao
+
+
+def _medir_espera_do_pool(engine_alvo: Engine) -> None:
+    """
+    Troca a classe do pool por uma subclasse que mede `connect()`.
+    O SQLAlchemy não tem evento *antes* do checkout; a subclasse sobrevive a
+    `engine.dispose()`, que recria o pool com `self.__class__`.
+    """
+    pool = engine_alvo.pool
+    classe = type(pool)
+    if getattr(classe, "_mede_espera", False):
+        return
+
+    def connect(self):
+        inicio = time.perf_counter()
+        conexao = classe.connect(self)
+        espera = time.perf_counter() - inicio
+        ESPERA_POOL.observar(espera)
+        requisicao = _requisicao_atual.get()
+        if requisicao is not None:
+            requisicao.espera_pool += espera
+        return conexao
+
+    # Mesmo nome da classe original (aparece em `configuracao-banco`)
+    pool.__class__ = type(classe.__name__, (classe,), {"connect": connect, "_mede_espera": True})
+
+
+def instrumentar_engine(engine_alvo: Engine) -> None:
+    """
+    Liga a contagem/tempo de SQL e a medição de espera do pool em um engine.
+    """
+    if not event.contains(engine_alvo, "before_cursor_execute", _ao_iniciar_comando):
+        event.listen(engine_alvo, "before_cursor_execute", _ao_iniciar_comando)
+        event.listen(engine_alvo, "after_cursor_execute", _ao_terminar_comando)
+    _medir_espera_do_pool(engine_alvo)
+
+
+class TemplateMedido(Template):
+    """
+    Template do Jinja2 que mede o próprio tempo de renderização.
+    """
+
+    def render(self, *args, **kwargs) -> str:
+        inicio = time.perf_counter()
+        try:
+            return super().render(*args, **kwargs)
+        finally:
+            RENDERIZACAO.observar(time.perf_counter() - inicio, self.name or "")
+
+
+def instrumentar_templates(templates) -> None:
+    """
+    Faz os templates (Jinja2Templates) medirem o tempo de renderização.
+    """
+    templates.env.template_class = TemplateMedido
+
+
+def _uso_pool_threads():
+    # Limite padrão do anyio, usado pelo Starlette para rodar as rotas `def`
+    from anyio import to_thread
+
+    try:
+        limitador = to_thread.current_default_thread_limiter()
+    except RuntimeError:  # fora do event loop
+        return []
+    return [(("em_uso",), limitador.borrowed_tokens), (("limite",), limitador.total_tokens)]
+
+
+registro.registrar(Medidor(
+    "crm_threadpool_threads",
+    "Threads do pool do Starlette (rotas síncronas): em uso e limite.",
+    ("estado",),
+    coletar=_uso_pool_threads,
+))
+
+
+def modelo_da_rota(app, escopo) -> str:
+    """
+    Caminho com parâmetros da rota que atende a requisição (ex.: /funil/{fase}/mais).
+    """
+    for rota in app.router.routes:
+        correspondencia, _ = rota.matches(escopo)
+        if correspondencia == Match.FULL:
+            return getattr(rota, "path", ROTA_DESCONHECIDA)
+    return ROTA_DESCONHECIDA
+
+
+class MiddlewareMetricas:
+    """
+    Middleware ASGI que registra as métricas por rota.
+    ASGI puro (e não `@app.middleware`) para contar os bytes enviados
+    sem juntar o corpo da resposta em memória.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, escopo, receber, enviar):
+        if escopo["type"] != "http":
+            await self.app(escopo, receber, enviar)
+            return
+
+        metodo = escopo["method"]
+        rota = modelo_da_rota(escopo["app"], escopo)
+        situacao = {"status": 500, "bytes": 0}
+
+        requisicao = _Requisicao(rota)
+
+        async def enviar_medindo(mensagem):
+            if mensagem["type"] == "http.response.start":
+                situacao["status"] = mensagem["status"]
+                if CABECALHOS_SQL:
+                    cabecalhos = MutableHeaders(scope=mensagem)
+                    cabecalhos.append("X-SQL-Comandos", str(requisicao.comandos_sql))
+                    cabecalhos.append("X-SQL-Tempo-Ms", f"{requisicao.duracao_sql * 1000:.2f}")
+                    cabecalhos.append(
+                        "X-SQL-Repeticao-Maxima", str(max(requisicao.formatos.values(), default=0))
+                    )
+            elif mensagem["type"] == "http.response.body":
+                situacao["bytes"] += len(mensagem.get("body", b""))
+            await enviar(mensagem)
+
+        ficha = _requisicao_atual.set(requisicao)
+        EM_ANDAMENTO.somar(metodo, rota)
+        inicio = time.perf_counter()
+        try:
+            await self.app(escopo, receber, enviar_medindo)
+        finally:
+            duracao = time.perf_counter() - inicio
+            EM_ANDAMENTO.somar(metodo, rota, valor=-1)
+            _requisicao_atual.reset(ficha)
+
+            REQUISICOES.somar(metodo, rota, str(situacao["status"]))
+            DURACAO.observar(duracao, metodo, rota)
+            TAMANHO_RESPOSTA.observar(situacao["bytes"], metodo, rota)
+            COMANDOS_SQL.observar(requisicao.comandos_sql, rota)
+            DURACAO_SQL.observar(requisicao.duracao_sql, rota)
+
+            for formato, vezes in requisicao.repeticoes():
+                logger.warning(
+                    "Possível N+1 em %s %s: o mesmo SQL rodou %d vezes na requisição: %s",
+                    metodo, rota, vezes, formato[:300],
+                )
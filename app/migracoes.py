@@ -0,0 +1,103 @@
+# app/migracoes.py
+"""
+Atualização do esquema de bancos já existentes (ex.: um `crm.db` antigo).
+
+`Base.metadata.create_all` só cria tabelas que ainda não existem: colunas e
+índices novos de tabelas antigas ficam de fora. Aqui completamos o que falta
+sem apagar dados.
+"""
+from typing import List
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.schema import CreateColumn
+
+from app.banco_dados import Base
+import app.modelos  # noqa: F401  (garante o registro dos modelos)
+from app.servicos.busca_contatos import garantir_indice_busca
+from app.servicos.resolver_contatos import preencher_identificadores_normalizados
+
+
+def atualizar_esquema(engine: Engine) -> List[str]:
+    """
+    Cria tabelas, colunas e índices que faltam no banco.
+    Retorna a lista do que foi alterado (vazia se já estava em dia).
+    """
+    alteracoes: List[str] = []
+    inspetor = inspect(engine)
+    tabelas_existentes = set(inspetor.get_table_names())
+
+    for tabela in Base.metadata.sorted_tables:
+        if tabela.name not in tabelas_existentes:
+            tabela.create(bind=engine)
+            alteracoes.append(f"tabela {tabela.name}")
+            continue
+
+        # Colunas novas (precisam aceitar NULL ou ter valor padrão no banco)
+        colunas_existentes = {c["name"] for c in inspetor.get_columns(tabela.name)}
+        for coluna in tabela.columns:
+            if coluna.name in colunas_existentes:
+                continue
+            ddl = CreateColumn(coluna).compile(dialect=engine.dialect)
+            with engine.begin() as conexao:
+                conexao.execute(text(f"ALTER TABLE {tabela.name} ADD COLUMN {ddl}"))
+            alteracoes.append(f"coluna {tabela.name}.{coluna.name}")
+
+        # Índices novos
+        indices_existentes = {i["name"] for i in inspetor.get_indexes(tabela.name)}
+        for indice in tabela.indexes:
+            if indice.name not in indices_existentes:
+                indice.create(bind=engine)
+                alteracoes.append(f"índice {indice.name}")
+
+    if _recriar_eventos_com_autoincremento(engine):
+        alteracoes.append("tabela eventos_saida com AUTOINCREMENT")
+
+    # Colunas normalizadas novas: calcula a partir do telefone/e-mail já cadastrados
+    if {"coluna contatos.telefone_normalizado", "coluna contatos.email_normalizado"} & set(alteracoes):
+        quantidade = preencher_identificadores_normalizados(engine)
+        alteracoes.append(f"telefone/e-mail normalizados de {quantidade} contatos")
+
+    # Índice de busca textual de contatos (FTS5 no SQLite, trigramas no PostgreSQL)
+    alteracoes.extend(garantir_indice_busca(engine))
+
+    return alteracoes
+
+
+def _recriar_eventos_com_autoincremento(engine: Engine) -> bool:
+    """
+    No SQLite, recria a tabela `eventos_saida` criada sem AUTOINCREMENT
+    (antes ela reaproveitava ids de eventos apagados). A sequência começa
+    depois do maior id já usado, nos eventos ou nos cursores dos webhooks.
+    """
+    if engine.dialect.name != "sqlite":
+        return False
+    tabela = Base.metadata.tables["eventos_saida"]
+    with engine.begin() as conexao:
+        ddl = conexao.execute(
+            text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = :nome"),
+            {"nome": tabela.name},
+        ).scalar()
+        if ddl is None or "AUTOINCREMENT" in ddl.upper():
+            return False
+
+        conexao.execute(text(f"ALTER TABLE {tabela.name} RENAME TO {tabela.name}_antiga"))
+        for indice in tabela.indexes:
+            conexao.execute(text(f"DROP INDEX IF EXISTS {indice.name}"))
+        tabela.create(bind=conexao)
+        colunas = ", ".join(c.name for c in tabela.columns)
+        conexao.execute(text(
+            f"INSERT INTO {tabela.name} ({colunas}) SELECT {colunas} FROM {tabela.name}_antiga"
+        ))
+        conexao.execute(text(f"DROP TABLE {tabela.name}_antiga"))
+
+        ultimo_id = conexao.execute(text(
+            "SELECT max(coalesce((SELECT max(id) FROM eventos_saida), 0), "
+            "coalesce((SELECT max(ultimo_evento_id) FROM webhook_cursores), 0))"
+        )).scalar()
+        conexao.execute(text("DELETE FROM sqlite_sequence WHERE name = :nome"), {"nome": tabela.name})
+        conexao.execute(
+            text("INSERT INTO sqlite_sequence (name, seq) VALUES (:nome, :seq)"),
+            {"nome": tabela.name, "seq": ultimo_id},
+        )
+    return True
@@ -3,3 +3,5 @@
 from app.modelos.contato import Contato  # noqa: F401
 from app.modelos.negocio import Negocio  # noqa: F401
 from app.modelos.funcionario import Funcionario  # noqa: F401
+from app.modelos.resumo_diario import ResumoNegocioDiario  # noqa: F401
+from app.modelos.evento_saida import EventoSaida, CursorWebhook  # noqa: F401
@@ -1,8 +1,16 @@
-from sqlalchemy import Column, Integer, String, DateTime
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, DateTime, Index
+from sqlalchemy.orm import relationship, validates
 from sqlalchemy.sql import func
 
 from app.banco_dados import Base
+from app.normalizacao import normalizar_email, normalizar_telefone
+
+
+def _normalizado(campo: str, normalizar):
+    # Valor padrão do INSERT do Core (lote, gerador de dados), calculado a partir do campo original
+    def padrao(contexto):
+        return normalizar(contexto.get_current_parameters().get(campo))
+    return padrao
 
 
 class Contato(Base):
@@ -19,6 +27,15 @@ class Contato(Base):
     telefone = Column(String(50), nullable=True)
     empresa = Column(String(150), nullable=True)
 
+    # Telefone em dígitos E.164 e e-mail em minúsculas (ver app/normalizacao.py):
+    # é por eles que /api/v1/contatos/resolver acha o contato com uma busca no índice
+    telefone_normalizado = Column(
+        String(20), nullable=True, default=_normalizado("telefone", normalizar_telefone)
+    )
+    email_normalizado = Column(
+        String(255), nullable=True, default=_normalizado("email", normalizar_email)
+    )
+
     # De onde veio o lead (whatsapp, site, instagram, indicação, ligação...)
     origem = Column(String(50), nullable=True)
 
@@ -29,8 +46,36 @@ class Contato(Base):
     criado_em = Column(DateTime(timezone=True), server_default=func.now())
     atualizado_em = Column(DateTime(timezone=True), onupdate=func.now())
 
+    # Versão do registro: sobe a cada UPDATE (ETag e If-Match; ver app/etag.py)
+    versao = Column(Integer, nullable=False, server_default="1")
+
     # Relacionamento com negócios (lado "um" da relação 1:N)
     negocios = relationship("Negocio", back_populates="contato")
 
+    # Índices pensados a partir das consultas das rotas
+    # (conferir com `python -m app.comandos explicar-consultas`)
+    __table_args__ = (
+        # Ordenação/paginação por cursor das listagens (criado_em DESC, id DESC)
+        Index("ix_contatos_criado_em_id", "criado_em", "id"),
+        # Filtro por situação + ordenação (também cobre as contagens do /painel)
+        Index("ix_contatos_situacao_criado_em_id", "situacao", "criado_em", "id"),
+        # Resolução por telefone/e-mail (o mais recente primeiro, quando há repetidos)
+        Index("ix_contatos_telefone_normalizado_id", "telefone_normalizado", "id"),
+        Index("ix_contatos_email_normalizado_id", "email_normalizado", "id"),
+    )
+
+    # O UPDATE confere a versão lida (WHERE versao = ?): concorrência otimista
+    __mapper_args__ = {"version_id_col": versao}
+
+    @validates("telefone")
+    def _validar_telefone(self, chave, telefone):
+        self.telefone_normalizado = normalizar_telefone(telefone)
+        return telefone
+
+    @validates("email")
+    def _validar_email(self, chave, email):
+        self.email_normalizado = normalizar_email(email)
+        return email
+
     def __repr__(self) -> str:
         return f"<Contato id={self.id} nome='{self.nome}'>"
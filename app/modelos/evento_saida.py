@@ -0,0 +1,56 @@
+# app/modelos/evento_saida.py
+from sqlalchemy import JSON, Column, DateTime, Index, Integer, String
+from sqlalchemy.sql import func
+
+from app.banco_dados import Base
+
+
+class EventoSaida(Base):
+    """
+    Evento de alteração de contato ou negócio a ser enviado aos webhooks
+    (outbox transacional).
+
+    É gravado na mesma transação da alteração: se o commit falhar, o evento
+    também não existe; se der certo, o evento será entregue (ver
+    app/servicos/webhooks.py).
+    """
+    __tablename__ = "eventos_saida"
+
+    id = Column(Integer, primary_key=True)
+
+    # contato.criado, contato.atualizado, contato.excluido, negocio.criado...
+    tipo = Column(String(50), nullable=False)
+    entidade = Column(String(30), nullable=False)
+    entidade_id = Column(Integer, nullable=False)
+
+    # Partição fixa por entidade: os eventos de um mesmo registro ficam na
+    # mesma partição e são entregues em ordem; partições diferentes em paralelo
+    particao = Column(Integer, nullable=False)
+
+    # Registro (criado/excluído) ou alterações campo a campo (atualizado)
+    dados = Column(JSON, nullable=False)
+
+    criado_em = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        # Próximos eventos de uma partição (WHERE particao = ? AND id > ? ORDER BY id)
+        Index("ix_eventos_saida_particao_id", "particao", "id"),
+        # Sem AUTOINCREMENT o SQLite reaproveita ids depois da limpeza dos
+        # eventos entregues, e os novos ficariam atrás dos cursores
+        {"sqlite_autoincrement": True},
+    )
+
+    def __repr__(self) -> str:
+        return f"<EventoSaida id={self.id} tipo='{self.tipo}' entidade_id={self.entidade_id}>"
+
+
+class CursorWebhook(Base):
+    """
+    Até qual evento cada webhook (destino) já recebeu, por partição.
+    """
+    __tablename__ = "webhook_cursores"
+
+    destino = Column(String(500), primary_key=True)
+    particao = Column(Integer, primary_key=True)
+    ultimo_evento_id = Column(Integer, nullable=False, default=0)
+    atualizado_em = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
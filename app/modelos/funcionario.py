@@ -1,5 +1,5 @@
 # app/modelos/funcionario.py
-from sqlalchemy import Column, Integer, String, Boolean, DateTime
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Index
 from sqlalchemy.sql import func
 
 from app.banco_dados import Base
@@ -21,5 +21,16 @@ class Funcionario(Base):
     criado_em = Column(DateTime(timezone=True), server_default=func.now())
     atualizado_em = Column(DateTime(timezone=True), onupdate=func.now())
 
+    # Versão do registro: sobe a cada UPDATE (ETag e If-Match; ver app/etag.py)
+    versao = Column(Integer, nullable=False, server_default="1")
+
+    __table_args__ = (
+        # Funcionários ativos em ordem alfabética (/indicadores)
+        Index("ix_funcionarios_ativo_nome", "ativo", "nome"),
+    )
+
+    # O UPDATE confere a versão lida (WHERE versao = ?): concorrência otimista
+    __mapper_args__ = {"version_id_col": versao}
+
     def __repr__(self) -> str:
         return f"<Funcionario id={self.id} nome='{self.nome}'>"
@@ -6,6 +6,7 @@ from sqlalchemy import (
     Date,
     DateTime,
     ForeignKey,
+    Index,
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -43,10 +44,37 @@ class Negocio(Base):
     criado_em = Column(DateTime(timezone=True), server_default=func.now())
     atualizado_em = Column(DateTime(timezone=True), onupdate=func.now())
 
+    # Versão do registro: sobe a cada UPDATE (ETag e If-Match; ver app/etag.py)
+    versao = Column(Integer, nullable=False, server_default="1")
+
     # Lados do relacionamento:
     # aqui usamos back_populates, combinando com Contato.negocios
     contato = relationship("Contato", back_populates="negocios")
     responsavel = relationship("Funcionario")
 
+    # Índices pensados a partir das consultas das rotas
+    # (conferir com `python -m app.comandos explicar-consultas`)
+    __table_args__ = (
+        # Ordenação/paginação por cursor das listagens (criado_em DESC, id DESC)
+        Index("ix_negocios_criado_em_id", "criado_em", "id"),
+        # Listagem filtrada + ordenação direto no índice (e colunas do /funil)
+        Index("ix_negocios_fase_criado_em_id", "fase", "criado_em", "id"),
+        Index("ix_negocios_origem_criado_em_id", "origem", "criado_em", "id"),
+        Index("ix_negocios_contato_criado_em_id", "contato_id", "criado_em", "id"),
+        # /indicadores: "trabalhados" = criados OU atualizados no período
+        Index("ix_negocios_atualizado_em", "atualizado_em"),
+        # /indicadores: ganhos por data de fechamento (cobre origem e valor)
+        Index(
+            "ix_negocios_fase_fechamento",
+            "fase",
+            "data_fechamento",
+            "origem",
+            "valor_previsto",
+        ),
+    )
+
+    # O UPDATE confere a versão lida (WHERE versao = ?): concorrência otimista
+    __mapper_args__ = {"version_id_col": versao}
+
     def __repr__(self) -> str:
         return f"<Negocio id={self.id} titulo='{self.titulo}'>"
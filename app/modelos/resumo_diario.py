@@ -0,0 +1,44 @@
+# app/modelos/resumo_diario.py
+from sqlalchemy import Column, Integer, String, Numeric, Date, Index
+
+from app.banco_dados import Base
+
+
+class ResumoNegocioDiario(Base):
+    """
+    Resumo diário dos negócios, mantido incrementalmente pelas rotas de escrita.
+
+    Cada linha soma os negócios de uma chave (dia, responsavel_id, origem, fase):
+    - `qtd_criados`/`valor_criados`: negócios criados naquele dia;
+    - `qtd_fechados`/`valor_fechados`/`soma_ciclo_dias`/`qtd_ciclos`: negócios
+      com `data_fechamento` naquele dia.
+
+    As colunas são aditivas: linhas repetidas da mesma chave apenas somam,
+    por isso a tabela não tem restrição de unicidade.
+    """
+    __tablename__ = "negocios_resumo_diario"
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    dia = Column(Date, nullable=False)
+    responsavel_id = Column(Integer, nullable=True)
+    origem = Column(String(50), nullable=True)
+    fase = Column(String(50), nullable=False)
+
+    qtd_criados = Column(Integer, nullable=False, default=0)
+    valor_criados = Column(Numeric(14, 2), nullable=False, default=0)
+
+    qtd_fechados = Column(Integer, nullable=False, default=0)
+    valor_fechados = Column(Numeric(14, 2), nullable=False, default=0)
+    soma_ciclo_dias = Column(Integer, nullable=False, default=0)
+    qtd_ciclos = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        Index("ix_resumo_chave", "dia", "responsavel_id", "origem", "fase"),
+        Index("ix_resumo_fase_dia", "fase", "dia"),
+        # Totais por fase do /funil (lidos só do índice)
+        Index("ix_resumo_fase_totais", "fase", "qtd_criados", "valor_criados"),
+    )
+
+    def __repr__(self) -> str:
+        return f"<ResumoNegocioDiario dia={self.dia} fase='{self.fase}'>"
@@ -0,0 +1,68 @@
+# app/normalizacao.py
+"""
+Formas normalizadas de telefone e e-mail, usadas para achar um contato
+(webhooks do WhatsApp/n8n, importação de CSV) por busca indexada.
+
+- Telefone: só os dígitos no formato E.164, sem o "+"
+  ("(92) 99999-9999", "+55 92 99999-9999" e "0 92 99999-9999" viram
+  "5592999999999"). Números sem código do país recebem `CODIGO_PAIS_PADRAO`.
+- E-mail: sem espaços nas pontas e em minúsculas.
+"""
+import re
+from typing import Dict, Optional
+
+# Código do país aplicado a números nacionais (DDD + número)
+CODIGO_PAIS_PADRAO = "55"
+
+# E.164: no máximo 15 dígitos; abaixo de 8 não é um telefone
+MIN_DIGITOS_TELEFONE = 8
+MAX_DIGITOS_TELEFONE = 15
+
+_NAO_DIGITOS = re.compile(r"\D")
+
+
+def normalizar_telefone(telefone: Optional[str]) -> Optional[str]:
+    """
+    Dígitos E.164 do telefone (sem o "+"), ou None se não parecer um telefone.
+    """
+    if not telefone:
+        return None
+    digitos = _NAO_DIGITOS.sub("", telefone)
+
+    if digitos.startswith("00"):
+        # Prefixo internacional discado ("00 55 92 ...")
+        digitos = digitos[2:]
+    elif digitos.startswith("0") and len(digitos) in (11, 12):
+        # Prefixo de operadora/longa distância antes do DDD ("0 92 ...")
+        digitos = digitos[1:]
+
+    if len(digitos) in (10, 11) and not telefone.lstrip().startswith("+"):
+        # DDD + número (fixo ou celular), sem o código do país
+        digitos = CODIGO_PAIS_PADRAO + digitos
+
+    if not MIN_DIGITOS_TELEFONE <= len(digitos) <= MAX_DIGITOS_TELEFONE:
+        return None
+    return digitos
+
+
+def normalizar_email(email: Optional[str]) -> Optional[str]:
+    """
+    E-mail sem espaços nas pontas e em minúsculas (None se vazio).
+    """
+    if not email:
+        return None
+    return email.strip().lower() or None
+
+
+def com_identificadores_normalizados(dados: Dict) -> Dict:
+    """
+    Acrescenta `telefone_normalizado`/`email_normalizado` aos dados de um
+    contato que trazem telefone/e-mail (UPDATE em massa, que não passa
+    pelos eventos do ORM).
+    """
+    dados = dict(dados)
+    if "telefone" in dados:
+        dados["telefone_normalizado"] = normalizar_telefone(dados["telefone"])
+    if "email" in dados:
+        dados["email_normalizado"] = normalizar_email(dados["email"])
+    return dados
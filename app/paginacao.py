@@ -0,0 +1,64 @@
+# app/paginacao.py
+"""
+Paginação por cursor (keyset) sobre (criado_em, id), em ordem decrescente.
+
+O cursor é opaco para o cliente: base64 de `[criado_em ISO, id]`.
+"""
+import base64
+import json
+from datetime import datetime, timedelta
+from typing import Optional, Sequence, Tuple
+
+from sqlalchemy import and_, not_
+
+# Cabeçalho de resposta com o cursor da próxima página nas listagens da API
+CABECALHO_PROXIMO_CURSOR = "X-Proximo-Cursor"
+
+
+def codificar_cursor(criado_em: datetime, id_: int) -> str:
+    """
+    Gera o cursor que aponta para a linha (criado_em, id).
+    """
+    bruto = json.dumps([criado_em.isoformat(), id_], separators=(",", ":"))
+    return base64.urlsafe_b64encode(bruto.encode()).decode().rstrip("=")
+
+
+def decodificar_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Lê um cursor gerado por `codificar_cursor`.
+    Lança ValueError se o cursor for inválido.
+    """
+    try:
+        preenchido = cursor + "=" * (-len(cursor) % 4)
+        criado_em, id_ = json.loads(base64.urlsafe_b64decode(preenchido.encode()))
+        return datetime.fromisoformat(criado_em), int(id_)
+    except (ValueError, TypeError, UnicodeDecodeError) as erro:
+        raise ValueError("Cursor inválido.") from erro
+
+
+def filtro_depois_do_cursor(coluna_data, coluna_id, criado_em: datetime, id_: int):
+    """
+    Linhas que vêm depois de (criado_em, id) na ordem `criado_em DESC, id DESC`.
+
+    O "mesmo instante" é a faixa (criado_em - 1µs, criado_em]: no SQLite a data
+    é texto, com ou sem fração de segundos, e a igualdade simples falharia
+    entre os dois formatos.
+    """
+    mesmo_instante = and_(
+        coluna_data > criado_em - timedelta(microseconds=1),
+        coluna_data <= criado_em,
+    )
+    return and_(
+        coluna_data <= criado_em,
+        not_(and_(mesmo_instante, coluna_id >= id_)),
+    )
+
+
+def proximo_cursor(itens: Sequence, limite: int) -> Optional[str]:
+    """
+    Cursor da página seguinte, a partir do último item (com `criado_em` e `id`).
+    Retorna None quando a página veio incompleta, ou seja, não há mais itens.
+    """
+    if not itens or len(itens) < limite or not itens[-1].criado_em:
+        return None
+    return codificar_cursor(itens[-1].criado_em, itens[-1].id)
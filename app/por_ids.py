@@ -0,0 +1,92 @@
+# app/por_ids.py
+"""
+Leitura de vários registros pelo id em uma chamada só.
+
+Em vez de um GET /{id} por registro (ex.: um fluxo do n8n que busca 200
+negócios), o cliente pede todos de uma vez:
+
+- GET /api/v1/<entidade>/?ids=3,7,12 (até `MAX_IDS_CONSULTA` ids na URL);
+- POST /api/v1/<entidade>/por-ids com {"ids": [...]} (listas grandes, até
+  `MAX_ITENS_LOTE`).
+
+Os registros são lidos na mesma sessão, com uma consulta IN por bloco de
+`TAMANHO_BLOCO_IN` ids, e voltam na ordem pedida (ids repetidos contam uma
+vez). Os ids que não existem vão no cabeçalho `X-Ids-Nao-Encontrados` (GET)
+ou em `nao_encontrados` (POST).
+"""
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from app.servicos.lotes import em_blocos
+
+# Cabeçalho de resposta com os ids pedidos em `ids=` que não existem
+CABECALHO_IDS_NAO_ENCONTRADOS = "X-Ids-Nao-Encontrados"
+
+# Limite de ids no parâmetro `ids=` (listas maiores: POST /por-ids)
+MAX_IDS_CONSULTA = 500
+
+
+def parametro_ids(
+    ids: Optional[str] = Query(
+        default=None,
+        description=(
+            f"Busca estes ids, separados por vírgula (até {MAX_IDS_CONSULTA}; para mais, "
+            "use POST /por-ids). Quando informado, filtros e paginação são ignorados e os "
+            "itens voltam na ordem pedida; os ids inexistentes vão no cabeçalho "
+            f"`{CABECALHO_IDS_NAO_ENCONTRADOS}`."
+        ),
+    ),
+) -> Optional[List[int]]:
+    """
+    Dependência do parâmetro `ids` das listagens. Devolve os ids na ordem
+    pedida, sem repetidos, ou None se não foi informado. Id inválido: 400.
+    """
+    if ids is None:
+        return None
+    try:
+        pedidos = [int(valor) for valor in ids.split(",") if valor.strip()]
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="`ids` deve ser uma lista de números separados por vírgula.",
+        )
+    pedidos = list(dict.fromkeys(pedidos))
+    if not pedidos:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Informe ao menos um id em `ids`.",
+        )
+    if len(pedidos) > MAX_IDS_CONSULTA:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"No máximo {MAX_IDS_CONSULTA} ids em `ids`; para mais, use POST /por-ids.",
+        )
+    return pedidos
+
+
+def carregar_por_ids(
+    db: Session,
+    modelo,
+    ids: Sequence[int],
+    colunas: Optional[Sequence] = None,
+) -> Tuple[List, List[int]]:
+    """
+    Registros dos `ids` na ordem pedida e os ids que não existem.
+
+    Sem `colunas`, objetos do ORM; com `colunas` (ex.: `Projecao.colunas`),
+    linhas só com elas (precisam incluir o id).
+    """
+    pedidos = list(dict.fromkeys(ids))
+    encontrados: Dict[int, object] = {}
+    for bloco in em_blocos(pedidos):
+        for registro in db.query(*(colunas or [modelo])).filter(modelo.id.in_(bloco)):
+            encontrados[registro.id] = registro
+    registros = [encontrados[id_] for id_ in pedidos if id_ in encontrados]
+    nao_encontrados = [id_ for id_ in pedidos if id_ not in encontrados]
+    return registros, nao_encontrados
+
+
+def cabecalhos_por_ids(nao_encontrados: List[int]) -> Dict[str, str]:
+    return {CABECALHO_IDS_NAO_ENCONTRADOS: ",".join(map(str, nao_encontrados))} if nao_encontrados else {}
@@ -0,0 +1,121 @@
+# app/serializacao.py
+"""
+Projeção de colunas e serialização direta das respostas de leitura da API.
+
+No caminho normal a rota devolve objetos do ORM e o FastAPI valida cada um
+pelo `response_model` (`from_attributes`) antes de gerar o JSON; com 500
+itens isso custa mais do que a consulta. Com uma `Projecao`:
+
+- a consulta seleciona só as colunas da resposta, como tuplas (sem montar
+  objetos do ORM nem passar pelo identity map);
+- um TypeAdapter, compilado uma vez por esquema (ou subconjunto de campos),
+  gera o JSON direto em bytes, sem validar de novo o que saiu do banco.
+
+Usos:
+
+- listagens de contatos e negócios com CRM_LISTAGEM_RAPIDA=1: mesmo JSON
+  (campos, ordem e formatos) do caminho normal; o schema do OpenAPI
+  continua vindo do `response_model` da rota. Medição: `python -m
+  app.comandos benchmark-serializacao`;
+- parâmetro `campos=` das rotas de leitura (ex.: `campos=id,fase,valor_previsto`):
+  o SELECT e o JSON ficam só com os campos pedidos.
+"""
+import os
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Type
+
+from fastapi import HTTPException, Query, Response, status
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy import Float, Numeric, type_coerce
+from typing_extensions import TypedDict
+
+LISTAGEM_RAPIDA = os.getenv("CRM_LISTAGEM_RAPIDA", "").strip().lower() in ("1", "true", "sim", "yes")
+
+# Colunas lidas só para ETag e cursor (não vão no JSON se não forem pedidas)
+COLUNAS_DE_CONTROLE = ("id", "versao", "criado_em")
+
+
+class Projecao:
+    """
+    Colunas e serializador de um esquema de leitura, inteiro ou só com `campos`.
+    """
+
+    def __init__(self, modelo, esquema: Type[BaseModel], campos: Optional[Sequence[str]] = None):
+        self.modelo = modelo
+        self.tabela = modelo.__tablename__
+        self.campos = list(campos or esquema.model_fields)
+        extras = [campo for campo in COLUNAS_DE_CONTROLE if campo not in self.campos]
+        self.colunas = [_coluna(modelo, campo) for campo in [*self.campos, *extras]]
+        linha = TypedDict(
+            f"{esquema.__name__}Linha",
+            {campo: esquema.model_fields[campo].annotation for campo in self.campos},
+        )
+        self._adaptador_item = TypeAdapter(linha)
+        self._adaptador = TypeAdapter(List[linha])
+
+    def json(self, linhas: Sequence) -> bytes:
+        """
+        JSON da lista (mesmo formato do `response_model`), a partir das tuplas.
+        """
+        campos = self.campos
+        return self._adaptador.dump_json([dict(zip(campos, linha)) for linha in linhas])
+
+    def resposta(self, linhas: Sequence, cabecalhos: Dict[str, str]) -> Response:
+        return Response(content=self.json(linhas), media_type="application/json", headers=cabecalhos)
+
+    def resposta_item(self, linha, cabecalhos: Dict[str, str]) -> Response:
+        conteudo = self._adaptador_item.dump_json(dict(zip(self.campos, linha)))
+        return Response(content=conteudo, media_type="application/json", headers=cabecalhos)
+
+
+@lru_cache(maxsize=256)
+def projecao(modelo, esquema: Type[BaseModel], campos: Optional[Tuple[str, ...]] = None) -> Projecao:
+    """
+    `Projecao` do esquema inteiro (campos=None) ou de um subconjunto,
+    montada uma vez e reaproveitada (até 256 combinações de campos em memória).
+    """
+    return Projecao(modelo, esquema, campos)
+
+
+def parametro_campos(esquema: Type[BaseModel]) -> Callable[..., Optional[Tuple[str, ...]]]:
+    """
+    Dependência do parâmetro `campos` (lista separada por vírgulas) de uma rota
+    de leitura. Devolve os campos na ordem do esquema, ou None se não foi
+    informado. Campo desconhecido: 400.
+    """
+    disponiveis = list(esquema.model_fields)
+
+    def campos_pedidos(
+        campos: Optional[str] = Query(
+            default=None,
+            description=(
+                "Devolve só estes campos, separados por vírgula (ex.: id,fase,valor_previsto). "
+                f"Disponíveis: {', '.join(disponiveis)}."
+            ),
+        ),
+    ) -> Optional[Tuple[str, ...]]:
+        if campos is None:
+            return None
+        pedidos = {campo.strip() for campo in campos.split(",") if campo.strip()}
+        desconhecidos = sorted(pedidos - set(disponiveis))
+        if not pedidos:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Informe ao menos um campo em `campos`.",
+            )
+        if desconhecidos:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Campos inválidos: {', '.join(desconhecidos)}. Disponíveis: {', '.join(disponiveis)}.",
+            )
+        return tuple(campo for campo in disponiveis if campo in pedidos)
+
+    return campos_pedidos
+
+
+def _coluna(modelo, campo: str):
+    coluna = getattr(modelo, campo)
+    # Numeric vira Decimal no SQLAlchemy; o esquema expõe float, então lê direto como float
+    if isinstance(coluna.type, Numeric) and not isinstance(coluna.type, Float):
+        return type_coerce(coluna, Float).label(campo)
+    return coluna
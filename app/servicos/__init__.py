@@ -0,0 +1,2 @@
+# app/servicos/__init__.py
+# Regras de negócio e consultas agregadas usadas pelas rotas (painéis e API).
@@ -0,0 +1,234 @@
+# app/servicos/ao_vivo.py
+"""
+Atualizações ao vivo dos painéis /funil e /painel (Server-Sent Events).
+
+Os commits com eventos de alteração (app/servicos/eventos_saida.py) avisam
+este publicador, que junta as mudanças de `INTERVALO` em `INTERVALO` e,
+uma vez por lote de mudanças (não por tela aberta):
+
+- carrega os negócios/contatos alterados (uma consulta IN);
+- renderiza os cards/linhas com as mesmas macros das páginas;
+- recalcula os totais (mesmas funções dos painéis);
+- serializa a mensagem e a entrega na fila de cada tela conectada.
+
+Sem ninguém conectado em um canal, nada disso é feito para ele.
+
+Uma tela lenta demais (fila cheia) recebe "recarregar" e recarrega a página.
+Mais de `MAX_ITENS_MENSAGEM` alterados de uma vez (ex.: uma importação): a
+mensagem leva só os totais e `recarregar`, sem renderizar nada.
+As mudanças de outros processos (vários workers) não aparecem ao vivo.
+
+Configuração: CRM_AO_VIVO_INTERVALO_MS (padrão 300),
+CRM_AO_VIVO_MAX_ITENS (padrão 200) e
+CRM_AO_VIVO_PING (segundos entre comentários de keep-alive, padrão 15).
+"""
+import asyncio
+import json
+import logging
+import os
+from typing import AsyncIterator, Dict, List, Optional, Set
+
+from jinja2 import Environment
+
+from app.banco_dados import SessaoLocal
+from app.metricas import Contador, Medidor, registro
+from app.modelos.contato import Contato
+from app.modelos.negocio import Negocio
+from app.servicos.eventos_saida import ao_confirmar_eventos, valor_json
+from app.servicos.funil import FASES, numeros_do_funil, ordem_do_card
+from app.servicos.lotes import em_blocos
+from app.servicos.painel import numeros_do_painel
+from app.servicos.resumo_diario import totais_por_fase
+
+INTERVALO = int(os.getenv("CRM_AO_VIVO_INTERVALO_MS", "300")) / 1000
+INTERVALO_PING = float(os.getenv("CRM_AO_VIVO_PING", "15"))
+MAX_ITENS_MENSAGEM = int(os.getenv("CRM_AO_VIVO_MAX_ITENS", "200"))
+
+# Mensagens guardadas por tela antes de ela ser considerada lenta
+MAX_FILA_ASSINANTE = 64
+
+# Canal -> entidade cujos eventos o alimentam
+CANAIS = {"funil": "negocio", "painel": "contato"}
+
+RECARREGAR = b"event: recarregar\ndata: {}\n\n"
+PING = b": ping\n\n"
+# Reconexão do EventSource (ms) depois de uma queda
+INICIO = b"retry: 3000\n\n"
+
+logger = logging.getLogger("uvicorn.error")
+
+
+def mensagem_sse(canal: str, dados: Dict) -> bytes:
+    return f"event: {canal}\ndata: {json.dumps(dados, separators=(',', ':'))}\n\n".encode()
+
+
+class PainelAoVivo:
+    """
+    Pub/sub em memória (por processo) das mudanças dos painéis.
+    """
+
+    def __init__(self, intervalo: float = INTERVALO):
+        self.intervalo = intervalo
+        self._assinantes: Dict[str, Set[asyncio.Queue]] = {canal: set() for canal in CANAIS}
+        self._alterados: Dict[str, Set[int]] = {entidade: set() for entidade in CANAIS.values()}
+        self._sinal: Optional[asyncio.Event] = None
+        self._tarefa: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._ambiente: Optional[Environment] = None
+        ao_confirmar_eventos(self.receber)
+
+    async def iniciar(self, ambiente: Environment) -> None:
+        """
+        Liga o publicador; `ambiente` é o Jinja2 das páginas (macros dos cards/linhas).
+        """
+        self._ambiente = ambiente
+        self._loop = asyncio.get_running_loop()
+        self._sinal = asyncio.Event()
+        self._tarefa = asyncio.create_task(self._publicar())
+
+    async def parar(self) -> None:
+        self._loop = None
+        if self._tarefa:
+            self._tarefa.cancel()
+            await asyncio.gather(self._tarefa, return_exceptions=True)
+            self._tarefa = None
+        # Encerra as conexões ainda abertas
+        for filas in self._assinantes.values():
+            for fila in filas:
+                self._entregar(fila, None)
+
+    def assinantes(self, canal: str) -> int:
+        return len(self._assinantes[canal])
+
+    def receber(self, eventos: List[Dict]) -> None:
+        """
+        Chamado depois de um commit com eventos (de qualquer thread).
+        """
+        loop = self._loop
+        if loop is None or not any(self._assinantes.values()):
+            return
+        alterados = [(e["entidade"], e["entidade_id"]) for e in eventos if e["entidade"] in self._alterados]
+        if alterados:
+            loop.call_soon_threadsafe(self._acumular, alterados)
+
+    def _acumular(self, alterados) -> None:
+        for entidade, entidade_id in alterados:
+            self._alterados[entidade].add(entidade_id)
+        self._sinal.set()
+
+    async def transmitir(self, canal: str) -> AsyncIterator[bytes]:
+        """
+        Corpo da resposta text/event-stream de uma tela conectada ao canal.
+        """
+        fila: asyncio.Queue = asyncio.Queue(MAX_FILA_ASSINANTE)
+        self._assinantes[canal].add(fila)
+        try:
+            yield INICIO
+            while True:
+                try:
+                    mensagem = await asyncio.wait_for(fila.get(), INTERVALO_PING)
+                except asyncio.TimeoutError:
+                    mensagem = PING
+                if mensagem is None:
+                    return
+                yield mensagem
+        finally:
+            self._assinantes[canal].discard(fila)
+
+    @staticmethod
+    def _entregar(fila: asyncio.Queue, mensagem: Optional[bytes]) -> None:
+        try:
+            fila.put_nowait(mensagem)
+        except asyncio.QueueFull:
+            # Tela lenta: descarta o que ela não leu e pede para recarregar a página
+            while not fila.empty():
+                fila.get_nowait()
+            fila.put_nowait(RECARREGAR if mensagem is not None else None)
+
+    async def _publicar(self) -> None:
+        while True:
+            await self._sinal.wait()
+            # Junta as mudanças próximas (ex.: uma importação) em uma só mensagem
+            await asyncio.sleep(self.intervalo)
+            self._sinal.clear()
+            alterados = self._alterados
+            self._alterados = {entidade: set() for entidade in CANAIS.values()}
+
+            canais = [
+                canal for canal, entidade in CANAIS.items()
+                if alterados[entidade] and self._assinantes[canal]
+            ]
+            if not canais:
+                continue
+            try:
+                mensagens = await asyncio.to_thread(self._montar, canais, alterados)
+            except Exception:
+                logger.exception("Falha ao montar a atualização ao vivo dos painéis")
+                mensagens = {canal: RECARREGAR for canal in canais}
+
+            for canal, mensagem in mensagens.items():
+                for fila in list(self._assinantes[canal]):
+                    self._entregar(fila, mensagem)
+                PUBLICACOES.somar(canal)
+
+    def _montar(self, canais: List[str], alterados: Dict[str, Set[int]]) -> Dict[str, bytes]:
+        mensagens = {}
+        with SessaoLocal() as db:
+            if "funil" in canais:
+                totais = numeros_do_funil(totais_por_fase(db))
+                dados = {"totais": {chave: valor_json(valor) for chave, valor in totais.items()}}
+                if len(alterados["negocio"]) > MAX_ITENS_MENSAGEM:
+                    dados["recarregar"] = True
+                else:
+                    card = self._ambiente.get_template("_cards_funil.html").module.card
+                    negocios = _por_id(db, Negocio, alterados["negocio"])
+                    # Fase fora das colunas do funil: o card sai da tela (como se excluído)
+                    dados["cards"] = [
+                        {"id": negocio_id, "remover": True} if negocio is None or negocio.fase not in FASES
+                        else {
+                            "id": negocio_id,
+                            "fase": negocio.fase,
+                            "ordem": ordem_do_card(negocio),
+                            "html": str(card(negocio, negocio.fase)),
+                        }
+                        for negocio_id, negocio in negocios.items()
+                    ]
+                mensagens["funil"] = mensagem_sse("funil", dados)
+            if "painel" in canais:
+                dados = {"totais": numeros_do_painel(db)}
+                if len(alterados["contato"]) > MAX_ITENS_MENSAGEM:
+                    dados["recarregar"] = True
+                else:
+                    linha = self._ambiente.get_template("_linha_contato.html").module.linha
+                    contatos = _por_id(db, Contato, alterados["contato"])
+                    dados["linhas"] = [
+                        {"id": contato_id, "remover": True} if contato is None
+                        else {"id": contato_id, "html": str(linha(contato))}
+                        for contato_id, contato in contatos.items()
+                    ]
+                mensagens["painel"] = mensagem_sse("painel", dados)
+        return mensagens
+
+
+def _por_id(db, modelo, ids: Set[int]) -> Dict[int, Optional[object]]:
+    # Em ordem de id: o mais novo fica por último e é inserido por cima na tela
+    encontrados = {}
+    for bloco in em_blocos(sorted(ids)):
+        for objeto in db.query(modelo).filter(modelo.id.in_(bloco)):
+            encontrados[objeto.id] = objeto
+    return {objeto_id: encontrados.get(objeto_id) for objeto_id in sorted(ids)}
+
+
+painel_ao_vivo = PainelAoVivo()
+
+PUBLICACOES = registro.registrar(Contador(
+    "crm_ao_vivo_publicacoes_total",
+    "Atualizações ao vivo publicadas (uma por lote de mudanças, para todas as telas), por canal.",
+    ("canal",),
+))
+registro.registrar(Medidor(
+    "crm_ao_vivo_assinantes",
+    "Telas conectadas às atualizações ao vivo, por canal.",
+    ("canal",),
+    coletar=lambda: [((canal,), painel_ao_vivo.assinantes(canal)) for canal in CANAIS],
+))
@@ -0,0 +1,276 @@
+# app/servicos/busca_contatos.py
+"""
+Busca de contatos por nome, e-mail, telefone e empresa.
+
+SQLite: tabela virtual FTS5 `contatos_busca`, mantida por triggers em
+`contatos` (INSERT/UPDATE/DELETE), com:
+- `remove_diacritics`: "joao" encontra "João" (e vice-versa);
+- índices de prefixo de 1 a 6 caracteres: a busca enquanto se digita não
+  percorre o vocabulário inteiro;
+- o telefone é indexado também só com os dígitos, com e sem o código do
+  país ("+55 (92) 98765-4321" é encontrado por "9298765");
+- ordenação por relevância entre os `MAX_CANDIDATOS` contatos mais
+  recentes que casam com a busca (ver `relevancia`). O bm25 do FTS5 conta
+  todas as linhas que casam com cada termo: com "a" ou "929" em 1 milhão
+  de contatos, isso sozinho passa de 30 ms.
+
+PostgreSQL: LIKE sobre lower() sem acentos (translate), com índice de
+trigramas quando a extensão pg_trgm estiver disponível, e a mesma ordenação
+por relevância.
+
+SQLite sem FTS5 (e outros bancos): LIKE sobre lower(), sem índice e sem
+ignorar acentos (o SQLite não tem translate()).
+"""
+import re
+import unicodedata
+from functools import lru_cache
+from typing import List
+
+from sqlalchemy import and_, func, literal_column, or_, select, table, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.modelos.contato import Contato
+
+TABELA_BUSCA = "contatos_busca"
+LIMITE_PADRAO = 20
+MAX_CANDIDATOS = 200
+
+# Peso de cada coluna na relevância (um termo vale o maior peso entre as colunas em que aparece)
+PESOS_COLUNAS = {"nome": 10, "email": 4, "empresa": 3, "telefone": 2}
+# Bônus quando o nome começa pelo primeiro termo ("ana" -> "Ana Silva" antes de "Mariana Ana")
+BONUS_INICIO_NOME = 5
+
+# Telefone só com dígitos, em SQL (o SQLite não tem substituição por regex)
+_DIGITOS_SQL = "replace(replace(replace(replace(replace(replace(coalesce({c}.telefone, ''), ' ', ''), '-', ''), '(', ''), ')', ''), '+', ''), '.', '')"
+
+
+def _telefone_indexado(registro: str) -> str:
+    # Telefone como digitado + só os dígitos + os dígitos sem o 55 do Brasil
+    digitos = _DIGITOS_SQL.format(c=registro)
+    return (
+        f"coalesce({registro}.telefone, '') || ' ' || {digitos} || ' ' || "
+        f"CASE WHEN {digitos} LIKE '55%' AND length({digitos}) >= 12 THEN substr({digitos}, 3) ELSE '' END"
+    )
+
+
+def _valores(registro: str) -> str:
+    return (
+        f"{registro}.id, {registro}.nome, {registro}.email, "
+        f"{_telefone_indexado(registro)}, {registro}.empresa"
+    )
+
+
+# Tabela sem conteúdo próprio (content=''): guarda só o índice; as linhas
+# vêm de `contatos` pelo rowid (= contatos.id)
+DDL_SQLITE = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {TABELA_BUSCA} USING fts5(
+        nome, email, telefone, empresa,
+        content='',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='1 2 3 4 5 6'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS contatos_busca_ai AFTER INSERT ON contatos BEGIN
+        INSERT INTO {TABELA_BUSCA}(rowid, nome, email, telefone, empresa)
+        VALUES ({_valores('new')});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS contatos_busca_ad AFTER DELETE ON contatos BEGIN
+        INSERT INTO {TABELA_BUSCA}({TABELA_BUSCA}, rowid, nome, email, telefone, empresa)
+        VALUES ('delete', {_valores('old')});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS contatos_busca_au AFTER UPDATE OF nome, email, telefone, empresa ON contatos BEGIN
+        INSERT INTO {TABELA_BUSCA}({TABELA_BUSCA}, rowid, nome, email, telefone, empresa)
+        VALUES ('delete', {_valores('old')});
+        INSERT INTO {TABELA_BUSCA}(rowid, nome, email, telefone, empresa)
+        VALUES ({_valores('new')});
+    END
+    """,
+]
+
+# Letras acentuadas -> sem acento (translate() do PostgreSQL)
+_ACENTUADAS = "áàâãäéèêëíìîïóòôõöúùûüçñ"
+_SEM_ACENTO = "aaaaaeeeeiiiiooooouuuucn"
+COLUNAS_BUSCA = ("nome", "email", "telefone", "empresa")
+
+
+def _sem_acento_sql(coluna, dialeto: str):
+    minusculas = func.lower(func.coalesce(coluna, ""))
+    if dialeto != "postgresql":
+        return minusculas
+    return func.translate(minusculas, _ACENTUADAS, _SEM_ACENTO)
+
+
+def _indices_trigramas_postgres() -> List[str]:
+    return [
+        f"CREATE INDEX IF NOT EXISTS ix_contatos_busca_{coluna} ON contatos "
+        f"USING gin ((translate(lower(coalesce({coluna}, '')), '{_ACENTUADAS}', '{_SEM_ACENTO}')) gin_trgm_ops)"
+        for coluna in COLUNAS_BUSCA
+    ]
+
+
+def fts5_disponivel(engine: Engine) -> bool:
+    """
+    O SQLite em uso foi compilado com FTS5?
+    """
+    if engine.dialect.name != "sqlite":
+        return False
+    with engine.connect() as conexao:
+        opcoes = {linha[0] for linha in conexao.exec_driver_sql("PRAGMA compile_options")}
+    return "ENABLE_FTS5" in opcoes
+
+
+def garantir_indice_busca(engine: Engine) -> List[str]:
+    """
+    Cria o índice de busca (e o preenche) se ainda não existir.
+    Retorna o que foi criado, no formato de `atualizar_esquema`.
+    """
+    if engine.dialect.name == "postgresql":
+        try:
+            with engine.begin() as conexao:
+                conexao.exec_driver_sql("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+                for ddl in _indices_trigramas_postgres():
+                    conexao.exec_driver_sql(ddl)
+        except Exception:  # sem permissão para criar a extensão: a busca funciona sem índice
+            pass
+        return []
+
+    if not fts5_disponivel(engine):
+        return []
+
+    with engine.begin() as conexao:
+        existe = conexao.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :nome"),
+            {"nome": TABELA_BUSCA},
+        ).first()
+        for ddl in DDL_SQLITE:
+            conexao.exec_driver_sql(ddl)
+        if existe:
+            return []
+        conexao.exec_driver_sql(
+            f"INSERT INTO {TABELA_BUSCA}(rowid, nome, email, telefone, empresa) "
+            f"SELECT {_valores('contatos')} FROM contatos"
+        )
+    return [f"busca {TABELA_BUSCA}"]
+
+
+def termos_da_busca(termo: str) -> List[str]:
+    """
+    Palavras da busca, sem acentos e sem pontuação (cada uma vira um prefixo).
+    """
+    sem_acento = unicodedata.normalize("NFKD", termo).encode("ascii", "ignore").decode()
+    return re.findall(r"[0-9a-z]+", sem_acento.lower())
+
+
+@lru_cache(maxsize=None)
+def _usa_fts5(engine: Engine) -> bool:
+    # Conferido uma vez por engine (a tabela é criada por `atualizar_esquema`, ao iniciar)
+    if engine.dialect.name != "sqlite":
+        return False
+    with engine.connect() as conexao:
+        return bool(
+            conexao.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :nome"),
+                {"nome": TABELA_BUSCA},
+            ).first()
+        )
+
+
+def _palavras(texto) -> List[str]:
+    return termos_da_busca(texto or "")
+
+
+def _palavras_telefone(telefone) -> List[str]:
+    # As mesmas variações indexadas no FTS5: pedaços, só dígitos, sem o 55
+    palavras = _palavras(telefone)
+    digitos = "".join(re.findall(r"[0-9]", telefone or ""))
+    palavras.append(digitos)
+    if digitos.startswith("55") and len(digitos) >= 12:
+        palavras.append(digitos[2:])
+    return palavras
+
+
+def relevancia(candidato, termos: List[str]) -> int:
+    """
+    Pontuação do contato para a busca: soma, por termo, do peso da coluna
+    mais importante em que alguma palavra começa pelo termo.
+    `candidato` tem nome, email, telefone e empresa (Contato ou linha).
+    """
+    palavras = {
+        "nome": _palavras(candidato.nome),
+        "email": _palavras(candidato.email),
+        "empresa": _palavras(candidato.empresa),
+        "telefone": _palavras_telefone(candidato.telefone),
+    }
+    pontos = 0
+    for termo in termos:
+        pontos += max(
+            (
+                peso
+                for coluna, peso in PESOS_COLUNAS.items()
+                if any(palavra.startswith(termo) for palavra in palavras[coluna])
+            ),
+            default=0,
+        )
+    if palavras["nome"] and palavras["nome"][0].startswith(termos[0]):
+        pontos += BONUS_INICIO_NOME
+    return pontos
+
+
+def _candidatos(db: Session, termos: List[str], quantidade: int) -> list:
+    """
+    Os `quantidade` contatos mais recentes que contêm todos os termos
+    (só as colunas da busca: o registro completo é lido só para os escolhidos).
+    """
+    colunas_leves = (Contato.id, Contato.nome, Contato.email, Contato.telefone, Contato.empresa)
+
+    engine = db.get_bind()
+    if _usa_fts5(engine):
+        ids = (
+            select(literal_column("rowid"))
+            .select_from(table(TABELA_BUSCA))
+            .where(text(f"{TABELA_BUSCA} MATCH :consulta"))
+            .order_by(literal_column("rowid").desc())
+            .limit(quantidade)
+        )
+        consulta = " ".join(f'"{t}"*' for t in termos)
+        return db.execute(
+            select(*colunas_leves).where(Contato.id.in_(ids)),
+            {"consulta": consulta},
+        ).all()
+
+    # LIKE (sem acentos no PostgreSQL): cada termo em alguma das colunas
+    colunas = [_sem_acento_sql(getattr(Contato, c), engine.dialect.name) for c in COLUNAS_BUSCA]
+    condicoes = [or_(*(coluna.like(f"%{t}%") for coluna in colunas)) for t in termos]
+    return db.execute(
+        select(*colunas_leves)
+        .where(and_(*condicoes))
+        .order_by(Contato.id.desc())
+        .limit(quantidade)
+    ).all()
+
+
+def buscar_contatos(db: Session, termo: str, limite: int = LIMITE_PADRAO) -> List[Contato]:
+    """
+    Contatos que contêm todas as palavras da busca (como prefixo de alguma
+    palavra do nome, e-mail, telefone ou empresa), mais relevantes primeiro
+    (empate: mais recentes primeiro).
+    """
+    termos = termos_da_busca(termo)
+    if not termos:
+        return []
+
+    candidatos = _candidatos(db, termos, max(MAX_CANDIDATOS, limite))
+    candidatos.sort(key=lambda candidato: (-relevancia(candidato, termos), -candidato.id))
+    ids = [candidato.id for candidato in candidatos[:limite]]
+    if not ids:
+        return []
+
+    por_id = {contato.id: contato for contato in db.query(Contato).filter(Contato.id.in_(ids))}
+    return [por_id[i] for i in ids if i in por_id]
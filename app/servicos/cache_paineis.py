@@ -0,0 +1,214 @@
+# app/servicos/cache_paineis.py
+"""
+Cache dos contextos calculados dos painéis (/painel, /funil, /indicadores).
+
+- Chave: rota + parâmetros (ex.: ("indicadores", inicio, fim)).
+- TTL e limite de itens (LRU): o item menos usado sai primeiro.
+- Escritas confirmadas (commit) de contatos, negócios e funcionários
+  invalidam tudo, mas a cópia antiga continua sendo servida enquanto UM
+  recálculo roda em segundo plano (stale-while-revalidate).
+- Sem cópia nenhuma, telas pedindo a mesma chave ao mesmo tempo esperam
+  um único cálculo em vez de cada uma calcular o seu.
+
+Configuração: CRM_CACHE_TTL (segundos, padrão 30; 0 desliga o cache) e
+CRM_CACHE_MAX_ITENS (padrão 128).
+"""
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from itertools import chain
+from typing import Callable, Dict, Hashable
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.modelos.funcionario import Funcionario
+from app.servicos.eventos_saida import ao_confirmar_eventos
+
+logger = logging.getLogger("uvicorn.error")
+
+TTL_PADRAO = float(os.getenv("CRM_CACHE_TTL", "30"))
+MAX_ITENS_PADRAO = int(os.getenv("CRM_CACHE_MAX_ITENS", "128"))
+
+
+class _Entrada:
+    __slots__ = ("valor", "calculado_em", "geracao", "recalculando")
+
+    def __init__(self, valor: Dict, geracao: int):
+        self.valor = valor
+        self.calculado_em = time.monotonic()
+        self.geracao = geracao
+        self.recalculando = False
+
+
+class CachePaineis:
+    """
+    Cache em memória (por processo) dos contextos dos painéis.
+    """
+
+    def __init__(self, ttl: float = TTL_PADRAO, max_itens: int = MAX_ITENS_PADRAO):
+        self.ttl = ttl
+        self.max_itens = max_itens
+        self._itens: "OrderedDict[Hashable, _Entrada]" = OrderedDict()
+        self._em_calculo: Dict[Hashable, threading.Event] = {}
+        self._geracao = 0
+        self._trava = threading.Lock()
+        self._contadores = {
+            "acertos": 0,
+            "falhas": 0,
+            "obsoletos_servidos": 0,
+            "recalculos": 0,
+            "invalidacoes": 0,
+            "descartes_lru": 0,
+        }
+
+    def _fresca(self, entrada: _Entrada) -> bool:
+        return (
+            entrada.geracao == self._geracao
+            and time.monotonic() - entrada.calculado_em < self.ttl
+        )
+
+    def _guardar(self, chave: Hashable, valor: Dict, geracao: int) -> None:
+        # Chamado com a trava
+        self._itens[chave] = _Entrada(valor, geracao)
+        self._itens.move_to_end(chave)
+        while len(self._itens) > self.max_itens:
+            self._itens.popitem(last=False)
+            self._contadores["descartes_lru"] += 1
+
+    def _recalcular(self, chave: Hashable, calcular: Callable[[], Dict], geracao: int) -> None:
+        try:
+            valor = calcular()
+        except Exception:
+            logger.exception("Falha ao recalcular o painel %s", chave)
+            with self._trava:
+                entrada = self._itens.get(chave)
+                if entrada:
+                    entrada.recalculando = False
+            return
+        with self._trava:
+            self._guardar(chave, valor, geracao)
+
+    def obter(self, chave: Hashable, calcular: Callable[[], Dict]) -> Dict:
+        """
+        Contexto da `chave`, calculado por `calcular()` só quando preciso.
+        `calcular` deve abrir a própria sessão: pode rodar em outra thread.
+        """
+        if self.ttl <= 0:
+            return calcular()
+
+        while True:
+            with self._trava:
+                geracao = self._geracao
+                entrada = self._itens.get(chave)
+
+                if entrada is not None:
+                    self._itens.move_to_end(chave)
+                    if self._fresca(entrada):
+                        self._contadores["acertos"] += 1
+                        return entrada.valor
+
+                    # Obsoleta: devolve a cópia atual e dispara um único recálculo
+                    self._contadores["obsoletos_servidos"] += 1
+                    if not entrada.recalculando:
+                        entrada.recalculando = True
+                        self._contadores["recalculos"] += 1
+                        threading.Thread(
+                            target=self._recalcular,
+                            args=(chave, calcular, geracao),
+                            daemon=True,
+                        ).start()
+                    return entrada.valor
+
+                pronto = self._em_calculo.get(chave)
+                if pronto is None:
+                    pronto = self._em_calculo[chave] = threading.Event()
+                    self._contadores["falhas"] += 1
+                    break
+
+            # Outra requisição já está calculando esta chave: espera e tenta de novo
+            pronto.wait()
+
+        try:
+            valor = calcular()
+            with self._trava:
+                self._guardar(chave, valor, geracao)
+            return valor
+        finally:
+            with self._trava:
+                self._em_calculo.pop(chave, None)
+            pronto.set()
+
+    def invalidar(self) -> None:
+        """
+        Marca todos os itens como obsoletos (continuam servíveis até o recálculo).
+        """
+        with self._trava:
+            self._geracao += 1
+            self._contadores["invalidacoes"] += 1
+
+    def limpar(self) -> None:
+        with self._trava:
+            self._itens.clear()
+
+    def estatisticas(self) -> Dict:
+        with self._trava:
+            consultas = self._contadores["acertos"] + self._contadores["falhas"] + self._contadores["obsoletos_servidos"]
+            return {
+                **self._contadores,
+                "taxa_acertos": round(
+                    (self._contadores["acertos"] + self._contadores["obsoletos_servidos"]) / consultas, 4
+                ) if consultas else 0.0,
+                "itens": len(self._itens),
+                "max_itens": self.max_itens,
+                "ttl_segundos": self.ttl,
+            }
+
+
+# Instância usada pela aplicação
+cache_paineis = CachePaineis()
+
+
+def com_sessao_propria(calcular: Callable, *args) -> Callable[[], Dict]:
+    """
+    Roda `calcular(db, *args)` com uma sessão própria: o cache pode chamar o
+    cálculo em outra thread, depois que a requisição terminou.
+    """
+    from app.banco_dados import SessaoLocal
+
+    def executar():
+        with SessaoLocal() as db:
+            return calcular(db, *args)
+    return executar
+
+
+def invalidar_paineis() -> None:
+    """
+    Chamado depois de escritas que mudam os números dos painéis.
+    """
+    cache_paineis.invalidar()
+
+
+# Contatos e negócios (ORM ou em massa): o commit que grava os eventos de
+# alteração avisa; um POST que só lê ou só enfileira não invalida nada
+ao_confirmar_eventos(lambda _eventos: invalidar_paineis())
+
+
+# Funcionários (nomes e ativos do /indicadores) não têm eventos: conferidos no flush
+@event.listens_for(Session, "after_flush")
+def _marcar_funcionarios(sessao: Session, _contexto) -> None:
+    if any(isinstance(objeto, Funcionario) for objeto in chain(sessao.new, sessao.dirty, sessao.deleted)):
+        sessao.info["paineis_obsoletos"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidar_funcionarios(sessao: Session) -> None:
+    if sessao.info.pop("paineis_obsoletos", False):
+        invalidar_paineis()
+
+
+@event.listens_for(Session, "after_rollback")
+def _desmarcar_funcionarios(sessao: Session) -> None:
+    sessao.info.pop("paineis_obsoletos", None)
@@ -0,0 +1,281 @@
+# app/servicos/dados_sinteticos.py
+"""
+Gerador de dados sintéticos (funcionários, contatos e negócios).
+
+- Reprodutível: a mesma `semente` gera exatamente os mesmos dados.
+- Em massa: INSERTs com vários VALUES em blocos (sem ORM linha a linha),
+  com ids definidos aqui, sem precisar ler nada de volta do banco (no
+  PostgreSQL a sequência de cada tabela é acertada no fim da carga).
+- Distribuições realistas:
+  - sazonalidade: menos negócios no fim de semana, ondas ao longo do ano
+    e crescimento ao longo do período;
+  - carga desigual entre vendedores (poucos concentram a maioria);
+  - contatos recorrentes (alguns têm vários negócios);
+  - pesos por fase e origem, valores em distribuição log-normal;
+  - ciclo de fechamento log-normal (perdidos fecham mais rápido).
+
+As linhas são dicionários com os nomes das colunas da tabela: coluna
+inexistente faz o INSERT falhar em vez de ser ignorada em silêncio.
+"""
+import math
+import random
+from datetime import date, datetime, time, timedelta
+from itertools import accumulate
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session
+
+from app.modelos.contato import Contato
+from app.modelos.funcionario import Funcionario
+from app.modelos.negocio import Negocio
+from app.modelos.resumo_diario import ResumoNegocioDiario
+from app.servicos.cache_paineis import invalidar_paineis
+from app.servicos.resumo_diario import reconstruir_resumo
+
+# Linhas por INSERT (e por commit)
+TAMANHO_BLOCO = 10000
+
+SEMENTE_PADRAO = 42
+
+FASES = {"novo": 0.35, "em_proposta": 0.30, "fechado_ganho": 0.25, "fechado_perdido": 0.10}
+ORIGENS = {"whatsapp": 0.32, "site": 0.22, "instagram": 0.20, "indicação": 0.16, "ligação": 0.10}
+SITUACOES = {"lead": 0.6, "cliente": 0.3, "inativo": 0.1}
+PROBABILIDADES = {
+    "novo": [10, 20, 30, 40],
+    "em_proposta": [40, 50, 60, 70],
+    "fechado_ganho": [80, 90, 100],
+    "fechado_perdido": [5, 10, 15],
+}
+
+PRIMEIROS_NOMES = [
+    "Ana", "Bruno", "Carla", "Daniel", "Eduarda", "Felipe", "Gabriela", "Henrique",
+    "Isabela", "João", "Larissa", "Marcos", "Natalia", "Otávio", "Paula", "Carlos",
+    "Fernanda", "Rodrigo", "Juliana", "Thiago", "Patrícia", "André", "Luciana",
+    "Vinícius", "Marta", "Rafael", "Camila", "Diego", "Bianca", "Gustavo",
+]
+SOBRENOMES = [
+    "Silva", "Souza", "Oliveira", "Pereira", "Costa", "Almeida", "Gomes",
+    "Ribeiro", "Carvalho", "Santos", "Lima", "Araújo", "Barbosa", "Rocha",
+]
+CARGOS = ["Vendedor", "Closer", "SDR", "Gestor Comercial", "Pré-vendas"]
+EMPRESAS = [
+    "Tech Manaus", "Inova Digital", "Amazon Solutions", "Comercial Rio Negro",
+    "Studio Criar", "Global Contábil", "Impacto Vendas", "Norte Serviços",
+    "Amazônia Solar", "Ponto Certo", "Vale Logística", "Nova Era Saúde",
+]
+
+
+def _escolher(rng: random.Random, pesos: Dict[str, float]) -> str:
+    return rng.choices(list(pesos), weights=list(pesos.values()))[0]
+
+
+def _pesos_dias(hoje: date, dias_passado: int) -> List[float]:
+    """
+    Peso de cada dia do período (índice 0 = hoje - dias_passado).
+    """
+    pesos = []
+    for i in range(dias_passado + 1):
+        dia = hoje - timedelta(days=dias_passado - i)
+        peso = 0.25 if dia.weekday() >= 5 else 1.0                       # fim de semana
+        peso *= 1 + 0.2 * math.sin(2 * math.pi * dia.timetuple().tm_yday / 365.25)  # ano
+        peso *= 0.7 + 0.6 * i / max(dias_passado, 1)                     # crescimento
+        pesos.append(peso)
+    return pesos
+
+
+def _horario_comercial(rng: random.Random, dia: date) -> datetime:
+    return datetime.combine(dia, time(rng.randint(8, 18), rng.randint(0, 59), rng.randint(0, 59)))
+
+
+def _proximo_id(db: Session, coluna) -> int:
+    return (db.scalar(select(func.max(coluna))) or 0) + 1
+
+
+def _acertar_sequencia(db: Session, coluna) -> None:
+    """
+    Ids explícitos não avançam a sequência do PostgreSQL: sem isso, o próximo
+    INSERT da API pegaria um id já usado. Aponta a sequência para max(id) + 1.
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return
+    proximo = select(func.coalesce(func.max(coluna), 0) + 1).scalar_subquery()
+    db.execute(select(func.setval(
+        func.pg_get_serial_sequence(coluna.table.name, coluna.name), proximo, False
+    )))
+    db.commit()
+
+
+def _inserir_em_blocos(db: Session, modelo, linhas, progresso, rotulo: str) -> int:
+    """
+    Insere as linhas (um gerador) em blocos de `TAMANHO_BLOCO`, com commit por bloco.
+    Usa o INSERT do Core (executemany direto no driver, sem passar pelo ORM).
+    """
+    tabela = modelo.__table__
+    total = 0
+    bloco = []
+    for linha in linhas:
+        bloco.append(linha)
+        if len(bloco) >= TAMANHO_BLOCO:
+            db.execute(insert(tabela), bloco)
+            db.commit()
+            total += len(bloco)
+            bloco = []
+            if progresso:
+                progresso(rotulo, total)
+    if bloco:
+        db.execute(insert(tabela), bloco)
+        db.commit()
+        total += len(bloco)
+        if progresso:
+            progresso(rotulo, total)
+    _acertar_sequencia(db, tabela.c.id)
+    return total
+
+
+def gerar_dados(
+    db: Session,
+    semente: int = SEMENTE_PADRAO,
+    qtd_funcionarios: int = 5,
+    qtd_contatos: int = 40,
+    qtd_negocios: int = 120,
+    dias_passado: int = 60,
+    limpar: bool = True,
+    hoje: Optional[date] = None,
+    progresso: Optional[Callable[[str, int], None]] = None,
+) -> Dict:
+    """
+    Gera e insere os dados. Retorna um resumo do que foi criado.
+
+    `progresso(rotulo, linhas_ate_agora)` é chamado a cada bloco inserido.
+    `hoje` fixa a data de referência (para repetir um conjunto idêntico em outro dia).
+    """
+    rng = random.Random(semente)
+    hoje = hoje or date.today()
+    dias_passado = max(dias_passado, 1)
+
+    if limpar:
+        db.query(ResumoNegocioDiario).delete(synchronize_session=False)
+        db.query(Negocio).delete(synchronize_session=False)
+        db.query(Contato).delete(synchronize_session=False)
+        db.query(Funcionario).delete(synchronize_session=False)
+        db.commit()
+
+    # 1) Funcionários
+    primeiro_funcionario = _proximo_id(db, Funcionario.id)
+    ids_funcionarios = list(range(primeiro_funcionario, primeiro_funcionario + qtd_funcionarios))
+    _inserir_em_blocos(
+        db,
+        Funcionario,
+        (
+            {
+                "id": id_,
+                "nome": f"{rng.choice(PRIMEIROS_NOMES)} {rng.choice(SOBRENOMES)}",
+                "email": f"vendedor{id_}@empresa.com",
+                "cargo": rng.choice(CARGOS),
+                "ativo": True,
+            }
+            for id_ in ids_funcionarios
+        ),
+        progresso,
+        "funcionarios",
+    )
+
+    # Carga desigual: o k-ésimo vendedor recebe ~1/k^1.1 dos negócios (Zipf)
+    rng.shuffle(ids_funcionarios)
+    acumulado_vendedores = list(accumulate(1 / (k + 1) ** 1.1 for k in range(len(ids_funcionarios))))
+
+    pesos_dias = list(accumulate(_pesos_dias(hoje, dias_passado)))
+    inicio_periodo = hoje - timedelta(days=dias_passado)
+
+    def sortear_dia() -> date:
+        indice = rng.choices(range(len(pesos_dias)), cum_weights=pesos_dias)[0]
+        return inicio_periodo + timedelta(days=indice)
+
+    # 2) Contatos
+    primeiro_contato = _proximo_id(db, Contato.id)
+    empresas_contatos: List[str] = []
+
+    def linhas_contatos():
+        for id_ in range(primeiro_contato, primeiro_contato + qtd_contatos):
+            nome = f"{rng.choice(PRIMEIROS_NOMES)} {rng.choice(SOBRENOMES)}"
+            empresa = rng.choice(EMPRESAS)
+            empresas_contatos.append(empresa)
+            yield {
+                "id": id_,
+                "nome": nome,
+                "email": f"{nome.split()[0].lower()}{id_}@{empresa.split()[0].lower()}.com",
+                "telefone": f"929{rng.randint(0, 99999999):08d}",
+                "empresa": empresa,
+                "origem": _escolher(rng, ORIGENS),
+                "situacao": _escolher(rng, SITUACOES),
+                "criado_em": _horario_comercial(rng, sortear_dia()),
+            }
+
+    _inserir_em_blocos(db, Contato, linhas_contatos(), progresso, "contatos")
+
+    # 3) Negócios
+    primeiro_negocio = _proximo_id(db, Negocio.id)
+    contagem = {"fechado_ganho": 0, "fechado_perdido": 0}
+
+    def linhas_negocios():
+        if not qtd_contatos or not ids_funcionarios:
+            return
+        for id_ in range(primeiro_negocio, primeiro_negocio + qtd_negocios):
+            # Contatos recorrentes: índices baixos saem mais vezes
+            indice_contato = int(qtd_contatos * rng.random() ** 2)
+            responsavel_id = rng.choices(ids_funcionarios, cum_weights=acumulado_vendedores)[0]
+
+            dia_criacao = sortear_dia()
+            criado_em = _horario_comercial(rng, dia_criacao)
+            fase = _escolher(rng, FASES)
+            valor = round(min(max(rng.lognormvariate(math.log(5000), 0.9), 300), 500000), 2)
+
+            data_fechamento = None
+            atualizado_em = None
+            if fase in contagem:
+                contagem[fase] += 1
+                mediana = 21 if fase == "fechado_ganho" else 10
+                ciclo = min(int(rng.lognormvariate(math.log(mediana), 0.7)), 180)
+                data_fechamento = min(dia_criacao + timedelta(days=ciclo), hoje)
+                atualizado_em = _horario_comercial(rng, data_fechamento)
+            elif fase == "em_proposta":
+                dias_ate_hoje = (hoje - dia_criacao).days
+                atualizado_em = _horario_comercial(
+                    rng, dia_criacao + timedelta(days=rng.randint(0, dias_ate_hoje))
+                )
+            if atualizado_em is not None and atualizado_em < criado_em:
+                atualizado_em = criado_em
+
+            yield {
+                "id": id_,
+                "titulo": f"Projeto #{id_} - {empresas_contatos[indice_contato]}",
+                "descricao": "Negócio gerado automaticamente para testes.",
+                "valor_previsto": valor,
+                "fase": fase,
+                "origem": _escolher(rng, ORIGENS),
+                "probabilidade": rng.choice(PROBABILIDADES[fase]),
+                "contato_id": primeiro_contato + indice_contato,
+                "responsavel_id": responsavel_id,
+                "data_prevista_fechamento": dia_criacao + timedelta(days=rng.randint(5, 45)),
+                "data_fechamento": data_fechamento,
+                "criado_em": criado_em,
+                "atualizado_em": atualizado_em,
+            }
+
+    total_negocios = _inserir_em_blocos(db, Negocio, linhas_negocios(), progresso, "negocios")
+
+    # 4) Resumo diário recalculado de uma vez (mais rápido que somar linha a linha)
+    reconstruir_resumo(db)
+    db.commit()
+
+    # Inserção em massa sem eventos de alteração: os painéis não são avisados sozinhos
+    invalidar_paineis()
+
+    return {
+        "funcionarios_criados": qtd_funcionarios,
+        "contatos_criados": qtd_contatos,
+        "negocios_criados": total_negocios,
+        "negocios_ganhos": contagem["fechado_ganho"],
+        "negocios_perdidos": contagem["fechado_perdido"],
+    }
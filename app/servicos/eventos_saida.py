@@ -0,0 +1,165 @@
+# app/servicos/eventos_saida.py
+"""
+Eventos de alteração de contatos e negócios (outbox transacional).
+
+Toda criação, atualização e exclusão de `Contato`/`Negocio` feita pelo ORM
+(rotas síncronas e assíncronas) vira uma linha em `eventos_saida` na mesma
+transação, por meio dos eventos de flush da Session: nenhuma rota precisa
+lembrar de registrar nada. As escritas em massa do Core (rotas de lote,
+ingestão) chamam `registrar_eventos` diretamente.
+
+Quem entrega os eventos aos webhooks é app/servicos/webhooks.py.
+"""
+import zlib
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Callable, Dict, Iterable, List, Optional
+
+from sqlalchemy import event, insert, inspect
+from sqlalchemy.orm import Session
+
+from app.modelos.contato import Contato
+from app.modelos.evento_saida import EventoSaida
+from app.modelos.negocio import Negocio
+
+# Partições fixas (não mude com eventos pendentes: a partição é gravada no evento)
+NUM_PARTICOES = 16
+
+# Entidades com eventos
+ENTIDADES = {Contato: "contato", Negocio: "negocio"}
+
+# Colunas internas que não vão nos eventos
+COLUNAS_IGNORADAS = {"versao", "atualizado_em", "telefone_normalizado", "email_normalizado"}
+
+# Chamadas depois de um commit com eventos novos, com a lista dos eventos
+# (o despachante de webhooks acorda; os painéis ao vivo recebem as mudanças)
+_ao_confirmar: List[Callable[[List[Dict]], None]] = []
+
+
+def particao_da_entidade(entidade: str, entidade_id: int) -> int:
+    return zlib.crc32(f"{entidade}:{entidade_id}".encode()) % NUM_PARTICOES
+
+
+def valor_json(valor):
+    """
+    Valor de coluna em forma serializável (datas em ISO, Decimal em float).
+    """
+    if isinstance(valor, (datetime, date)):
+        return valor.isoformat()
+    if isinstance(valor, Decimal):
+        return float(valor)
+    return valor
+
+
+def _instantaneo(objeto) -> Dict:
+    # Só os atributos já carregados: nunca dispara SELECT (importante no modo assíncrono)
+    estado = inspect(objeto)
+    return {
+        coluna.key: valor_json(estado.dict[coluna.key])
+        for coluna in estado.mapper.column_attrs
+        if coluna.key in estado.dict and coluna.key not in COLUNAS_IGNORADAS
+    }
+
+
+def _alteracoes(objeto) -> Dict[str, Dict]:
+    estado = inspect(objeto)
+    alteracoes = {}
+    for coluna in estado.mapper.column_attrs:
+        if coluna.key in COLUNAS_IGNORADAS:
+            continue
+        historico = estado.attrs[coluna.key].history
+        if not historico.added:
+            continue
+        de = historico.deleted[0] if historico.deleted else None
+        para = historico.added[0]
+        if de != para:
+            alteracoes[coluna.key] = {"de": valor_json(de), "para": valor_json(para)}
+    return alteracoes
+
+
+def novo_evento(tipo: str, entidade: str, entidade_id: int, dados: Dict) -> Dict:
+    """
+    Linha de `eventos_saida` (para INSERT do Core ou EventoSaida(**linha)).
+    """
+    return {
+        "tipo": f"{entidade}.{tipo}",
+        "entidade": entidade,
+        "entidade_id": entidade_id,
+        "particao": particao_da_entidade(entidade, entidade_id),
+        "dados": dados,
+    }
+
+
+def registrar_eventos(db: Session, eventos: Iterable[Dict]) -> None:
+    """
+    Grava eventos montados com `novo_evento` (escritas em massa, sem ORM),
+    na transação da sessão.
+    """
+    eventos = list(eventos)
+    if eventos:
+        db.execute(insert(EventoSaida), eventos)
+        db.info.setdefault("eventos_saida_confirmar", []).extend(eventos)
+
+
+def ao_confirmar_eventos(funcao: Callable[[List[Dict]], None]) -> None:
+    """
+    Registra uma função chamada depois de cada commit que gravou eventos,
+    com os eventos gravados (roda na thread de quem fez o commit).
+    """
+    _ao_confirmar.append(funcao)
+
+
+def _eventos_do_flush(sessao: Session) -> List[Dict]:
+    eventos = []
+    for objeto in sessao.new:
+        entidade = ENTIDADES.get(type(objeto))
+        if entidade:
+            eventos.append(novo_evento("criado", entidade, objeto.id, _instantaneo(objeto)))
+    for objeto in sessao.dirty:
+        entidade = ENTIDADES.get(type(objeto))
+        if entidade:
+            alteracoes = _alteracoes(objeto)
+            if alteracoes:
+                eventos.append(novo_evento(
+                    "atualizado",
+                    entidade,
+                    objeto.id,
+                    {"id": objeto.id, "alteracoes": alteracoes, "atual": _instantaneo(objeto)},
+                ))
+    for objeto in sessao.deleted:
+        entidade = ENTIDADES.get(type(objeto))
+        if entidade:
+            eventos.append(novo_evento("excluido", entidade, objeto.id, _instantaneo(objeto)))
+    return eventos
+
+
+@event.listens_for(Session, "after_flush")
+def _coletar_eventos(sessao: Session, _contexto) -> None:
+    # Aqui new/dirty/deleted e o histórico dos atributos ainda mostram o que mudou
+    eventos = _eventos_do_flush(sessao)
+    if eventos:
+        sessao.info.setdefault("eventos_saida_pendentes", []).extend(eventos)
+
+
+@event.listens_for(Session, "after_flush_postexec")
+def _adicionar_eventos(sessao: Session, _contexto) -> None:
+    # O commit faz outro flush com os eventos, na mesma transação
+    eventos: Optional[List[Dict]] = sessao.info.pop("eventos_saida_pendentes", None)
+    if eventos:
+        sessao.add_all(EventoSaida(**dados) for dados in eventos)
+        sessao.info.setdefault("eventos_saida_confirmar", []).extend(eventos)
+
+
+@event.listens_for(Session, "after_commit")
+def _avisar_commit(sessao: Session) -> None:
+    eventos = sessao.info.pop("eventos_saida_confirmar", None)
+    if eventos:
+        for funcao in _ao_confirmar:
+            funcao(eventos)
+
+
+@event.listens_for(Session, "after_rollback")
+def _descartar_eventos(sessao: Session) -> None:
+    sessao.info.pop("eventos_saida_pendentes", None)
+    sessao.info.pop("eventos_saida_confirmar", None)
+
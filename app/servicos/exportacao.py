@@ -0,0 +1,78 @@
+# app/servicos/exportacao.py
+import csv
+import io
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Iterator, List, Sequence
+
+from sqlalchemy import select
+
+from app.banco_dados import SessaoLocal
+
+# Formatos aceitos e o media type de cada um
+FORMATOS_EXPORTACAO = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+# Linhas lidas do banco (e enviadas ao cliente) por vez
+LINHAS_POR_BLOCO = 1000
+
+
+def _valor_json(valor):
+    if isinstance(valor, (datetime, date)):
+        return valor.isoformat()
+    if isinstance(valor, Decimal):
+        return float(valor)
+    raise TypeError(f"Tipo não serializável: {type(valor).__name__}")
+
+
+def _valor_csv(valor):
+    if valor is None:
+        return ""
+    if isinstance(valor, (datetime, date)):
+        return valor.isoformat()
+    return valor
+
+
+def _bloco_ndjson(campos: List[str], linhas: Sequence) -> str:
+    return "".join(
+        json.dumps(dict(zip(campos, linha)), default=_valor_json, ensure_ascii=False) + "\n"
+        for linha in linhas
+    )
+
+
+def _bloco_csv(linhas: Sequence) -> str:
+    saida = io.StringIO()
+    escritor = csv.writer(saida)
+    escritor.writerows([_valor_csv(v) for v in linha] for linha in linhas)
+    return saida.getvalue()
+
+
+def exportar_linhas(modelo, campos: List[str], condicoes: Sequence, formato: str) -> Iterator[str]:
+    """
+    Gera o conteúdo da exportação aos poucos, em blocos de `LINHAS_POR_BLOCO`.
+
+    - Lê só as colunas pedidas, com `yield_per` (cursor do lado do servidor
+      nos bancos que suportam): a memória não cresce com o tamanho da tabela.
+    - Abre a própria sessão, porque o corpo da resposta continua sendo gerado
+      depois que a função da rota já retornou.
+    """
+    colunas = [getattr(modelo, campo) for campo in campos]
+    consulta = (
+        select(*colunas)
+        .where(*condicoes)
+        .order_by(modelo.id)
+        .execution_options(yield_per=LINHAS_POR_BLOCO)
+    )
+
+    if formato == "csv":
+        yield _bloco_csv([campos])
+
+    with SessaoLocal() as db:
+        for linhas in db.execute(consulta).partitions():
+            if formato == "csv":
+                yield _bloco_csv(linhas)
+            else:
+                yield _bloco_ndjson(campos, linhas)
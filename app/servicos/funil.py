@@ -0,0 +1,128 @@
+# app/servicos/funil.py
+from decimal import Decimal
+from typing import Optional, List, Dict, Tuple
+
+from sqlalchemy import select, union_all
+from sqlalchemy.orm import Session
+
+from app.modelos.negocio import Negocio
+from app.paginacao import codificar_cursor, decodificar_cursor, filtro_depois_do_cursor
+
+# Fases do funil, na ordem das colunas do painel
+FASES = ["novo", "em_proposta", "fechado_ganho", "fechado_perdido"]
+
+# Quantos cards cada coluna mostra por vez (o resto vem pelo "carregar mais")
+CARDS_POR_COLUNA = 30
+
+
+def _ordem_cards():
+    return (Negocio.criado_em.desc(), Negocio.id.desc())
+
+
+def cards_por_fase(db: Session, limite: int = CARDS_POR_COLUNA) -> Dict[str, List[Negocio]]:
+    """
+    Os `limite` negócios mais recentes de cada fase, em uma única consulta.
+
+    Cada fase é um SELECT ... LIMIT (resolvido pelo índice fase/criado_em),
+    unidos com UNION ALL: o custo não cresce com o histórico de negócios.
+    """
+    primeiros_por_fase = [
+        select(Negocio.id)
+        .where(Negocio.fase == fase)
+        .order_by(*_ordem_cards())
+        .limit(limite)
+        .subquery()
+        for fase in FASES
+    ]
+    ids = union_all(*(select(sub.c.id) for sub in primeiros_por_fase))
+
+    resultado: Dict[str, List[Negocio]] = {fase: [] for fase in FASES}
+    negocios = (
+        db.query(Negocio)
+        .filter(Negocio.id.in_(ids))
+        .order_by(*_ordem_cards())
+        .all()
+    )
+    for n in negocios:
+        resultado[n.fase].append(n)
+    return resultado
+
+
+def cards_da_fase(
+    db: Session,
+    fase: str,
+    cursor: Optional[str] = None,
+    limite: int = CARDS_POR_COLUNA,
+) -> Tuple[List[Negocio], Optional[str]]:
+    """
+    Próxima página de cards de uma fase, a partir do cursor.
+    Retorna (negócios, próximo cursor ou None se acabou).
+    Lança ValueError se o cursor for inválido.
+    """
+    consulta = db.query(Negocio).filter(Negocio.fase == fase)
+
+    if cursor:
+        criado_em, id_ = decodificar_cursor(cursor)
+        consulta = consulta.filter(
+            filtro_depois_do_cursor(Negocio.criado_em, Negocio.id, criado_em, id_)
+        )
+
+    # Busca um a mais só para saber se ainda existe outra página
+    negocios = consulta.order_by(*_ordem_cards()).limit(limite + 1).all()
+    if len(negocios) <= limite:
+        return negocios, None
+
+    negocios = negocios[:limite]
+    return negocios, cursor_do_card(negocios[-1])
+
+
+def cursor_do_card(negocio: Negocio) -> Optional[str]:
+    """
+    Cursor para continuar a lista depois deste negócio.
+    """
+    if not negocio.criado_em:
+        return None
+    return codificar_cursor(negocio.criado_em, negocio.id)
+
+
+def ordem_do_card(negocio: Negocio) -> str:
+    """
+    Chave da posição do card na coluna (mesma ordem de `_ordem_cards`,
+    comparando como texto): usada pela página para encaixar os cards que
+    chegam ao vivo.
+    """
+    criado_em = negocio.criado_em.strftime("%Y%m%d%H%M%S%f") if negocio.criado_em else ""
+    return f"{criado_em}-{negocio.id:012d}"
+
+
+def numeros_do_funil(totais: Dict[str, Tuple[int, Decimal]]) -> Dict[str, object]:
+    """
+    Quantidades, valores e taxa de fechamento do funil, a partir dos
+    totais por fase do resumo diário (`totais_por_fase`).
+    Usado pelo painel /funil e por /api/v1/metricas/funil.
+    """
+    total_novos, valor_novos = totais.get("novo", (0, 0))
+    total_em_proposta, valor_em_proposta = totais.get("em_proposta", (0, 0))
+    total_ganhos, valor_ganhos = totais.get("fechado_ganho", (0, 0))
+    total_perdidos, valor_perdidos = totais.get("fechado_perdido", (0, 0))
+
+    if (total_novos + total_em_proposta + total_ganhos) > 0:
+        taxa_fechamento = round(
+            (total_ganhos / (total_novos + total_em_proposta + total_ganhos)) * 100
+        )
+    else:
+        taxa_fechamento = 0
+
+    return {
+        "total_novos": total_novos,
+        "total_em_proposta": total_em_proposta,
+        "total_ganhos": total_ganhos,
+        "total_perdidos": total_perdidos,
+        "valor_novos": valor_novos,
+        "valor_em_proposta": valor_em_proposta,
+        "valor_ganhos": valor_ganhos,
+        "valor_perdidos": valor_perdidos,
+        "total_negocios": total_novos + total_em_proposta + total_ganhos + total_perdidos,
+        "valor_total": valor_novos + valor_em_proposta + valor_ganhos + valor_perdidos,
+        "taxa_fechamento": taxa_fechamento,
+    }
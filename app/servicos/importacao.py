@@ -0,0 +1,239 @@
+# app/servicos/importacao.py
+"""
+Importação de CSV (contatos ou negócios) em lotes.
+
+O arquivo é lido linha a linha (nunca inteiro em memória); cada bloco de
+`tamanho_lote` linhas válidas vira uma chamada das rotinas de lote
+(`app/servicos/lotes.py`), com uma transação por bloco.
+"""
+import csv
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+
+from app.banco_dados import SessaoLocal
+from app.esquemas.contato import ContatoCriar, ContatoLote
+from app.esquemas.negocio import NegocioCriar, NegocioLote
+from app.esquemas.lote import LoteResultado
+from app.servicos.lotes import criar_contatos_em_lote, criar_negocios_em_lote
+from app.servicos.resolver_contatos import resolver_ids
+
+TAMANHO_LOTE_PADRAO = 1000
+
+# Quantos erros detalhados guardar por importação (o total é sempre contado)
+MAX_AMOSTRA_ERROS = 100
+
+# Quantas importações ficam disponíveis para consulta
+MAX_IMPORTACOES_GUARDADAS = 50
+
+# Colunas extras aceitas no CSV de negócios para achar o contato
+CAMPOS_BUSCA_CONTATO = ("contato_email", "contato_telefone")
+
+
+class Importacao:
+    """
+    Estado de uma importação (consultado pela rota de andamento).
+    """
+
+    def __init__(self, tipo: str):
+        self.id = uuid.uuid4().hex
+        self.tipo = tipo
+        self.situacao = "na_fila"
+        self.linhas_processadas = 0
+        self.criados = 0
+        self.atualizados = 0
+        self.erros = 0
+        self.amostra_erros: List[Dict] = []
+        self.iniciado_em: Optional[datetime] = None
+        self.finalizado_em: Optional[datetime] = None
+        self.mensagem: Optional[str] = None
+        self._inicio_relogio: Optional[float] = None
+        self._fim_relogio: Optional[float] = None
+
+    @property
+    def linhas_por_segundo(self) -> float:
+        if self._inicio_relogio is None:
+            return 0.0
+        decorrido = (self._fim_relogio or time.perf_counter()) - self._inicio_relogio
+        return round(self.linhas_processadas / decorrido, 1) if decorrido > 0 else 0.0
+
+    def registrar_erro(self, linha: int, erro: str) -> None:
+        self.erros += 1
+        if len(self.amostra_erros) < MAX_AMOSTRA_ERROS:
+            self.amostra_erros.append({"linha": linha, "erro": erro})
+
+    def para_dict(self) -> Dict:
+        return {
+            "id": self.id,
+            "tipo": self.tipo,
+            "situacao": self.situacao,
+            "linhas_processadas": self.linhas_processadas,
+            "criados": self.criados,
+            "atualizados": self.atualizados,
+            "erros": self.erros,
+            "linhas_por_segundo": self.linhas_por_segundo,
+            "iniciado_em": self.iniciado_em,
+            "finalizado_em": self.finalizado_em,
+            "mensagem": self.mensagem,
+            "amostra_erros": list(self.amostra_erros),
+        }
+
+
+_importacoes: "OrderedDict[str, Importacao]" = OrderedDict()
+_trava = threading.Lock()
+
+
+def nova_importacao(tipo: str) -> Importacao:
+    """
+    Registra uma importação (as mais antigas já finalizadas são descartadas).
+    """
+    importacao = Importacao(tipo)
+    with _trava:
+        _importacoes[importacao.id] = importacao
+        while len(_importacoes) > MAX_IMPORTACOES_GUARDADAS:
+            mais_antiga = next(iter(_importacoes.values()))
+            if mais_antiga.situacao in ("na_fila", "processando"):
+                break
+            _importacoes.popitem(last=False)
+    return importacao
+
+
+def obter_importacao(importacao_id: str) -> Optional[Importacao]:
+    return _importacoes.get(importacao_id)
+
+
+def listar_importacoes() -> List[Importacao]:
+    return list(reversed(_importacoes.values()))
+
+
+def _mensagem_validacao(erro: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(parte) for parte in e['loc'])}: {e['msg']}" for e in erro.errors()
+    )
+
+
+def _mapear_linha(linha: Dict[str, str], mapeamento: Dict[str, str], campos: set) -> Dict:
+    """
+    Renomeia as colunas do CSV para os campos do esquema.
+    Colunas desconhecidas são ignoradas; células vazias viram None.
+    """
+    dados = {}
+    for coluna, valor in linha.items():
+        if coluna is None:
+            continue
+        campo = mapeamento.get(coluna, coluna)
+        if campo in campos:
+            dados[campo] = valor if valor not in ("", None) else None
+    return dados
+
+
+def _resolver_contatos(db: Session, itens: List[Tuple[int, NegocioCriar, Dict]]) -> None:
+    """
+    Preenche `contato_id` dos negócios pelo e-mail ou telefone do contato
+    (normalizados: "(92) 99999-9999" acha "+55 92 99999-9999"), com uma
+    consulta IN por bloco.
+    """
+    emails = {busca["contato_email"] for _, _, busca in itens if busca.get("contato_email")}
+    telefones = {busca["contato_telefone"] for _, _, busca in itens if busca.get("contato_telefone")}
+
+    por_email = resolver_ids(db, "email", emails)
+    por_telefone = resolver_ids(db, "telefone", telefones)
+
+    for posicao, (linha, item, busca) in enumerate(itens):
+        if item.contato_id:
+            continue
+        contato_id = por_email.get(busca.get("contato_email")) or por_telefone.get(
+            busca.get("contato_telefone")
+        )
+        if contato_id:
+            itens[posicao] = (linha, item.model_copy(update={"contato_id": contato_id}), busca)
+
+
+def _processar_bloco(
+    importacao: Importacao,
+    bloco: List[Tuple[int, object, Dict]],
+    modo: str,
+) -> None:
+    with SessaoLocal() as db:
+        if importacao.tipo == "contatos":
+            resultado: LoteResultado = criar_contatos_em_lote(
+                db, ContatoLote(itens=[item for _, item, _ in bloco], modo=modo)
+            )
+        else:
+            _resolver_contatos(db, bloco)
+            resultado = criar_negocios_em_lote(
+                db, NegocioLote(itens=[item for _, item, _ in bloco])
+            )
+
+    importacao.criados += resultado.criados
+    importacao.atualizados += resultado.atualizados
+    for item in resultado.itens:
+        if item.situacao == "erro":
+            importacao.registrar_erro(bloco[item.indice][0], item.erro or "Erro.")
+
+
+def executar_importacao(
+    importacao: Importacao,
+    caminho: str,
+    mapeamento: Optional[Dict[str, str]] = None,
+    tamanho_lote: int = TAMANHO_LOTE_PADRAO,
+    modo: str = "inserir",
+    apagar_arquivo: bool = False,
+) -> Importacao:
+    """
+    Lê o CSV em `caminho` e grava em blocos de `tamanho_lote` linhas.
+    Atualiza o andamento em `importacao` durante o processo.
+    """
+    mapeamento = mapeamento or {}
+    esquema = ContatoCriar if importacao.tipo == "contatos" else NegocioCriar
+    campos = set(esquema.model_fields)
+    if importacao.tipo == "negocios":
+        campos.update(CAMPOS_BUSCA_CONTATO)
+
+    importacao.situacao = "processando"
+    importacao.iniciado_em = datetime.utcnow()
+    importacao._inicio_relogio = time.perf_counter()
+
+    try:
+        with open(caminho, newline="", encoding="utf-8-sig") as arquivo:
+            bloco: List[Tuple[int, object, Dict]] = []
+            # Linha 1 é o cabeçalho
+            for numero, linha in enumerate(csv.DictReader(arquivo), start=2):
+                importacao.linhas_processadas += 1
+                dados = _mapear_linha(linha, mapeamento, campos)
+                busca = {c: dados.pop(c, None) for c in CAMPOS_BUSCA_CONTATO}
+                try:
+                    item = esquema.model_validate(dados)
+                except ValidationError as erro:
+                    importacao.registrar_erro(numero, _mensagem_validacao(erro))
+                    continue
+
+                bloco.append((numero, item, busca))
+                if len(bloco) >= tamanho_lote:
+                    _processar_bloco(importacao, bloco, modo)
+                    bloco = []
+
+            if bloco:
+                _processar_bloco(importacao, bloco, modo)
+
+        importacao.situacao = "concluida"
+    except Exception as erro:  # a importação roda em segundo plano: registra e encerra
+        importacao.situacao = "falhou"
+        importacao.mensagem = str(erro)
+    finally:
+        importacao._fim_relogio = time.perf_counter()
+        importacao.finalizado_em = datetime.utcnow()
+        if apagar_arquivo:
+            try:
+                os.remove(caminho)
+            except OSError:
+                pass
+
+    return importacao
@@ -0,0 +1,282 @@
+# app/servicos/indicadores.py
+from datetime import datetime, date, time, timedelta
+from typing import Optional, List, Dict, Tuple
+
+from sqlalchemy import Date, and_, case, cast, func, or_
+from sqlalchemy.orm import Session
+
+from app.modelos.negocio import Negocio
+from app.modelos.funcionario import Funcionario
+from app.modelos.resumo_diario import ResumoNegocioDiario
+
+
+def resolver_periodo(inicio: Optional[str], fim: Optional[str]) -> Tuple[date, date]:
+    """
+    Converte os parâmetros `inicio`/`fim` (YYYY-MM-DD) em datas.
+    Padrão (ou datas inválidas): últimos 30 dias.
+    """
+    if not inicio or not fim:
+        fim_data = date.today()
+        inicio_data = fim_data - timedelta(days=29)
+    else:
+        try:
+            inicio_data = datetime.strptime(inicio, "%Y-%m-%d").date()
+            fim_data = datetime.strptime(fim, "%Y-%m-%d").date()
+        except ValueError:
+            fim_data = date.today()
+            inicio_data = fim_data - timedelta(days=29)
+
+    if inicio_data > fim_data:
+        inicio_data, fim_data = fim_data, inicio_data
+
+    return inicio_data, fim_data
+
+
+def filtro_periodo_datahora(coluna, inicio_data: date, fim_data: date):
+    """
+    Equivalente a `inicio <= coluna.date() <= fim`, mas escrito como faixa
+    para aproveitar índices.
+
+    O SQLite guarda DateTime como texto, às vezes sem a fração de segundos
+    (`server_default=func.now()`), às vezes com ela (datas vindas do Python).
+    Comparar com o último microssegundo do dia funciona para os dois formatos.
+    """
+    return and_(
+        coluna > datetime.combine(inicio_data - timedelta(days=1), time.max),
+        coluna <= datetime.combine(fim_data, time.max),
+    )
+
+
+def data_da_coluna(db: Session, coluna):
+    """
+    Expressão SQL com a parte "data" de uma coluna DateTime.
+    (No SQLite, CAST(... AS DATE) não funciona: usa-se date().)
+    """
+    if db.get_bind().dialect.name == "sqlite":
+        return func.date(coluna)
+    return cast(coluna, Date)
+
+
+def dias_ciclo(db: Session):
+    """
+    Expressão SQL com os dias entre a criação e o fechamento do negócio.
+    """
+    if db.get_bind().dialect.name == "sqlite":
+        return func.julianday(Negocio.data_fechamento) - func.julianday(
+            func.date(Negocio.criado_em)
+        )
+    return Negocio.data_fechamento - data_da_coluna(db, Negocio.criado_em)
+
+
+def calcular_indicadores(db: Session, inicio_data: date, fim_data: date) -> Dict:
+    """
+    Calcula os indicadores do painel /indicadores com consultas agrupadas.
+
+    Contagens, valores e ciclos vêm do resumo diário
+    (`negocios_resumo_diario`), que tem poucas linhas por dia. Só "trabalhados"
+    (depende de `atualizado_em`) e "vendas por origem" (mantém a ordem do
+    primeiro negócio de cada origem) consultam `negocios`, sempre agrupando.
+    """
+    R = ResumoNegocioDiario
+    no_periodo = and_(R.dia >= inicio_data, R.dia <= fim_data)
+    e_ganho = R.fase == "fechado_ganho"
+
+    recebido = filtro_periodo_datahora(Negocio.criado_em, inicio_data, fim_data)
+    atualizado = filtro_periodo_datahora(Negocio.atualizado_em, inicio_data, fim_data)
+    ganho = and_(
+        Negocio.fase == "fechado_ganho",
+        Negocio.data_fechamento >= inicio_data,
+        Negocio.data_fechamento <= fim_data,
+    )
+
+    def so_ganhos(coluna):
+        return func.sum(case((e_ganho, coluna), else_=0))
+
+    funcionarios: List[Funcionario] = (
+        db.query(Funcionario)
+        .filter(Funcionario.ativo == True)  # noqa: E712
+        .order_by(Funcionario.nome)
+        .all()
+    )
+
+    # 1) Global: negócios recebidos e ganhos no período
+    (
+        total_negocios_recebidos_global,
+        total_negocios_ganhos_global,
+        soma_ciclos_global,
+        qtd_ciclos_global,
+    ) = (
+        db.query(
+            func.coalesce(func.sum(R.qtd_criados), 0),
+            func.coalesce(so_ganhos(R.qtd_fechados), 0),
+            so_ganhos(R.soma_ciclo_dias),
+            so_ganhos(R.qtd_ciclos),
+        )
+        .filter(no_periodo)
+        .one()
+    )
+
+    if qtd_ciclos_global:
+        ciclo_medio_global = round(soma_ciclos_global / qtd_ciclos_global, 1)
+    else:
+        ciclo_medio_global = 0.0
+
+    if total_negocios_recebidos_global > 0:
+        taxa_conversao_global = round(
+            (total_negocios_ganhos_global / total_negocios_recebidos_global) * 100
+        )
+    else:
+        taxa_conversao_global = 0
+
+    # 2) Por funcionário (uma linha por responsável)
+    resumo_por_responsavel = {
+        linha[0]: linha[1:]
+        for linha in (
+            db.query(
+                R.responsavel_id,
+                func.sum(R.qtd_criados),
+                so_ganhos(R.qtd_fechados),
+                so_ganhos(R.soma_ciclo_dias),
+                so_ganhos(R.qtd_ciclos),
+                so_ganhos(R.valor_fechados),
+            )
+            .filter(no_periodo)
+            .group_by(R.responsavel_id)
+            .all()
+        )
+    }
+
+    # Trabalhados = criados ou atualizados no período (contados uma vez)
+    trabalhados_por_responsavel = dict(
+        db.query(Negocio.responsavel_id, func.count(Negocio.id))
+        .filter(or_(recebido, atualizado))
+        .group_by(Negocio.responsavel_id)
+        .all()
+    )
+
+    metricas_funcionarios: List[Dict] = []
+    valor_max_vendedor = 0.0
+
+    for f in funcionarios:
+        (
+            negocios_recebidos_f,
+            negocios_ganhos_f,
+            soma_ciclos_f,
+            qtd_ciclos_f,
+            valor_ganho_f,
+        ) = resumo_por_responsavel.get(f.id, (0, 0, 0, 0, 0))
+        negocios_trabalhados_f = trabalhados_por_responsavel.get(f.id, 0)
+
+        if qtd_ciclos_f:
+            ciclo_medio_f = round(soma_ciclos_f / qtd_ciclos_f, 1)
+        else:
+            ciclo_medio_f = 0.0
+
+        if negocios_recebidos_f > 0:
+            taxa_conversao_f = round(
+                (negocios_ganhos_f / negocios_recebidos_f) * 100
+            )
+        else:
+            taxa_conversao_f = 0
+
+        valor_ganho_f = valor_ganho_f or 0
+        valor_max_vendedor = max(valor_max_vendedor, valor_ganho_f)
+
+        metricas_funcionarios.append(
+            {
+                "funcionario": f,
+                "negocios_recebidos": negocios_recebidos_f,
+                "negocios_trabalhados": negocios_trabalhados_f,
+                "negocios_ganhos": negocios_ganhos_f,
+                "ciclo_medio": ciclo_medio_f,
+                "taxa_conversao": taxa_conversao_f,
+                "valor_ganho": valor_ganho_f,
+            }
+        )
+
+    # Normalizar largura da barra de vendas por funcionário
+    for m in metricas_funcionarios:
+        if valor_max_vendedor > 0:
+            m["largura_barra"] = round(
+                (m["valor_ganho"] * 100) / valor_max_vendedor
+            )
+        else:
+            m["largura_barra"] = 0
+
+    # 3) Vendas por origem (somente negócios ganhos no período).
+    # Ordenado pelo primeiro negócio de cada origem, como na listagem original.
+    vendas_origem_dict: Dict[str, Dict[str, float]] = {}
+
+    linhas_origem = (
+        db.query(
+            Negocio.origem,
+            func.count(Negocio.id),
+            func.sum(Negocio.valor_previsto),
+        )
+        .filter(ganho)
+        .group_by(Negocio.origem)
+        .order_by(func.min(Negocio.id))
+        .all()
+    )
+    for origem, quantidade, valor in linhas_origem:
+        origem = origem or "Não informada"
+        if origem not in vendas_origem_dict:
+            vendas_origem_dict[origem] = {"quantidade": 0, "valor": 0.0}
+        vendas_origem_dict[origem]["quantidade"] += quantidade
+        vendas_origem_dict[origem]["valor"] += float(valor) if valor is not None else 0.0
+
+    valor_max_origem = max(
+        (dados["valor"] for dados in vendas_origem_dict.values()), default=0.0
+    )
+
+    vendas_por_origem: List[Dict] = []
+    for origem, dados in vendas_origem_dict.items():
+        if valor_max_origem > 0:
+            largura = round((dados["valor"] * 100) / valor_max_origem)
+        else:
+            largura = 0
+        vendas_por_origem.append(
+            {
+                "origem": origem,
+                "quantidade": dados["quantidade"],
+                "valor": dados["valor"],
+                "largura_barra": largura,
+            }
+        )
+
+    # 4) Produtividade por dia (negócios ganhos por dia de fechamento)
+    produtividade_por_dia: List[Dict] = [
+        {"data": d, "quantidade": qtd}
+        for d, qtd in (
+            db.query(R.dia, func.sum(R.qtd_fechados))
+            .filter(no_periodo, e_ganho)
+            .group_by(R.dia)
+            .having(func.sum(R.qtd_fechados) > 0)
+            .order_by(R.dia)
+            .all()
+        )
+    ]
+
+    max_produtividade = (
+        max((p["quantidade"] for p in produtividade_por_dia), default=0)
+    )
+
+    for p in produtividade_por_dia:
+        if max_produtividade > 0:
+            p["largura_barra"] = round(
+                (p["quantidade"] * 100) / max_produtividade
+            )
+        else:
+            p["largura_barra"] = 0
+
+    return {
+        "inicio": inicio_data.isoformat(),
+        "fim": fim_data.isoformat(),
+        "total_negocios_recebidos_global": total_negocios_recebidos_global,
+        "total_negocios_ganhos_global": total_negocios_ganhos_global,
+        "ciclo_medio_global": ciclo_medio_global,
+        "taxa_conversao_global": taxa_conversao_global,
+        "metricas_funcionarios": metricas_funcionarios,
+        "vendas_por_origem": vendas_por_origem,
+        "produtividade_por_dia": produtividade_por_dia,
+    }
@@ -0,0 +1,541 @@
+# app/servicos/ingestao.py
+"""
+Ingestão de leads em fila, com gravação em lotes em segundo plano.
+
+Cada lead recebido (POST /api/v1/ingestao/leads) é validado, entra numa
+`asyncio.Queue` e a resposta (202) sai na hora. Uma tarefa de fundo junta
+os itens da fila e grava tudo numa transação só a cada `TAMANHO_LOTE`
+itens ou `INTERVALO_MS` milissegundos (o que vier primeiro): no SQLite,
+que serializa as escritas, mil leads viram um commit em vez de mil.
+
+Configuração (variáveis de ambiente):
+
+- CRM_INGESTAO_LOTE         itens por transação (padrão 500);
+- CRM_INGESTAO_INTERVALO_MS espera máxima para juntar um lote (padrão 200);
+- CRM_INGESTAO_MAX_FILA     acima disso o recebimento responde 503 (padrão 100000);
+- CRM_INGESTAO_SPOOL        arquivo (JSON por linha) onde cada lead é
+                            anotado antes do 202; o que não foi gravado
+                            volta para a fila ao iniciar. Vazio: só em memória;
+- CRM_INGESTAO_FSYNC=1      fsync do spool antes do 202 (sobrevive a queda de
+                            energia, não só à do processo);
+- CRM_INGESTAO_TEMPO_FLUSH  segundos para esvaziar a fila ao desligar (padrão 30).
+
+O spool é escrito por uma thread própria, fora do event loop: os leads que
+chegam enquanto ela grava entram juntos na próxima escrita, com um flush (e
+um fsync) por grupo, e cada requisição só espera a escrita do seu grupo.
+
+A entrega é "pelo menos uma vez": se o processo cair entre o commit de um
+lote e a anotação no spool, o lote é gravado de novo ao reiniciar (o
+contato é reaproveitado pelo e-mail/telefone; o negócio se repete).
+"""
+import asyncio
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Deque, Dict, List, Optional, Tuple
+
+from sqlalchemy.exc import DataError, IntegrityError, OperationalError
+from sqlalchemy.exc import TimeoutError as TempoEsgotadoPool
+from sqlalchemy.orm import Session
+
+from app.banco_dados import SessaoLocal
+from app.esquemas.contato import ContatoCriar, ContatoLote
+from app.esquemas.ingestao import LeadEntrada
+from app.esquemas.negocio import NegocioLote
+from app.metricas import Contador, Medidor, registro
+from app.normalizacao import normalizar_email, normalizar_telefone
+from app.servicos.lotes import criar_contatos_em_lote, criar_negocios_em_lote
+from app.servicos.resolver_contatos import resolver_ids
+
+TAMANHO_LOTE = int(os.getenv("CRM_INGESTAO_LOTE", "500"))
+INTERVALO_MS = int(os.getenv("CRM_INGESTAO_INTERVALO_MS", "200"))
+MAX_FILA = int(os.getenv("CRM_INGESTAO_MAX_FILA", "100000"))
+CAMINHO_SPOOL = os.getenv("CRM_INGESTAO_SPOOL", "").strip() or None
+FSYNC_SPOOL = os.getenv("CRM_INGESTAO_FSYNC", "").strip().lower() in ("1", "true", "sim", "yes")
+TEMPO_FLUSH = float(os.getenv("CRM_INGESTAO_TEMPO_FLUSH", "30"))
+
+# Espera antes de tentar de novo um lote que falhou por erro do banco
+ESPERA_NOVA_TENTATIVA = 1.0
+
+# Depois de tantas falhas seguidas (por erro não transitório), o lote é
+# gravado item a item e o lead que continuar falhando é descartado sozinho
+MAX_TENTATIVAS_LOTE = 3
+
+logger = logging.getLogger("uvicorn.error")
+
+
+class ErroLead(Exception):
+    """
+    Um lead não pôde ser gravado (ex.: responsável inexistente).
+    """
+
+
+# Erros do próprio lead: ele é descartado (os demais do lote seguem).
+# DataError: valor que o banco recusa (ex.: texto maior que a coluna no PostgreSQL)
+ERROS_DE_DADOS = (ErroLead, IntegrityError, DataError, ValueError)
+
+# Erros do banco, não do lead ("database is locked", conexão caiu, pool
+# esgotado): o lote é tentado de novo sem limite
+ERROS_TRANSITORIOS = (OperationalError, TempoEsgotadoPool)
+
+
+class FilaCheia(Exception):
+    """
+    A fila chegou a `MAX_FILA` itens (o escritor não está dando conta).
+    """
+
+
+def gravar_leads(db: Session, leads: List[LeadEntrada]) -> Tuple[int, int]:
+    """
+    Grava os leads numa transação: acha ou cria o contato de cada um e cria
+    os negócios. Retorna (contatos criados, negócios criados).
+    Lança ErroLead (sem commit) se algum item falhar.
+    """
+    por_email = resolver_ids(db, "email", [l.email for l in leads if l.email])
+    por_telefone = resolver_ids(db, "telefone", [l.telefone for l in leads if l.telefone])
+
+    # Contato de cada lead: id já existente ou posição em `novos`
+    contato_de: List[Tuple[str, int]] = []
+    novos: List[ContatoCriar] = []
+    novo_por_chave: Dict[Tuple[str, str], int] = {}
+    for lead in leads:
+        existente = por_email.get(lead.email) or por_telefone.get(lead.telefone)
+        if existente:
+            contato_de.append(("id", existente))
+            continue
+
+        # O mesmo contato pode chegar mais de uma vez no mesmo lote
+        chaves = [
+            chave
+            for chave in (("email", normalizar_email(lead.email)), ("telefone", normalizar_telefone(lead.telefone)))
+            if chave[1]
+        ]
+        posicao = next((novo_por_chave[c] for c in chaves if c in novo_por_chave), None)
+        if posicao is None:
+            posicao = len(novos)
+            novos.append(ContatoCriar(**lead.model_dump(exclude={"negocio"})))
+        for chave in chaves:
+            novo_por_chave.setdefault(chave, posicao)
+        contato_de.append(("novo", posicao))
+
+    ids_novos: List[Optional[int]] = []
+    if novos:
+        resultado = criar_contatos_em_lote(db, ContatoLote(itens=novos), confirmar=False)
+        erros = [item.erro for item in resultado.itens if item.situacao == "erro"]
+        if erros:
+            raise ErroLead(f"Contato: {erros[0]}")
+        ids_novos = [item.id for item in resultado.itens]
+
+    negocios = [
+        lead.negocio.model_copy(
+            update={"contato_id": valor if tipo == "id" else ids_novos[valor]}
+        )
+        for lead, (tipo, valor) in zip(leads, contato_de)
+        if lead.negocio
+    ]
+    if negocios:
+        resultado = criar_negocios_em_lote(db, NegocioLote(itens=negocios), confirmar=False)
+        erros = [item.erro for item in resultado.itens if item.situacao == "erro"]
+        if erros:
+            raise ErroLead(f"Negócio: {erros[0]}")
+
+    db.commit()
+    return len(novos), len(negocios)
+
+
+class _Spool:
+    """
+    Arquivo com os leads recebidos (JSON por linha) + arquivo `.ok` com a
+    última sequência já gravada no banco.
+
+    Depois de `iniciar_escritor`, todo acesso ao arquivo passa pela thread
+    escritora, na ordem em que foi pedido.
+    """
+
+    # Anotações juntadas, no máximo, em uma escrita (um flush/fsync)
+    MAX_GRUPO = 1000
+
+    def __init__(self, caminho: str, fsync: bool = False):
+        self.caminho = caminho
+        self.caminho_ok = caminho + ".ok"
+        self.fsync = fsync
+        self._arquivo = None
+        self._comandos: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._escritor: Optional[threading.Thread] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.escritas = 0
+
+    def pendentes(self) -> List[Dict]:
+        """
+        Registros ainda não gravados no banco (de uma execução anterior).
+        """
+        gravado_ate = 0
+        if os.path.exists(self.caminho_ok):
+            with open(self.caminho_ok, encoding="utf-8") as arquivo:
+                gravado_ate = int(arquivo.read().strip() or 0)
+
+        registros = []
+        if os.path.exists(self.caminho):
+            with open(self.caminho, encoding="utf-8") as arquivo:
+                for linha in arquivo:
+                    try:
+                        registro_lido = json.loads(linha)
+                    except ValueError:  # última linha cortada por uma queda
+                        continue
+                    if registro_lido["sequencia"] > gravado_ate:
+                        registros.append(registro_lido)
+        return registros
+
+    def reescrever(self, registros: List[Dict]) -> None:
+        """
+        Recomeça o arquivo só com `registros` (os pendentes) e zera o `.ok`.
+        """
+        self._fechar_arquivo()
+        temporario = self.caminho + ".tmp"
+        with open(temporario, "w", encoding="utf-8") as arquivo:
+            for registro_lido in registros:
+                arquivo.write(json.dumps(registro_lido, ensure_ascii=False) + "\n")
+        os.replace(temporario, self.caminho)
+        if os.path.exists(self.caminho_ok):
+            os.remove(self.caminho_ok)
+        self._arquivo = open(self.caminho, "a", encoding="utf-8")
+
+    def _confirmar(self, sequencia: int) -> None:
+        temporario = self.caminho_ok + ".tmp"
+        with open(temporario, "w", encoding="utf-8") as arquivo:
+            arquivo.write(str(sequencia))
+        os.replace(temporario, self.caminho_ok)
+
+    def _fechar_arquivo(self) -> None:
+        if self._arquivo:
+            self._arquivo.close()
+            self._arquivo = None
+
+    # Thread escritora
+
+    def iniciar_escritor(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._loop = loop
+        self._escritor = threading.Thread(target=self._escrever, name="spool-ingestao", daemon=True)
+        self._escritor.start()
+
+    def anotar(self, registro_novo: Dict) -> "asyncio.Future":
+        """
+        Pede a anotação do registro; o futuro termina quando ele está no
+        arquivo (e no disco, com fsync).
+        """
+        futuro = self._loop.create_future()
+        self._comandos.put(("anotar", registro_novo, futuro))
+        return futuro
+
+    def confirmar(self, sequencia: int) -> None:
+        self._comandos.put(("confirmar", sequencia, None))
+
+    def recomecar(self) -> None:
+        """
+        Tudo gravado: o arquivo recomeça vazio (não cresce sem fim).
+        """
+        self._comandos.put(("reescrever", [], None))
+
+    def fechar(self) -> None:
+        """
+        Termina as escritas pedidas e fecha o arquivo (bloqueia: use fora do event loop).
+        """
+        if self._escritor:
+            self._comandos.put(None)
+            self._escritor.join()
+            self._escritor = None
+        self._fechar_arquivo()
+
+    def _escrever(self) -> None:
+        while True:
+            grupo = [self._comandos.get()]
+            while len(grupo) < self.MAX_GRUPO:
+                try:
+                    grupo.append(self._comandos.get_nowait())
+                except queue.Empty:
+                    break
+
+            futuros = []
+            erro = None
+            try:
+                for comando in grupo:
+                    if comando is None:
+                        break
+                    tipo, valor, futuro = comando
+                    if tipo == "anotar":
+                        self._arquivo.write(json.dumps(valor, ensure_ascii=False) + "\n")
+                        futuros.append(futuro)
+                    elif tipo == "confirmar":
+                        self._confirmar(valor)
+                    else:
+                        self.reescrever(valor)
+                if futuros:
+                    self._arquivo.flush()
+                    if self.fsync:
+                        os.fsync(self._arquivo.fileno())
+                    self.escritas += 1
+            except Exception as excecao:
+                erro = excecao
+                logger.exception("Ingestão: falha ao escrever no spool %s.", self.caminho)
+
+            if futuros:
+                self._loop.call_soon_threadsafe(_concluir, futuros, erro)
+            if None in grupo:
+                return
+
+
+def _concluir(futuros: List["asyncio.Future"], erro: Optional[Exception]) -> None:
+    for futuro in futuros:
+        if futuro.done():  # requisição cancelada
+            continue
+        if erro:
+            futuro.set_exception(erro)
+        else:
+            futuro.set_result(None)
+
+
+class FilaIngestao:
+    """
+    Fila de leads + tarefa que os grava em lotes.
+    Tudo roda no event loop, exceto a gravação, que vai para uma thread.
+    """
+
+    def __init__(
+        self,
+        tamanho_lote: int = TAMANHO_LOTE,
+        intervalo_ms: int = INTERVALO_MS,
+        max_fila: int = MAX_FILA,
+        caminho_spool: Optional[str] = CAMINHO_SPOOL,
+        fsync: bool = FSYNC_SPOOL,
+    ):
+        self.tamanho_lote = tamanho_lote
+        self.intervalo_ms = intervalo_ms
+        self.max_fila = max_fila
+        self._spool = _Spool(caminho_spool, fsync) if caminho_spool else None
+        self._fila: Optional[asyncio.Queue] = None
+        self._escritor: Optional[asyncio.Task] = None
+        # (sequência, recebido em) de cada item ainda não gravado, em ordem
+        self._pendentes: Deque[Tuple[int, float]] = deque()
+        self._sequencia = 0
+        self.recebidos = 0
+        self.gravados = 0
+        self.erros = 0
+        self.lotes = 0
+        self.ultimo_lote_em: Optional[datetime] = None
+        self.ultimo_erro: Optional[str] = None
+
+    # Ciclo de vida
+
+    async def iniciar(self) -> None:
+        """
+        Cria a fila (no event loop atual), devolve a ela o que ficou no spool
+        e liga o escritor.
+        """
+        self._fila = asyncio.Queue()
+        if self._spool:
+            registros = await asyncio.to_thread(self._spool.pendentes)
+            await asyncio.to_thread(self._spool.reescrever, registros)
+            for registro_lido in registros:
+                self._sequencia = max(self._sequencia, registro_lido["sequencia"])
+                self._colocar(registro_lido["sequencia"], LeadEntrada.model_validate(registro_lido["lead"]))
+            if registros:
+                logger.info("Ingestão: %d leads do spool voltaram para a fila.", len(registros))
+            self._spool.iniciar_escritor(asyncio.get_running_loop())
+        self._escritor = asyncio.create_task(self._escrever())
+
+    async def parar(self, tempo_limite: float = TEMPO_FLUSH) -> None:
+        """
+        Espera a fila esvaziar (até `tempo_limite` segundos) e desliga o escritor.
+        O que sobrar continua no spool, se houver um.
+        """
+        if not self._escritor:
+            return
+        try:
+            await asyncio.wait_for(self._fila.join(), tempo_limite)
+        except asyncio.TimeoutError:
+            logger.warning("Ingestão: %d leads ficaram na fila ao desligar.", len(self._pendentes))
+        self._escritor.cancel()
+        try:
+            await self._escritor
+        except asyncio.CancelledError:
+            pass
+        self._escritor = None
+        if self._spool:
+            await asyncio.to_thread(self._spool.fechar)
+
+    # Recebimento
+
+    async def receber(self, lead: LeadEntrada) -> int:
+        """
+        Coloca o lead na fila (e no spool). Retorna a sequência atribuída.
+        Lança FilaCheia se a fila estiver no limite.
+
+        Com spool, só retorna depois que o lead está no arquivo. O lead já
+        entra na fila antes (em ordem de sequência, como o `.ok` espera).
+        """
+        if self._fila is None:
+            raise RuntimeError("A fila de ingestão não foi iniciada.")
+        if len(self._pendentes) >= self.max_fila:
+            raise FilaCheia()
+
+        self._sequencia += 1
+        sequencia = self._sequencia
+        anotado = None
+        if self._spool:
+            anotado = self._spool.anotar({"sequencia": sequencia, "lead": lead.model_dump(mode="json")})
+        self._colocar(sequencia, lead)
+        self.recebidos += 1
+        if anotado is not None:
+            try:
+                await anotado
+            except Exception as erro:
+                # O lead segue na fila e será gravado; só não sobrevive a uma queda
+                self.ultimo_erro = str(erro)
+        return sequencia
+
+    def _colocar(self, sequencia: int, lead: LeadEntrada) -> None:
+        self._pendentes.append((sequencia, time.time()))
+        self._fila.put_nowait((sequencia, lead))
+
+    # Escrita
+
+    async def _proximo_lote(self) -> List[Tuple[int, LeadEntrada]]:
+        # Espera o primeiro item; depois junta até `tamanho_lote` ou até o prazo
+        lote = [await self._fila.get()]
+        prazo = asyncio.get_running_loop().time() + self.intervalo_ms / 1000
+        while len(lote) < self.tamanho_lote:
+            if not self._fila.empty():
+                lote.append(self._fila.get_nowait())
+                continue
+            restante = prazo - asyncio.get_running_loop().time()
+            if restante <= 0:
+                break
+            try:
+                lote.append(await asyncio.wait_for(self._fila.get(), restante))
+            except asyncio.TimeoutError:
+                break
+        return lote
+
+    async def _escrever(self) -> None:
+        while True:
+            lote = await self._proximo_lote()
+            restantes = [lead for _, lead in lote]
+            tentativas = 0
+            while restantes:
+                try:
+                    await asyncio.to_thread(self._gravar, restantes, tentativas >= MAX_TENTATIVAS_LOTE)
+                except Exception as erro:
+                    # Falha do banco: tenta de novo o que faltou gravar
+                    if not isinstance(erro, ERROS_TRANSITORIOS):
+                        tentativas += 1
+                    self.ultimo_erro = str(erro)
+                    logger.exception("Ingestão: falha ao gravar um lote de %d leads.", len(restantes))
+                    await asyncio.sleep(ESPERA_NOVA_TENTATIVA)
+
+            for _ in lote:
+                self._pendentes.popleft()
+                self._fila.task_done()
+
+            if self._spool:
+                if self._pendentes:
+                    self._spool.confirmar(lote[-1][0])
+                else:
+                    self._spool.recomecar()
+
+    def _gravar(self, restantes: List[LeadEntrada], item_a_item: bool = False) -> None:
+        """
+        Grava os leads numa transação e os tira de `restantes`. Se algum lead
+        tiver erro de dados, grava item a item para separar os leads com erro
+        (descartados e contados).
+
+        Outras falhas sobem, e `restantes` fica só com o que não foi gravado.
+        Com `item_a_item` (o lote já falhou várias vezes), só as falhas
+        transitórias sobem: o lead que falhar por outro motivo é descartado.
+        """
+        gravados, erros = 0, 0
+        with SessaoLocal() as db:
+            if not item_a_item:
+                try:
+                    gravar_leads(db, restantes)
+                    gravados = len(restantes)
+                    restantes.clear()
+                except ERROS_DE_DADOS:
+                    db.rollback()
+            try:
+                while restantes:
+                    lead = restantes[0]
+                    try:
+                        gravar_leads(db, [lead])
+                        gravados += 1
+                    except Exception as erro:
+                        db.rollback()
+                        if not isinstance(erro, ERROS_DE_DADOS) and (
+                            not item_a_item or isinstance(erro, ERROS_TRANSITORIOS)
+                        ):
+                            raise
+                        erros += 1
+                        self.ultimo_erro = str(erro)
+                        logger.warning("Ingestão: lead descartado (%s): %s", lead.email or lead.telefone, erro)
+                    restantes.pop(0)
+            finally:
+                if gravados or erros:
+                    self._contar(gravados, erros)
+
+    def _contar(self, gravados: int, erros: int) -> None:
+        self.gravados += gravados
+        self.erros += erros
+        self.lotes += 1
+        self.ultimo_lote_em = datetime.now()
+        ITENS_INGESTAO.somar("gravado", valor=gravados)
+        ITENS_INGESTAO.somar("erro", valor=erros)
+
+    # Estado
+
+    def atraso_segundos(self) -> float:
+        """
+        Há quanto tempo o item mais antigo ainda não gravado está esperando.
+        """
+        if not self._pendentes:
+            return 0.0
+        return max(time.time() - self._pendentes[0][1], 0.0)
+
+    def estado(self) -> Dict:
+        return {
+            "fila": len(self._pendentes),
+            "atraso_segundos": round(self.atraso_segundos(), 3),
+            "recebidos": self.recebidos,
+            "gravados": self.gravados,
+            "erros": self.erros,
+            "lotes": self.lotes,
+            "ultimo_lote_em": self.ultimo_lote_em,
+            "ultimo_erro": self.ultimo_erro,
+            "tamanho_lote": self.tamanho_lote,
+            "intervalo_ms": self.intervalo_ms,
+            "max_fila": self.max_fila,
+            "spool": self._spool.caminho if self._spool else None,
+            "escritas_spool": self._spool.escritas if self._spool else None,
+        }
+
+
+fila_ingestao = FilaIngestao()
+
+ITENS_INGESTAO = registro.registrar(Contador(
+    "crm_ingestao_itens_total",
+    "Leads da fila de ingestão gravados no banco ou descartados por erro.",
+    ("resultado",),
+))
+registro.registrar(Medidor(
+    "crm_ingestao_fila",
+    "Leads recebidos e ainda não gravados.",
+    coletar=lambda: [((), len(fila_ingestao._pendentes))],
+))
+registro.registrar(Medidor(
+    "crm_ingestao_atraso_segundos",
+    "Há quanto tempo o lead mais antigo da fila está esperando.",
+    coletar=lambda: [((), fila_ingestao.atraso_segundos())],
+))
@@ -0,0 +1,237 @@
+# app/servicos/lotes.py
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm import Session
+
+from app.modelos.contato import Contato
+from app.modelos.funcionario import Funcionario
+from app.modelos.negocio import Negocio
+from app.esquemas.contato import ContatoLote
+from app.esquemas.negocio import NegocioLote
+from app.esquemas.lote import LoteItemResultado, LoteResultado
+from app.normalizacao import com_identificadores_normalizados, normalizar_email
+from app.servicos.eventos_saida import COLUNAS_IGNORADAS, novo_evento, registrar_eventos, valor_json
+from app.servicos.resumo_diario import registrar_negocios
+
+# Quantos valores vão em cada `IN (...)` (fica abaixo do limite de variáveis do SQLite)
+TAMANHO_BLOCO_IN = 500
+
+# Colunas do contato que vão nos eventos (as mesmas dos eventos do ORM)
+COLUNAS_EVENTO_CONTATO = [
+    coluna for coluna in Contato.__table__.columns if coluna.key not in COLUNAS_IGNORADAS
+]
+
+
+def em_blocos(itens: Sequence, tamanho: int = TAMANHO_BLOCO_IN) -> Iterator[Sequence]:
+    """
+    Divide uma sequência em blocos de até `tamanho` itens.
+    """
+    for inicio in range(0, len(itens), tamanho):
+        yield itens[inicio:inicio + tamanho]
+
+
+def ids_existentes(db: Session, coluna_id, ids: Set[int]) -> Set[int]:
+    """
+    Quais dos `ids` existem na tabela da coluna (consultas IN em blocos).
+    """
+    encontrados: Set[int] = set()
+    for bloco in em_blocos(sorted(ids)):
+        encontrados.update(db.scalars(select(coluna_id).where(coluna_id.in_(bloco))))
+    return encontrados
+
+
+def _json(dados: Dict) -> Dict:
+    return {campo: valor_json(valor) for campo, valor in dados.items()}
+
+
+def _evento_atualizacao(anterior: Dict, dados: Dict) -> Optional[Dict]:
+    """
+    Evento "atualizado" no formato do ORM (`de`/`para` só dos campos que
+    mudaram, e o registro `atual`), ou None se nada mudou.
+    """
+    atual = {**anterior, **{campo: valor for campo, valor in dados.items() if campo in anterior}}
+    alteracoes = {
+        campo: {"de": valor_json(anterior[campo]), "para": valor_json(valor)}
+        for campo, valor in atual.items()
+        if valor != anterior[campo]
+    }
+    if not alteracoes:
+        return None
+    return novo_evento("atualizado", "contato", atual["id"], {
+        "id": atual["id"],
+        "alteracoes": alteracoes,
+        "atual": _json(atual),
+    })
+
+
+def _resultado(itens: List[LoteItemResultado]) -> LoteResultado:
+    return LoteResultado(
+        criados=sum(1 for i in itens if i.situacao == "criado"),
+        atualizados=sum(1 for i in itens if i.situacao == "atualizado"),
+        erros=sum(1 for i in itens if i.situacao == "erro"),
+        itens=itens,
+    )
+
+
+def criar_contatos_em_lote(db: Session, entrada: ContatoLote, confirmar: bool = True) -> LoteResultado:
+    """
+    Cria (ou atualiza, no modo upsert) vários contatos em uma única transação
+    (com `confirmar=False`, o commit fica com quem chamou).
+
+    - Os e-mails são comparados normalizados (como no resolver e na
+      ingestão): "Joao@X.com " é o mesmo contato de "joao@x.com".
+    - Os e-mails já cadastrados são buscados de uma vez (IN em blocos).
+    - Os novos contatos entram em um único INSERT com vários VALUES.
+    - E-mail repetido dentro do próprio lote vira erro no item.
+    """
+    itens = entrada.itens
+    resultados: List[Optional[LoteItemResultado]] = [None] * len(itens)
+    emails_normalizados = [normalizar_email(item.email) for item in itens]
+
+    # Além do id e da versão, o registro atual (para o `de` dos eventos do upsert).
+    # Com e-mails repetidos já cadastrados, vale o contato mais recente
+    emails = sorted({email for email in emails_normalizados if email})
+    existentes: Dict[str, Tuple[int, Dict]] = {}
+    for bloco in em_blocos(emails):
+        consulta = (
+            db.query(Contato.email_normalizado, Contato.versao, *COLUNAS_EVENTO_CONTATO)
+            .filter(Contato.email_normalizado.in_(bloco))
+            .order_by(Contato.id)
+        )
+        for email_normalizado, versao, *valores in consulta:
+            registro = {coluna.key: valor for coluna, valor in zip(COLUNAS_EVENTO_CONTATO, valores)}
+            existentes[email_normalizado] = (versao, registro)
+
+    emails_no_lote: Set[str] = set()
+    indices_novos: List[int] = []
+    novos: List[Dict] = []
+    indices_atualizados: List[int] = []
+    atualizacoes: List[Dict] = []
+    anteriores: List[Dict] = []
+
+    for indice, (item, email) in enumerate(zip(itens, emails_normalizados)):
+        if email:
+            if email in emails_no_lote:
+                resultados[indice] = LoteItemResultado(
+                    indice=indice, situacao="erro", erro="E-mail repetido no lote."
+                )
+                continue
+            emails_no_lote.add(email)
+
+            if email in existentes:
+                versao, anterior = existentes[email]
+                contato_id = anterior["id"]
+                if entrada.modo == "upsert":
+                    indices_atualizados.append(indice)
+                    anteriores.append(anterior)
+                    # A versão lida vai junto: o UPDATE confere e incrementa `versao`.
+                    # O UPDATE em massa não passa pelos @validates: normaliza aqui.
+                    atualizacoes.append(
+                        {
+                            "id": contato_id,
+                            "versao": versao,
+                            **com_identificadores_normalizados(item.model_dump(exclude_unset=True)),
+                        }
+                    )
+                else:
+                    resultados[indice] = LoteItemResultado(
+                        indice=indice,
+                        situacao="erro",
+                        id=contato_id,
+                        erro="Já existe um contato cadastrado com esse e-mail.",
+                    )
+                continue
+
+        indices_novos.append(indice)
+        novos.append(item.model_dump())
+
+    if novos:
+        linhas = db.execute(
+            insert(Contato).returning(Contato.id, Contato.criado_em, sort_by_parameter_order=True),
+            novos,
+        ).all()
+        for indice, (contato_id, _criado_em) in zip(indices_novos, linhas):
+            resultados[indice] = LoteItemResultado(indice=indice, situacao="criado", id=contato_id)
+
+        # Escrita do Core: os eventos dos webhooks vão explicitamente (mesma transação)
+        registrar_eventos(db, (
+            novo_evento("criado", "contato", contato_id, {"id": contato_id, **_json(dados), "criado_em": valor_json(criado_em)})
+            for dados, (contato_id, criado_em) in zip(novos, linhas)
+        ))
+
+    if atualizacoes:
+        # UPDATE em massa pela chave primária (executemany)
+        db.execute(update(Contato), atualizacoes)
+        eventos = (_evento_atualizacao(anterior, dados) for anterior, dados in zip(anteriores, atualizacoes))
+        registrar_eventos(db, (evento for evento in eventos if evento))
+        for indice, dados in zip(indices_atualizados, atualizacoes):
+            resultados[indice] = LoteItemResultado(indice=indice, situacao="atualizado", id=dados["id"])
+
+    if confirmar:
+        db.commit()
+    return _resultado(resultados)
+
+
+def criar_negocios_em_lote(db: Session, entrada: NegocioLote, confirmar: bool = True) -> LoteResultado:
+    """
+    Cria vários negócios em uma única transação
+    (com `confirmar=False`, o commit fica com quem chamou).
+
+    - Contatos e responsáveis referenciados são conferidos de uma vez.
+    - Os negócios entram em um único INSERT com vários VALUES.
+    - O resumo diário é atualizado na mesma transação.
+    """
+    itens = entrada.itens
+    resultados: List[Optional[LoteItemResultado]] = [None] * len(itens)
+
+    contatos = ids_existentes(db, Contato.id, {i.contato_id for i in itens if i.contato_id})
+    responsaveis = ids_existentes(
+        db, Funcionario.id, {i.responsavel_id for i in itens if i.responsavel_id}
+    )
+
+    indices_novos: List[int] = []
+    novos: List[Dict] = []
+
+    for indice, item in enumerate(itens):
+        erro = None
+        if not item.contato_id:
+            erro = "contato_id é obrigatório."
+        elif item.contato_id not in contatos:
+            erro = "Contato não encontrado."
+        elif item.responsavel_id and item.responsavel_id not in responsaveis:
+            erro = "Funcionário não encontrado."
+
+        if erro:
+            resultados[indice] = LoteItemResultado(indice=indice, situacao="erro", erro=erro)
+            continue
+
+        indices_novos.append(indice)
+        novos.append(item.model_dump())
+
+    if novos:
+        linhas = db.execute(
+            insert(Negocio).returning(Negocio.id, Negocio.criado_em, sort_by_parameter_order=True),
+            novos,
+        ).all()
+
+        # Objetos soltos (fora da sessão), só para calcular a contribuição no resumo
+        registrar_negocios(
+            db,
+            (
+                Negocio(**dados, criado_em=criado_em)
+                for dados, (_id, criado_em) in zip(novos, linhas)
+            ),
+        )
+
+        for indice, (negocio_id, _criado_em) in zip(indices_novos, linhas):
+            resultados[indice] = LoteItemResultado(indice=indice, situacao="criado", id=negocio_id)
+
+        registrar_eventos(db, (
+            novo_evento("criado", "negocio", negocio_id, {"id": negocio_id, **_json(dados), "criado_em": valor_json(criado_em)})
+            for dados, (negocio_id, criado_em) in zip(novos, linhas)
+        ))
+
+    if confirmar:
+        db.commit()
+    return _resultado(resultados)
@@ -0,0 +1,60 @@
+# app/servicos/painel.py
+from datetime import datetime, time, timedelta
+from typing import Dict
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.modelos.contato import Contato
+
+
+def numeros_do_painel(db: Session) -> Dict[str, int]:
+    """
+    Totais por situação, entradas dos últimos 7 dias e taxas do painel de contatos.
+    Usado pelo painel /painel e pelas atualizações ao vivo.
+    """
+    por_situacao = dict(
+        db.query(Contato.situacao, func.count(Contato.id))
+        .group_by(Contato.situacao)
+        .all()
+    )
+    total_contatos = sum(por_situacao.values())
+    total_leads = por_situacao.get("lead", 0)
+    total_clientes = por_situacao.get("cliente", 0)
+    total_inativos = por_situacao.get("inativo", 0)
+    total_outros = max(total_contatos - (total_leads + total_clientes + total_inativos), 0)
+
+    limite_7_dias = datetime.utcnow().date() - timedelta(days=7)
+    contatos_ultimos_7 = (
+        db.query(func.count(Contato.id))
+        .filter(Contato.criado_em >= datetime.combine(limite_7_dias, time.min))
+        .scalar()
+        or 0
+    )
+
+    if total_contatos > 0:
+        taxa_leads = round((total_leads / total_contatos) * 100)
+        taxa_clientes = round((total_clientes / total_contatos) * 100)
+        taxa_inativos = round((total_inativos / total_contatos) * 100)
+        taxa_outros = max(0, 100 - (taxa_leads + taxa_clientes + taxa_inativos))
+    else:
+        taxa_leads = taxa_clientes = taxa_inativos = taxa_outros = 0
+
+    if total_leads > 0:
+        taxa_conversao_lead_cliente = round((total_clientes / total_leads) * 100)
+    else:
+        taxa_conversao_lead_cliente = 0
+
+    return {
+        "total_contatos": total_contatos,
+        "total_leads": total_leads,
+        "total_clientes": total_clientes,
+        "total_inativos": total_inativos,
+        "total_outros": total_outros,
+        "contatos_ultimos_7": contatos_ultimos_7,
+        "taxa_leads": taxa_leads,
+        "taxa_clientes": taxa_clientes,
+        "taxa_inativos": taxa_inativos,
+        "taxa_outros": taxa_outros,
+        "taxa_conversao_lead_cliente": taxa_conversao_lead_cliente,
+    }
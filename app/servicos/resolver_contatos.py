@@ -0,0 +1,140 @@
+# app/servicos/resolver_contatos.py
+"""
+Resolução de contatos por telefone ou e-mail (webhooks, importação).
+
+As buscas usam as colunas normalizadas (`telefone_normalizado`,
+`email_normalizado`) e os índices (coluna, id): cada identificador é uma
+busca no índice, O(log n), sem percorrer a tabela. Quando mais de um contato
+tem o mesmo telefone/e-mail, vale o mais recente (maior id).
+"""
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import bindparam, func, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.modelos.contato import Contato
+from app.normalizacao import normalizar_email, normalizar_telefone
+from app.servicos.lotes import em_blocos
+
+# Tipo de identificador -> (coluna normalizada, função de normalização)
+IDENTIFICADORES = {
+    "telefone": (Contato.telefone_normalizado, normalizar_telefone),
+    "email": (Contato.email_normalizado, normalizar_email),
+}
+
+
+def resolver_contato(
+    db: Session,
+    telefone: Optional[str] = None,
+    email: Optional[str] = None,
+) -> Optional[Contato]:
+    """
+    Contato com o e-mail informado ou, se não houver, com o telefone.
+    """
+    for tipo, valor in (("email", email), ("telefone", telefone)):
+        coluna, normalizar = IDENTIFICADORES[tipo]
+        normalizado = normalizar(valor)
+        if not normalizado:
+            continue
+        contato = (
+            db.query(Contato)
+            .filter(coluna == normalizado)
+            .order_by(Contato.id.desc())
+            .first()
+        )
+        if contato:
+            return contato
+    return None
+
+
+def resolver_ids(db: Session, tipo: str, valores: Iterable[str]) -> Dict[str, int]:
+    """
+    id do contato de cada valor (como foi enviado) que tem correspondência.
+    Uma consulta IN por bloco, agrupada pela coluna normalizada.
+    """
+    coluna, normalizar = IDENTIFICADORES[tipo]
+    por_normalizado: Dict[str, List[str]] = {}
+    for valor in valores:
+        normalizado = normalizar(valor)
+        if normalizado:
+            por_normalizado.setdefault(normalizado, []).append(valor)
+
+    ids: Dict[str, int] = {}
+    for bloco in em_blocos(sorted(por_normalizado)):
+        consulta = (
+            select(coluna, func.max(Contato.id))
+            .where(coluna.in_(bloco))
+            .group_by(coluna)
+        )
+        for normalizado, contato_id in db.execute(consulta):
+            for valor in por_normalizado[normalizado]:
+                ids[valor] = contato_id
+    return ids
+
+
+def contatos_por_id(db: Session, ids: Iterable[int]) -> Dict[int, Contato]:
+    """
+    Carrega os contatos pelos ids (IN em blocos).
+    """
+    contatos: Dict[int, Contato] = {}
+    for bloco in em_blocos(sorted(set(ids))):
+        for contato in db.query(Contato).filter(Contato.id.in_(bloco)):
+            contatos[contato.id] = contato
+    return contatos
+
+
+def resolver_em_lote(
+    db: Session,
+    telefones: List[str],
+    emails: List[str],
+) -> Dict[str, Dict[str, Optional[Contato]]]:
+    """
+    Para cada telefone e e-mail enviado, o contato correspondente (ou None).
+    """
+    ids = {
+        "telefones": resolver_ids(db, "telefone", telefones),
+        "emails": resolver_ids(db, "email", emails),
+    }
+    contatos = contatos_por_id(
+        db, [contato_id for por_valor in ids.values() for contato_id in por_valor.values()]
+    )
+    return {
+        "telefones": {t: contatos.get(ids["telefones"].get(t)) for t in telefones},
+        "emails": {e: contatos.get(ids["emails"].get(e)) for e in emails},
+    }
+
+
+def preencher_identificadores_normalizados(engine: Engine) -> int:
+    """
+    Preenche as colunas normalizadas dos contatos que ainda não as têm
+    (bancos criados antes delas). Retorna quantos contatos foram atualizados.
+    """
+    tabela = Contato.__table__
+    with engine.begin() as conexao:
+        pendentes = conexao.execute(
+            select(tabela.c.id, tabela.c.telefone, tabela.c.email).where(
+                (tabela.c.telefone.is_not(None) & tabela.c.telefone_normalizado.is_(None))
+                | (tabela.c.email.is_not(None) & tabela.c.email_normalizado.is_(None))
+            )
+        ).all()
+
+        # UPDATE do Core: não mexe em `versao` nem em `atualizado_em` (nenhum dado do contato mudou)
+        atualizar = (
+            tabela.update()
+            .where(tabela.c.id == bindparam("id_contato"))
+            .values(atualizado_em=tabela.c.atualizado_em)
+        )
+        for bloco in em_blocos(pendentes, 5000):
+            conexao.execute(
+                atualizar,
+                [
+                    {
+                        "id_contato": contato_id,
+                        "telefone_normalizado": normalizar_telefone(telefone),
+                        "email_normalizado": normalizar_email(email),
+                    }
+                    for contato_id, telefone, email in bloco
+                ],
+            )
+    return len(pendentes)
@@ -0,0 +1,206 @@
+# app/servicos/resumo_diario.py
+from datetime import date
+from decimal import Decimal
+from typing import Optional, Dict, Tuple, Iterable
+
+from sqlalchemy import func, insert, literal, select, union_all, update
+from sqlalchemy.orm import Session
+
+from app.modelos.negocio import Negocio
+from app.modelos.resumo_diario import ResumoNegocioDiario
+from app.servicos.indicadores import data_da_coluna, dias_ciclo
+
+# (dia, responsavel_id, origem, fase)
+Chave = Tuple[date, Optional[int], Optional[str], str]
+
+METRICAS = (
+    "qtd_criados",
+    "valor_criados",
+    "qtd_fechados",
+    "valor_fechados",
+    "soma_ciclo_dias",
+    "qtd_ciclos",
+)
+
+
+def contribuicoes(negocio: Negocio, sinal: int = 1) -> Dict[Chave, Dict[str, object]]:
+    """
+    Quanto um negócio soma no resumo diário (use `sinal=-1` para retirar).
+
+    Um negócio contribui para até duas chaves: o dia da criação e o dia
+    do fechamento.
+    """
+    resultado: Dict[Chave, Dict[str, object]] = {}
+    valor = Decimal(str(negocio.valor_previsto or 0)) * sinal
+
+    if negocio.criado_em:
+        chave = (negocio.criado_em.date(), negocio.responsavel_id, negocio.origem, negocio.fase)
+        deltas = resultado.setdefault(chave, dict.fromkeys(METRICAS, 0))
+        deltas["qtd_criados"] += sinal
+        deltas["valor_criados"] += valor
+
+    if negocio.data_fechamento:
+        chave = (negocio.data_fechamento, negocio.responsavel_id, negocio.origem, negocio.fase)
+        deltas = resultado.setdefault(chave, dict.fromkeys(METRICAS, 0))
+        deltas["qtd_fechados"] += sinal
+        deltas["valor_fechados"] += valor
+        if negocio.criado_em:
+            ciclo = (negocio.data_fechamento - negocio.criado_em.date()).days
+            deltas["soma_ciclo_dias"] += ciclo * sinal
+            deltas["qtd_ciclos"] += sinal
+
+    return resultado
+
+
+def somar_contribuicoes(
+    destino: Dict[Chave, Dict[str, object]],
+    origem: Dict[Chave, Dict[str, object]],
+) -> Dict[Chave, Dict[str, object]]:
+    """
+    Acumula `origem` em `destino` (útil para aplicar vários negócios de uma vez).
+    """
+    for chave, deltas in origem.items():
+        atual = destino.setdefault(chave, dict.fromkeys(METRICAS, 0))
+        for metrica, valor in deltas.items():
+            atual[metrica] += valor
+    return destino
+
+
+def aplicar_contribuicoes(db: Session, deltas_por_chave: Dict[Chave, Dict[str, object]]) -> None:
+    """
+    Aplica as contribuições no resumo, dentro da transação corrente.
+
+    Usa `UPDATE ... SET x = x + delta` (sem ler a linha antes) para não perder
+    atualizações concorrentes; se a chave ainda não existe, insere a linha.
+    """
+    R = ResumoNegocioDiario
+    novas = []
+
+    for (dia, responsavel_id, origem, fase), deltas in deltas_por_chave.items():
+        if not any(deltas.values()):
+            continue
+
+        resultado = db.execute(
+            update(R)
+            .where(
+                R.dia == dia,
+                R.responsavel_id.is_(None) if responsavel_id is None else R.responsavel_id == responsavel_id,
+                R.origem.is_(None) if origem is None else R.origem == origem,
+                R.fase == fase,
+            )
+            .values({m: getattr(R, m) + v for m, v in deltas.items() if v})
+            .execution_options(synchronize_session=False)
+        )
+        if resultado.rowcount == 0:
+            novas.append(
+                {
+                    "dia": dia,
+                    "responsavel_id": responsavel_id,
+                    "origem": origem,
+                    "fase": fase,
+                    **deltas,
+                }
+            )
+
+    if novas:
+        db.execute(insert(R), novas)
+
+
+def registrar_negocios(db: Session, negocios: Iterable[Negocio], sinal: int = 1) -> None:
+    """
+    Soma (ou retira, com `sinal=-1`) vários negócios no resumo.
+    """
+    total: Dict[Chave, Dict[str, object]] = {}
+    for negocio in negocios:
+        somar_contribuicoes(total, contribuicoes(negocio, sinal))
+    aplicar_contribuicoes(db, total)
+
+
+def totais_por_fase(db: Session) -> Dict[str, Tuple[int, Decimal]]:
+    """
+    Quantidade e valor total de negócios por fase (todo o histórico).
+    """
+    R = ResumoNegocioDiario
+    return {
+        fase: (qtd or 0, round(valor or 0, 2))
+        for fase, qtd, valor in (
+            db.query(R.fase, func.sum(R.qtd_criados), func.sum(R.valor_criados))
+            .group_by(R.fase)
+            .all()
+        )
+    }
+
+
+def reconstruir_resumo(db: Session) -> int:
+    """
+    Recalcula o resumo inteiro a partir da tabela `negocios`.
+    Retorna a quantidade de linhas geradas.
+    """
+    R = ResumoNegocioDiario
+    zero = literal(0)
+    valor = func.coalesce(Negocio.valor_previsto, 0)
+
+    criados = (
+        select(
+            data_da_coluna(db, Negocio.criado_em).label("dia"),
+            Negocio.responsavel_id,
+            Negocio.origem,
+            Negocio.fase,
+            func.count(Negocio.id).label("qtd_criados"),
+            func.sum(valor).label("valor_criados"),
+            zero.label("qtd_fechados"),
+            zero.label("valor_fechados"),
+            zero.label("soma_ciclo_dias"),
+            zero.label("qtd_ciclos"),
+        )
+        .where(Negocio.criado_em.is_not(None))
+        .group_by(
+            data_da_coluna(db, Negocio.criado_em),
+            Negocio.responsavel_id,
+            Negocio.origem,
+            Negocio.fase,
+        )
+    )
+    fechados = (
+        select(
+            Negocio.data_fechamento.label("dia"),
+            Negocio.responsavel_id,
+            Negocio.origem,
+            Negocio.fase,
+            zero.label("qtd_criados"),
+            zero.label("valor_criados"),
+            func.count(Negocio.id).label("qtd_fechados"),
+            func.sum(valor).label("valor_fechados"),
+            func.coalesce(func.sum(dias_ciclo(db)), 0).label("soma_ciclo_dias"),
+            func.count(Negocio.criado_em).label("qtd_ciclos"),
+        )
+        .where(Negocio.data_fechamento.is_not(None))
+        .group_by(
+            Negocio.data_fechamento,
+            Negocio.responsavel_id,
+            Negocio.origem,
+            Negocio.fase,
+        )
+    )
+    partes = union_all(criados, fechados).subquery()
+    chave = (partes.c.dia, partes.c.responsavel_id, partes.c.origem, partes.c.fase)
+
+    db.query(R).delete(synchronize_session=False)
+    resultado = db.execute(
+        insert(R).from_select(
+            ["dia", "responsavel_id", "origem", "fase", *METRICAS],
+            select(*chave, *(func.sum(partes.c[m]) for m in METRICAS)).group_by(*chave),
+        )
+    )
+    return resultado.rowcount
+
+
+def garantir_resumo(db: Session) -> None:
+    """
+    Reconstrói o resumo quando ele está vazio mas já existem negócios
+    (ex.: banco criado antes da tabela de resumo existir).
+    """
+    resumo_vazio = db.query(ResumoNegocioDiario.id).first() is None
+    if resumo_vazio and db.query(Negocio.id).first() is not None:
+        reconstruir_resumo(db)
+        db.commit()
@@ -0,0 +1,119 @@
+# app/servicos/series_temporais.py
+"""
+Séries temporais dos negócios (criados, ganhos, perdidos) por dia, semana ou mês.
+
+Tudo sai do resumo diário (`negocios_resumo_diario`) e o agrupamento por
+período é feito no banco (strftime/date() no SQLite, date_trunc no
+PostgreSQL): o resultado tem uma linha por período (e grupo), não importa
+quantos negócios existam.
+"""
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy import Date, String, and_, cast, func
+from sqlalchemy.orm import Session
+
+from app.modelos.resumo_diario import ResumoNegocioDiario
+
+# Limite de períodos por série (acima disso, use uma granularidade maior)
+MAX_PERIODOS = 1000
+
+# Métrica -> (fase exigida, coluna de quantidade, coluna de valor)
+R = ResumoNegocioDiario
+METRICAS_SERIE = {
+    "criados": (None, R.qtd_criados, R.valor_criados),
+    "ganhos": ("fechado_ganho", R.qtd_fechados, R.valor_fechados),
+    "perdidos": ("fechado_perdido", R.qtd_fechados, R.valor_fechados),
+}
+
+COLUNAS_AGRUPAMENTO = {
+    "responsavel_id": R.responsavel_id,
+    "origem": R.origem,
+    "fase": R.fase,
+}
+
+
+def inicio_do_periodo(db: Session, coluna, granularidade: str):
+    """
+    Expressão SQL com o primeiro dia do período (dia, semana começando na
+    segunda-feira, ou mês) de uma coluna Date.
+    """
+    if granularidade == "dia":
+        return coluna
+    if db.get_bind().dialect.name == "sqlite":
+        if granularidade == "semana":
+            # 'weekday 0' avança até o domingo (ou fica nele); -6 dias volta à segunda
+            return func.date(coluna, "weekday 0", "-6 days")
+        return func.strftime("%Y-%m-01", coluna)
+    campo = "week" if granularidade == "semana" else "month"
+    return cast(func.date_trunc(campo, coluna), Date)
+
+
+def quantidade_de_periodos(inicio: date, fim: date, granularidade: str) -> int:
+    """
+    Quantos períodos o intervalo cobre (limite máximo de pontos da série, por grupo).
+    """
+    if granularidade == "dia":
+        return (fim - inicio).days + 1
+    if granularidade == "semana":
+        segunda = inicio - timedelta(days=inicio.weekday())
+        return (fim - segunda).days // 7 + 1
+    return (fim.year - inicio.year) * 12 + fim.month - inicio.month + 1
+
+
+def serie_temporal(
+    db: Session,
+    metrica: str,
+    granularidade: str,
+    inicio: date,
+    fim: date,
+    agrupar_por: Optional[str] = None,
+) -> List[Dict]:
+    """
+    Pontos da série: quantidade e valor (e ciclo médio, nos fechados) por período.
+    """
+    fase, coluna_qtd, coluna_valor = METRICAS_SERIE[metrica]
+    periodo = inicio_do_periodo(db, R.dia, granularidade).label("periodo")
+
+    colunas = [periodo]
+    agrupamento = [periodo]
+    if agrupar_por:
+        grupo = COLUNAS_AGRUPAMENTO[agrupar_por]
+        colunas.append(cast(grupo, String).label("grupo"))
+        agrupamento.append(grupo)
+
+    colunas += [
+        func.sum(coluna_qtd).label("quantidade"),
+        func.sum(coluna_valor).label("valor"),
+        func.sum(R.soma_ciclo_dias).label("soma_ciclo"),
+        func.sum(R.qtd_ciclos).label("qtd_ciclos"),
+    ]
+
+    filtros = [and_(R.dia >= inicio, R.dia <= fim)]
+    if fase:
+        filtros.append(R.fase == fase)
+
+    linhas = (
+        db.query(*colunas)
+        .filter(*filtros)
+        .group_by(*agrupamento)
+        .having(func.sum(coluna_qtd) != 0)
+        .order_by(*agrupamento)
+        .all()
+    )
+
+    pontos = []
+    for linha in linhas:
+        ponto = {
+            "periodo": linha.periodo,
+            "quantidade": linha.quantidade or 0,
+            "valor": float(linha.valor or 0),
+        }
+        if agrupar_por:
+            ponto["grupo"] = linha.grupo
+        if fase:
+            ponto["ciclo_medio"] = (
+                round(linha.soma_ciclo / linha.qtd_ciclos, 1) if linha.qtd_ciclos else 0.0
+            )
+        pontos.append(ponto)
+    return pontos
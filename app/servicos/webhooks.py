@@ -0,0 +1,461 @@
+# app/servicos/webhooks.py
+"""
+Entrega dos eventos de `eventos_saida` aos webhooks (ex.: n8n), em lotes.
+
+Em vez de o n8n consultar a API o tempo todo para perceber que um negócio
+mudou de fase, o CRM envia um POST com os eventos novos:
+
+    {"eventos": [{"id": 10, "tipo": "negocio.atualizado", "entidade": "negocio",
+                  "entidade_id": 3, "criado_em": "...", "dados": {...}}, ...]}
+
+- Cada destino tem um cursor por partição (`webhook_cursores`); os eventos
+  de um registro estão sempre na mesma partição e chegam em ordem.
+- Falha (erro de rede, status fora de 2xx ou erro do banco ao ler os
+  eventos/gravar o cursor): o mesmo lote é reenviado com espera exponencial
+  (só aquela partição para; as outras seguem).
+- No máximo `CONCORRENCIA` envios simultâneos por destino.
+- Um commit com eventos acorda o despachante na hora; eventos gravados por
+  outros processos são vistos a cada `INTERVALO_VERIFICACAO` segundos.
+- Os cursores só avançam até o "horizonte": o maior id abaixo do qual não
+  falta nenhum evento. No PostgreSQL o id sai da sequência antes do commit,
+  então o evento 11 pode ficar visível antes do 10 (transação ainda aberta);
+  sem o horizonte o cursor passaria do 10 e ele nunca seria entregue. Um id
+  que continua faltando depois de `ESPERA_LACUNA` segundos é de uma
+  transação desfeita (ou aberta há tempo demais) e é pulado.
+
+Configuração (variáveis de ambiente):
+
+- CRM_WEBHOOKS              URLs separadas por vírgula (vazio: nada é enviado);
+- CRM_WEBHOOK_SEGREDO       assina o corpo (HMAC-SHA256 em X-CRM-Assinatura);
+- CRM_WEBHOOK_LOTE          eventos por POST (padrão 100);
+- CRM_WEBHOOK_CONCORRENCIA  envios simultâneos por destino (padrão 4);
+- CRM_WEBHOOK_TIMEOUT       segundos por envio (padrão 10);
+- CRM_OUTBOX_RETENCAO_HORAS eventos já entregues a todos os destinos são
+                            apagados depois disso (padrão 72);
+- CRM_OUTBOX_ESPERA_LACUNA  segundos esperando um id que falta antes de
+                            pulá-lo (padrão 60).
+
+Com vários workers (processos), ligue o envio em um só (CRM_WEBHOOKS vazio
+nos demais): os cursores não são disputados entre processos.
+"""
+import asyncio
+import hashlib
+import hmac
+import json
+import logging
+import os
+import random
+import time
+import urllib.error
+import urllib.request
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, func, select
+
+from app.banco_dados import SessaoLocal
+from app.metricas import Contador, registro
+from app.modelos.evento_saida import CursorWebhook, EventoSaida
+from app.servicos.eventos_saida import NUM_PARTICOES, ao_confirmar_eventos, valor_json
+
+DESTINOS = [url.strip() for url in os.getenv("CRM_WEBHOOKS", "").split(",") if url.strip()]
+SEGREDO = os.getenv("CRM_WEBHOOK_SEGREDO", "")
+TAMANHO_LOTE = int(os.getenv("CRM_WEBHOOK_LOTE", "100"))
+CONCORRENCIA = int(os.getenv("CRM_WEBHOOK_CONCORRENCIA", "4"))
+TIMEOUT = float(os.getenv("CRM_WEBHOOK_TIMEOUT", "10"))
+RETENCAO_HORAS = float(os.getenv("CRM_OUTBOX_RETENCAO_HORAS", "72"))
+ESPERA_LACUNA = float(os.getenv("CRM_OUTBOX_ESPERA_LACUNA", "60"))
+
+# Espera entre tentativas: 1 s, 2 s, 4 s... até 5 minutos (com variação aleatória)
+ESPERA_INICIAL = 1.0
+ESPERA_MAXIMA = 300.0
+
+INTERVALO_VERIFICACAO = 5.0
+# Com uma lacuna no horizonte, de quanto em quanto tempo olhar de novo
+INTERVALO_LACUNA = 1.0
+# Ids lidos por consulta ao avançar o horizonte
+LOTE_HORIZONTE = 5000
+INTERVALO_LIMPEZA = 3600.0
+
+CABECALHO_ASSINATURA = "X-CRM-Assinatura"
+
+logger = logging.getLogger("uvicorn.error")
+
+EVENTOS_ENTREGUES = registro.registrar(Contador(
+    "crm_webhook_eventos_entregues_total",
+    "Eventos entregues aos webhooks, por destino.",
+    ("destino",),
+))
+FALHAS_ENVIO = registro.registrar(Contador(
+    "crm_webhook_falhas_total",
+    "Falhas ao ler, enviar ou confirmar lotes de eventos (serão repetidos), por destino.",
+    ("destino",),
+))
+
+
+def espera_da_tentativa(tentativas: int) -> float:
+    """
+    Espera exponencial antes da próxima tentativa (com ±20% de variação).
+    """
+    espera = min(ESPERA_INICIAL * 2 ** (tentativas - 1), ESPERA_MAXIMA)
+    return espera * random.uniform(0.8, 1.2)
+
+
+def corpo_do_lote(eventos: List[EventoSaida]) -> bytes:
+    return json.dumps(
+        {
+            "eventos": [
+                {
+                    "id": evento.id,
+                    "tipo": evento.tipo,
+                    "entidade": evento.entidade,
+                    "entidade_id": evento.entidade_id,
+                    "criado_em": valor_json(evento.criado_em),
+                    "dados": evento.dados,
+                }
+                for evento in eventos
+            ]
+        },
+        ensure_ascii=False,
+    ).encode()
+
+
+def assinatura(corpo: bytes, segredo: str = SEGREDO) -> Optional[str]:
+    """
+    "sha256=<hex>" do corpo com o segredo (None sem segredo configurado).
+    """
+    if not segredo:
+        return None
+    return "sha256=" + hmac.new(segredo.encode(), corpo, hashlib.sha256).hexdigest()
+
+
+def enviar(destino: str, corpo: bytes, timeout: float = TIMEOUT) -> None:
+    """
+    POST do lote. Lança exceção em erro de rede ou status fora de 2xx.
+    """
+    cabecalhos = {"Content-Type": "application/json"}
+    valor_assinatura = assinatura(corpo)
+    if valor_assinatura:
+        cabecalhos[CABECALHO_ASSINATURA] = valor_assinatura
+    requisicao = urllib.request.Request(destino, data=corpo, headers=cabecalhos, method="POST")
+    with urllib.request.urlopen(requisicao, timeout=timeout) as resposta:
+        if not 200 <= resposta.status < 300:
+            raise urllib.error.HTTPError(destino, resposta.status, resposta.reason, resposta.headers, None)
+
+
+# Acesso ao banco (rodam em thread)
+
+def _iniciar_cursores(destino: str) -> Dict[int, int]:
+    """
+    Cursores do destino por partição. Um destino novo começa no último
+    evento existente (não recebe o histórico).
+    """
+    with SessaoLocal() as db:
+        cursores = dict(
+            db.execute(
+                select(CursorWebhook.particao, CursorWebhook.ultimo_evento_id)
+                .where(CursorWebhook.destino == destino)
+            ).all()
+        )
+        faltando = [p for p in range(NUM_PARTICOES) if p not in cursores]
+        if faltando:
+            ultimo = db.scalar(select(func.max(EventoSaida.id))) or 0
+            for particao in faltando:
+                db.add(CursorWebhook(destino=destino, particao=particao, ultimo_evento_id=ultimo))
+                cursores[particao] = ultimo
+            db.commit()
+    return cursores
+
+
+def _ids_depois_de(depois_de: int, quantidade: int) -> List[int]:
+    with SessaoLocal() as db:
+        return list(db.scalars(
+            select(EventoSaida.id)
+            .where(EventoSaida.id > depois_de)
+            .order_by(EventoSaida.id)
+            .limit(quantidade)
+        ))
+
+
+def _proximos_eventos(particao: int, depois_de: int, ate: int, quantidade: int) -> List[EventoSaida]:
+    with SessaoLocal() as db:
+        eventos = db.scalars(
+            select(EventoSaida)
+            .where(
+                EventoSaida.particao == particao,
+                EventoSaida.id > depois_de,
+                EventoSaida.id <= ate,
+            )
+            .order_by(EventoSaida.id)
+            .limit(quantidade)
+        ).all()
+        db.expunge_all()
+    return list(eventos)
+
+
+def _salvar_cursor(destino: str, particao: int, ultimo_evento_id: int) -> None:
+    with SessaoLocal() as db:
+        cursor = db.get(CursorWebhook, (destino, particao))
+        cursor.ultimo_evento_id = ultimo_evento_id
+        db.commit()
+
+
+def limpar_eventos_entregues(destinos: List[str], retencao_horas: float = RETENCAO_HORAS) -> int:
+    """
+    Apaga os eventos mais antigos que a retenção que todos os destinos já
+    receberam (sem destinos configurados, todos os mais antigos que a retenção).
+    """
+    limite = datetime.now(timezone.utc) - timedelta(hours=retencao_horas)
+    apagados = 0
+    with SessaoLocal() as db:
+        minimos = dict(
+            db.execute(
+                select(CursorWebhook.particao, func.min(CursorWebhook.ultimo_evento_id))
+                .where(CursorWebhook.destino.in_(destinos))
+                .group_by(CursorWebhook.particao)
+            ).all()
+        ) if destinos else {}
+        for particao in range(NUM_PARTICOES):
+            condicoes = [EventoSaida.particao == particao, EventoSaida.criado_em < limite]
+            if destinos:
+                condicoes.append(EventoSaida.id <= minimos.get(particao, 0))
+            apagados += db.execute(delete(EventoSaida).where(*condicoes)).rowcount
+        db.commit()
+    return apagados
+
+
+def pendentes_por_destino(db, destinos: List[str]) -> Dict[str, int]:
+    """
+    Quantos eventos ainda faltam entregar a cada destino.
+    """
+    consulta = (
+        select(CursorWebhook.destino, func.count(EventoSaida.id))
+        .join(
+            EventoSaida,
+            (EventoSaida.particao == CursorWebhook.particao)
+            & (EventoSaida.id > CursorWebhook.ultimo_evento_id),
+        )
+        .where(CursorWebhook.destino.in_(destinos))
+        .group_by(CursorWebhook.destino)
+    )
+    pendentes = {destino: 0 for destino in destinos}
+    pendentes.update(db.execute(consulta).all())
+    return pendentes
+
+
+class Horizonte:
+    """
+    Maior id de evento até o qual todos os eventos já estão visíveis
+    (confirmados) ou foram dados como desfeitos.
+
+    Enquanto falta um id logo acima do horizonte e há ids maiores visíveis,
+    ele fica parado; se continuar parado por `espera` segundos, pula a lacuna.
+    """
+
+    def __init__(self, inicio: int, espera: float = ESPERA_LACUNA):
+        self.ate = inicio
+        self.espera = espera
+        self.parado_desde: Optional[float] = None
+
+    def atualizar(self, ler_ids=_ids_depois_de) -> bool:
+        """
+        Avança o horizonte com os ids novos. True se avançou.
+        """
+        inicio = self.ate
+        while True:
+            ids = ler_ids(self.ate, LOTE_HORIZONTE)
+            if not ids:
+                self.parado_desde = None
+                break
+            for id_ in ids:
+                if id_ != self.ate + 1 and not self._pular_lacuna():
+                    return self.ate > inicio
+                self.ate = id_
+                self.parado_desde = None
+            if len(ids) < LOTE_HORIZONTE:
+                break
+        return self.ate > inicio
+
+    def _pular_lacuna(self) -> bool:
+        agora = time.monotonic()
+        if self.parado_desde is None:
+            self.parado_desde = agora
+        if agora - self.parado_desde < self.espera:
+            return False
+        logger.warning(
+            "Outbox: evento %d não apareceu em %.0f s; considerado desfeito.",
+            self.ate + 1, self.espera,
+        )
+        return True
+
+
+class _Particao:
+    """
+    Situação do envio de uma partição para um destino.
+    """
+
+    def __init__(self, cursor: int):
+        self.cursor = cursor
+        self.tentativas = 0
+        self.proxima_tentativa_em: Optional[datetime] = None
+        self.ultimo_erro: Optional[str] = None
+        self.acordar = asyncio.Event()
+
+    def limpar_falha(self) -> None:
+        self.tentativas = 0
+        self.proxima_tentativa_em = None
+        self.ultimo_erro = None
+
+
+class DespachanteWebhooks:
+    """
+    Uma tarefa por (destino, partição); envios limitados por destino.
+    """
+
+    def __init__(
+        self,
+        destinos: List[str] = DESTINOS,
+        tamanho_lote: int = TAMANHO_LOTE,
+        concorrencia: int = CONCORRENCIA,
+    ):
+        self.destinos = list(destinos)
+        self.tamanho_lote = tamanho_lote
+        self.concorrencia = concorrencia
+        self._estado: Dict[Tuple[str, int], _Particao] = {}
+        self._entregues: Dict[str, int] = {destino: 0 for destino in self.destinos}
+        self._falhas: Dict[str, int] = {destino: 0 for destino in self.destinos}
+        self._tarefas: List[asyncio.Task] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._horizonte: Optional[Horizonte] = None
+        self._sinal_horizonte: Optional[asyncio.Event] = None
+        ao_confirmar_eventos(self.acordar)
+
+    async def iniciar(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._tarefas.append(asyncio.create_task(self._limpar_periodicamente()))
+
+        if not self.destinos:
+            return
+        for destino in self.destinos:
+            cursores = await asyncio.to_thread(_iniciar_cursores, destino)
+            limite = asyncio.Semaphore(self.concorrencia)
+            for particao in range(NUM_PARTICOES):
+                estado = _Particao(cursores[particao])
+                self._estado[(destino, particao)] = estado
+                self._tarefas.append(
+                    asyncio.create_task(self._despachar(destino, particao, estado, limite))
+                )
+
+        # O horizonte parte do cursor mais atrasado (nada abaixo dele falta entregar)
+        self._horizonte = Horizonte(min(estado.cursor for estado in self._estado.values()))
+        self._sinal_horizonte = asyncio.Event()
+        self._tarefas.append(asyncio.create_task(self._acompanhar_horizonte()))
+        logger.info("Webhooks: enviando eventos para %s.", ", ".join(self.destinos))
+
+    async def parar(self) -> None:
+        for tarefa in self._tarefas:
+            tarefa.cancel()
+        await asyncio.gather(*self._tarefas, return_exceptions=True)
+        self._tarefas = []
+        self._loop = None
+
+    def acordar(self, _eventos: Optional[List[Dict]] = None) -> None:
+        """
+        Chamado depois de um commit com eventos novos (de qualquer thread).
+        """
+        if self._loop is None or self._sinal_horizonte is None:
+            return
+        self._loop.call_soon_threadsafe(self._sinal_horizonte.set)
+
+    def _acordar_todos(self) -> None:
+        for estado in self._estado.values():
+            estado.acordar.set()
+
+    async def _acompanhar_horizonte(self) -> None:
+        horizonte = self._horizonte
+        while True:
+            self._sinal_horizonte.clear()
+            try:
+                if await asyncio.to_thread(horizonte.atualizar):
+                    self._acordar_todos()
+            except Exception:
+                logger.exception("Outbox: falha ao ler os ids dos eventos novos.")
+            espera = INTERVALO_LACUNA if horizonte.parado_desde is not None else INTERVALO_VERIFICACAO
+            try:
+                await asyncio.wait_for(self._sinal_horizonte.wait(), espera)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _despachar(self, destino: str, particao: int, estado: _Particao, limite: asyncio.Semaphore) -> None:
+        while True:
+            estado.acordar.clear()
+            # Qualquer falha (leitura, envio ou gravação do cursor) repete o
+            # mesmo lote com espera: a tarefa da partição nunca termina
+            try:
+                eventos = await asyncio.to_thread(
+                    _proximos_eventos, particao, estado.cursor, self._horizonte.ate, self.tamanho_lote
+                )
+                if not eventos:
+                    estado.limpar_falha()
+                    try:
+                        await asyncio.wait_for(estado.acordar.wait(), INTERVALO_VERIFICACAO)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+
+                async with limite:
+                    await asyncio.to_thread(enviar, destino, corpo_do_lote(eventos))
+                await asyncio.to_thread(_salvar_cursor, destino, particao, eventos[-1].id)
+            except Exception as erro:
+                estado.tentativas += 1
+                estado.ultimo_erro = str(erro)
+                espera = espera_da_tentativa(estado.tentativas)
+                estado.proxima_tentativa_em = datetime.now() + timedelta(seconds=espera)
+                self._falhas[destino] += 1
+                FALHAS_ENVIO.somar(destino)
+                logger.warning(
+                    "Webhook %s: falha na partição %d (tentativa %d): %s",
+                    destino, particao, estado.tentativas, erro,
+                )
+                await asyncio.sleep(espera)
+                continue
+
+            estado.cursor = eventos[-1].id
+            estado.limpar_falha()
+            self._entregues[destino] += len(eventos)
+            EVENTOS_ENTREGUES.somar(destino, valor=len(eventos))
+
+    async def _limpar_periodicamente(self) -> None:
+        while True:
+            try:
+                apagados = await asyncio.to_thread(limpar_eventos_entregues, self.destinos)
+                if apagados:
+                    logger.info("Outbox: %d eventos antigos apagados.", apagados)
+            except Exception:
+                logger.exception("Outbox: falha ao apagar eventos antigos.")
+            await asyncio.sleep(INTERVALO_LIMPEZA)
+
+    def estado(self, pendentes: Dict[str, int]) -> List[Dict]:
+        return [
+            {
+                "destino": destino,
+                "pendentes": pendentes.get(destino, 0),
+                "entregues": self._entregues[destino],
+                "falhas": self._falhas[destino],
+                "particoes_com_falha": [
+                    {
+                        "particao": particao,
+                        "cursor": estado.cursor,
+                        "tentativas": estado.tentativas,
+                        "proxima_tentativa_em": estado.proxima_tentativa_em,
+                        "ultimo_erro": estado.ultimo_erro,
+                    }
+                    for (destino_estado, particao), estado in sorted(self._estado.items())
+                    if destino_estado == destino and estado.tentativas
+                ],
+            }
+            for destino in self.destinos
+        ]
+
+
+despachante_webhooks = DespachanteWebhooks()